@@ -0,0 +1,202 @@
+import time
+import logging
+import multiprocessing as mp
+from multiprocessing import shared_memory
+import numpy as np
+from utils import metrics
+
+logger = logging.getLogger("ASRProcess")
+
+# Whisper's own metrics are recorded in the worker process; these are what the caller sees
+_ROUNDTRIP = metrics.histogram("asr_process_roundtrip_seconds", "ASR call including the hand-off to the worker process")
+_RESTARTS = metrics.counter("asr_process_restarts_total", "ASR worker restarts")
+
+
+def _default_factory(**kwargs):
+    from asr.whisper_asr import WhisperASR
+    return WhisperASR(**kwargs)
+
+
+def _serve(conn, shm_name, max_samples, factory, factory_kwargs):
+    shm = shared_memory.SharedMemory(name=shm_name)
+    audio = np.ndarray((max_samples,), dtype=np.float32, buffer=shm.buf)
+    try:
+        try:
+            asr = factory(**factory_kwargs)
+        except Exception as e:
+            conn.send(("error", str(e)))
+            return
+        conn.send(("ready", None))
+        while True:
+            request = conn.recv()
+            if request is None:
+                break
+            method, n, args = request
+            if method == "attach":
+                # The caller outgrew the block and made a bigger one; args is its name
+                audio = None
+                shm.close()
+                shm = shared_memory.SharedMemory(name=args)
+                audio = np.ndarray((n,), dtype=np.float32, buffer=shm.buf)
+                conn.send(("ok", None))
+                continue
+            try:
+                result = getattr(asr, method)(audio[:n], *args)
+                conn.send(("ok", result))
+            except Exception as e:
+                conn.send(("error", str(e)))
+    except (EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        del audio
+        shm.close()
+
+
+class ProcessASR:
+    """
+    Drop-in replacement for `WhisperASR` that hosts the model in its own process.
+
+    Each call copies the audio window into a shared-memory buffer and sends a
+    small request over a pipe; the transcript comes back the same way. Model
+    work, the segment generator and word assembly all run outside this
+    interpreter, so they don't contend for the GIL with the audio callback.
+    A worker that dies or stops answering is restarted and the call retried once.
+    """
+
+    def __init__(self, factory=None, sample_rate=16000, max_seconds=30.0,
+                 timeout=60.0, startup_timeout=300.0, **factory_kwargs):
+        self.factory = factory or _default_factory
+        self.factory_kwargs = factory_kwargs
+        self.sample_rate = sample_rate
+        self.max_samples = int(sample_rate * max_seconds)     # grows if a longer window is passed
+        self.timeout = timeout
+        self.startup_timeout = startup_timeout
+        self.restarts = 0
+
+        self._ctx = mp.get_context("spawn")
+        self._shm = None
+        self._audio = None
+        self._process = None
+        self._conn = None
+
+    def start(self):
+        if self._shm is None:
+            self._shm = shared_memory.SharedMemory(create=True, size=self.max_samples * 4)
+            self._audio = np.ndarray((self.max_samples,), dtype=np.float32, buffer=self._shm.buf)
+
+        parent_conn, child_conn = self._ctx.Pipe()
+        self._process = self._ctx.Process(
+            target=_serve,
+            args=(child_conn, self._shm.name, self.max_samples, self.factory, self.factory_kwargs),
+            name="asr-worker",
+            daemon=True
+        )
+        self._process.start()
+        child_conn.close()
+        self._conn = parent_conn
+
+        if not self._conn.poll(self.startup_timeout):
+            self._kill()
+            raise TimeoutError("ASR worker did not start in time")
+        try:
+            status, detail = self._conn.recv()
+        except EOFError:
+            status, detail = "error", "worker exited during startup"
+        if status != "ready":
+            self._kill()
+            raise RuntimeError(f"ASR worker failed to start: {detail}")
+        logger.info(f"ASR worker started (pid {self._process.pid})")
+        return self
+
+    def _kill(self):
+        if self._process and self._process.is_alive():
+            self._process.terminate()
+        if self._process:
+            self._process.join(timeout=5)
+        if self._conn:
+            self._conn.close()
+        self._process = None
+        self._conn = None
+
+    def restart(self):
+        self.restarts += 1
+        _RESTARTS.inc()
+        logger.warning(f"Restarting ASR worker (restart #{self.restarts})")
+        self._kill()
+        self.start()
+
+    def stop(self):
+        if self._conn:
+            try:
+                self._conn.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+        if self._process:
+            self._process.join(timeout=5)
+        self._kill()
+        if self._shm is not None:
+            self._audio = None
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+        logger.info("ASR worker stopped.")
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def _grow(self, samples):
+        """Replace the shared block with one of at least `samples`; a running worker re-attaches."""
+        samples = max(samples, self.max_samples * 2)
+        logger.warning(f"ASR window of {samples / self.sample_rate:.1f}s exceeds the shared block; growing it")
+        old = self._shm
+        self._audio = None
+        self._shm = shared_memory.SharedMemory(create=True, size=samples * 4)
+        self._audio = np.ndarray((samples,), dtype=np.float32, buffer=self._shm.buf)
+        self.max_samples = samples
+        if self._conn is not None:
+            try:
+                self._conn.send(("attach", samples, self._shm.name))
+                if not self._conn.poll(self.timeout):
+                    raise TimeoutError("ASR worker did not re-attach in time")
+                self._conn.recv()
+            except (EOFError, BrokenPipeError, ConnectionResetError, TimeoutError) as e:
+                logger.error(f"ASR worker failed: {e}")
+                self._kill()          # the next call restarts it on the new block
+        old.close()
+        old.unlink()
+
+    def _call(self, method, audio, *args):
+        # Never truncate: the worker's word timestamps are relative to the start of `audio`
+        if len(audio) > self.max_samples:
+            self._grow(len(audio))
+        n = len(audio)
+        started = time.perf_counter()
+
+        for attempt in range(2):
+            if self._process is None or not self._process.is_alive():
+                self.restart()
+            self._audio[:n] = audio
+            try:
+                self._conn.send((method, n, args))
+                if not self._conn.poll(self.timeout):
+                    raise TimeoutError(f"ASR worker did not answer within {self.timeout}s")
+                status, result = self._conn.recv()
+            except (EOFError, BrokenPipeError, ConnectionResetError, TimeoutError) as e:
+                logger.error(f"ASR worker failed: {e}")
+                self._kill()
+                if attempt:
+                    raise
+                continue
+            if status == "error":
+                raise RuntimeError(result)
+            _ROUNDTRIP.observe(time.perf_counter() - started)
+            return result
+
+    def transcribe(self, audio):
+        return self._call("transcribe", audio)
+
+    def transcribe_words(self, audio, prompt=None):
+        return self._call("transcribe_words", audio, prompt)
@@ -0,0 +1,327 @@
+"""
+Picks the Whisper configuration for this machine.
+
+`calibrate` transcribes a reference clip with candidate configurations in
+the windowed calls the streaming transcriber makes, from the most accurate
+model down. A configuration passes when its real-time factor over the
+clip is at most `max_rtf` and its p95 call latency is at most
+`max_latency`; the passing one with the lowest WER wins, the faster on a
+tie. Without a reference transcript, the transcript of the most accurate
+configuration tried stands in for one.
+
+Per model, thread counts are compared at the fastest setting (first
+compute type, beam 1); compute types and beam sizes are then tried at the
+best thread count. Smaller models are not tried once one has passed, and a
+model's remaining configurations are skipped once it misses the RTF
+target by `give_up` times. Calls are made one at a time, so `num_workers`
+stays at 1.
+
+The choice is cached per machine in a JSON file. `BackgroundASR` loads the
+model on a thread so startup doesn't wait for it; on first run it serves
+the default model while calibration runs, then switches.
+"""
+import os
+import json
+import time
+import hashlib
+import logging
+import platform
+import threading
+from utils.wer import wer
+
+logger = logging.getLogger("ASRTuner")
+
+SAMPLE_RATE = 16000
+MODELS = ("medium.en", "small.en", "base.en", "tiny.en")   # most accurate first
+BEAMS = (1, 5)
+
+
+def _default_factory(**config):
+    from asr.whisper_asr import WhisperASR
+    return WhisperASR(**config)
+
+
+def _cpu_name():
+    try:
+        with open("/proc/cpuinfo") as f:
+            for line in f:
+                if line.startswith("model name"):
+                    return line.split(":", 1)[1].strip()
+    except OSError:
+        pass
+    return platform.processor()
+
+
+def _ctranslate2():
+    try:
+        import ctranslate2
+        return ctranslate2
+    except ImportError:
+        return None
+
+
+def machine_key():
+    """Identifies this host and inference runtime: what a cached choice is valid for."""
+    ct2 = _ctranslate2()
+    parts = [
+        platform.node(),
+        platform.machine(),
+        _cpu_name(),
+        str(os.cpu_count()),
+        getattr(ct2, "__version__", ""),
+        str(ct2.get_cuda_device_count() if ct2 else 0),
+    ]
+    return hashlib.sha1("|".join(parts).encode()).hexdigest()[:16]
+
+
+def compute_types():
+    ct2 = _ctranslate2()
+    if ct2 and ct2.get_cuda_device_count() > 0:
+        return ("float16", "int8_float16")
+    return ("int8", "float32")
+
+
+def thread_counts(cores=None):
+    """All cores, half of them and 4, largest first; CTranslate2 rarely gains past 8-16 on one stream."""
+    cores = cores or os.cpu_count() or 1
+    return tuple(sorted({min(cores, 16), max(1, cores // 2), min(cores, 4)}, reverse=True))
+
+
+def measure(asr, audio, window_seconds=5.0):
+    """Transcribe `audio` in `window_seconds` calls; RTF, p95 call latency and the text."""
+    step = int(window_seconds * SAMPLE_RATE)
+    asr.transcribe_words(audio[:SAMPLE_RATE])          # first call allocates; keep it out of the timings
+    latencies = []
+    words = []
+    for start in range(0, len(audio), step):
+        window = audio[start:start + step]
+        started = time.perf_counter()
+        words += [w for _, _, w in asr.transcribe_words(window)]
+        latencies.append(time.perf_counter() - started)
+    latencies.sort()
+    return {
+        "rtf": sum(latencies) / max(len(audio) / SAMPLE_RATE, 1e-9),
+        "p95_latency": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+        "text": "".join(words),
+    }
+
+
+def calibrate(audio, reference=None, max_rtf=0.3, max_latency=1.0, window_seconds=5.0, models=MODELS,
+              types=None, threads=None, beams=BEAMS, give_up=3.0, factory=None):
+    """Returns (chosen config or None, every result); each result is a config plus its measurements."""
+    factory = factory or _default_factory
+    types = types or compute_types()
+    threads = threads or thread_counts()
+    results = []
+
+    def run(asr, config):
+        asr.beam_size = config["beam_size"]
+        result = {**config, **measure(asr, audio, window_seconds)}
+        result["passed"] = result["rtf"] <= max_rtf and result["p95_latency"] <= max_latency
+        results.append(result)
+        logger.info(f"{config}: RTF {result['rtf']:.2f}, p95 latency {result['p95_latency']:.2f}s")
+        return result
+
+    def candidate(model, compute_type, cpu_threads, beam_size):
+        return {"model_size": model, "compute_type": compute_type, "cpu_threads": cpu_threads,
+                "num_workers": 1, "beam_size": beam_size}
+
+    for model in models:
+        # Thread count at the fastest setting, then the rest at the best thread count
+        best, best_asr = None, None
+        for cpu_threads in threads:
+            config = candidate(model, types[0], cpu_threads, beams[0])
+            asr = factory(**config)
+            result = run(asr, config)
+            if best is None or result["rtf"] < best["rtf"]:
+                best, best_asr = result, asr
+            asr = None
+        if best["rtf"] > max_rtf * give_up:
+            logger.info(f"{model} is too slow here; skipping its other configurations")
+            continue
+        for compute_type in types:
+            asr = best_asr
+            if compute_type != types[0]:
+                asr = factory(**candidate(model, compute_type, best["cpu_threads"], beams[0]))
+            for beam in beams:
+                if compute_type != types[0] or beam != beams[0]:
+                    run(asr, candidate(model, compute_type, best["cpu_threads"], beam))
+        best_asr = asr = None
+        if any(r["passed"] and r["model_size"] == model for r in results):
+            break
+
+    if reference is None and results:
+        # The most accurate model tried, at the widest beam it was run with
+        first = [r for r in results if r["model_size"] == results[0]["model_size"]]
+        reference = max(first, key=lambda r: r["beam_size"])["text"]
+    for r in results:
+        r["wer"] = wer(reference, r["text"]) if reference else 0.0
+
+    passed = [r for r in results if r["passed"]]
+    if not passed:
+        return None, results
+    chosen = min(passed, key=lambda r: (round(r["wer"], 3), r["rtf"]))
+    return _config(chosen), results
+
+
+def _config(result):
+    return {k: result[k] for k in ("model_size", "compute_type", "cpu_threads", "num_workers", "beam_size")}
+
+
+def load_choice(path, targets=None):
+    """The cached configuration for this machine (and these targets, if given); None if there is none."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            entry = json.load(f).get(machine_key())
+    except (OSError, ValueError):
+        return None
+    if not entry or (targets is not None and entry.get("targets") != targets):
+        return None
+    return entry["config"]
+
+
+def save_choice(path, config, targets, result=None):
+    try:
+        with open(path, encoding="utf-8") as f:
+            choices = json.load(f)
+    except (OSError, ValueError):
+        choices = {}
+    choices[machine_key()] = {
+        "config": config,
+        "targets": targets,
+        "measured": {k: round(result[k], 3) for k in ("rtf", "p95_latency", "wer")} if result else None,
+        "machine": f"{platform.node()} {_cpu_name()} x{os.cpu_count()}",
+        "calibrated_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+    }
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(choices, f, indent=2)
+    os.replace(path + ".tmp", path)
+
+
+def load_clip(path):
+    """16 kHz mono audio of a calibration clip, and the transcript beside it (`<clip>.txt`) if any."""
+    from audio.wav_reader import WavFile
+    audio = WavFile(path).to_mono(SAMPLE_RATE)
+    reference = None
+    transcript = os.path.splitext(path)[0] + ".txt"
+    if os.path.exists(transcript):
+        with open(transcript, encoding="utf-8") as f:
+            reference = f.read()
+    return audio, reference
+
+
+def tuned_config(clip, path, max_rtf=0.3, max_latency=1.0, window_seconds=5.0, recalibrate=False, **kwargs):
+    """
+    The configuration to use on this machine: cached, else calibrated on
+    `clip` and cached. None if there is no clip to calibrate on or nothing
+    met the targets.
+    """
+    targets = {"max_rtf": max_rtf, "max_latency": max_latency, "window_seconds": window_seconds}
+    config = None if recalibrate else load_choice(path, targets)
+    if config:
+        return config
+    if not clip or not os.path.exists(clip):
+        logger.warning(f"No ASR calibration clip at {clip}; using the default configuration")
+        return None
+    audio, reference = load_clip(clip)
+    logger.info(f"Calibrating ASR on {clip} ({len(audio) / SAMPLE_RATE:.0f}s, "
+                f"{'with' if reference else 'no'} reference transcript)")
+    started = time.perf_counter()
+    config, results = calibrate(audio, reference, max_rtf, max_latency, window_seconds, **kwargs)
+    logger.info(f"Calibration took {time.perf_counter() - started:.0f}s; chose {config}")
+    if config is None:
+        logger.warning("No ASR configuration met the targets; using the default configuration")
+        return None
+    chosen = next(r for r in results if r["passed"] and _config(r) == config)
+    save_choice(path, config, targets, chosen)
+    return config
+
+
+class BackgroundASR:
+    """
+    Stands in for an ASR while `load()` builds the real one on a thread.
+
+    Calls block until the model is ready (the capture ring holds the audio
+    meanwhile) and raise if loading failed. If `upgrade` is given, it runs
+    on the same thread once the first model is serving, e.g. to calibrate
+    on first run; an ASR it returns replaces the current one between calls.
+    Calibrating while the live model works makes the measurements
+    pessimistic, never optimistic.
+    """
+
+    def __init__(self, load, upgrade=None):
+        self._load = load
+        self._upgrade = upgrade
+        self._ready = threading.Event()
+        self._lock = threading.Lock()         # held per call, so a swap never lands mid-call
+        self._stopped = False
+        self.asr = None
+        self.error = None
+        self.load_seconds = None
+        self.upgraded = False
+
+    def start(self):
+        threading.Thread(target=self._run, name="asr-load", daemon=True).start()
+        return self
+
+    def _run(self):
+        started = time.perf_counter()
+        try:
+            self.asr = self._load()
+            self.load_seconds = time.perf_counter() - started
+            logger.info(f"ASR model ready in {self.load_seconds:.1f}s")
+        except Exception as e:
+            self.error = e
+            logger.error(f"Failed to load the ASR model: {e}")
+        finally:
+            self._ready.set()
+        if self._upgrade and self.asr is not None:
+            self._run_upgrade()
+
+    def _run_upgrade(self):
+        try:
+            better = self._upgrade()
+        except Exception as e:
+            logger.error(f"ASR upgrade failed, keeping the current model: {e}")
+            return
+        if better is None:
+            return
+        with self._lock:
+            if self._stopped:
+                old = better
+            else:
+                old, self.asr = self.asr, better
+                self.upgraded = True
+                logger.info("Switched to the calibrated ASR model")
+        if hasattr(old, "stop"):
+            old.stop()
+
+    def ready(self) -> bool:
+        return self._ready.is_set() and self.asr is not None
+
+    def wait(self, timeout=None):
+        if not self._ready.wait(timeout):
+            raise TimeoutError("ASR model is still loading")
+        if self.error:
+            raise RuntimeError(f"ASR model failed to load: {self.error}")
+        return self.asr
+
+    def transcribe(self, audio):
+        self.wait()
+        with self._lock:
+            return self.asr.transcribe(audio)
+
+    def transcribe_words(self, audio, prompt=None):
+        self.wait()
+        with self._lock:
+            return self.asr.transcribe_words(audio, prompt)
+
+    def stop(self, timeout=30.0):
+        if not self._ready.wait(timeout):
+            return
+        with self._lock:
+            self._stopped = True
+            asr = self.asr
+        if hasattr(asr, "stop"):
+            asr.stop()
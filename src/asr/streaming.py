@@ -0,0 +1,243 @@
+import time
+import logging
+from audio.ring_buffer import RingBuffer
+
+logger = logging.getLogger("StreamingASR")
+
+
+def _norm(word: str) -> str:
+    return word.strip().lower().strip(".,!?;:\"'")
+
+
+class HypothesisBuffer:
+    """
+    LocalAgreement-2: a word is committed once two consecutive passes over the
+    growing window agree on it.
+    """
+
+    def __init__(self):
+        self.committed = []      # (start, end, word) committed and still inside the window
+        self.previous = []       # unconfirmed tail of the last pass
+        self.new = []
+        self.last_committed_time = 0.0
+
+    def insert(self, words, offset):
+        words = [(s + offset, e + offset, w) for s, e, w in words]
+        # Drop whatever the window re-transcribed from already committed audio
+        self.new = [w for w in words if w[0] > self.last_committed_time - 0.1]
+
+        # Words straddling the commit point can come back once more; strip the
+        # longest n-gram that repeats the tail of the committed text.
+        if self.new and self.committed and abs(self.new[0][0] - self.last_committed_time) < 1.0:
+            for n in range(min(len(self.committed), len(self.new), 5), 0, -1):
+                tail = [_norm(w[2]) for w in self.committed[-n:]]
+                head = [_norm(w[2]) for w in self.new[:n]]
+                if tail == head:
+                    self.new = self.new[n:]
+                    break
+
+    def flush(self):
+        commit = []
+        while self.new and self.previous:
+            if _norm(self.new[0][2]) != _norm(self.previous[0][2]):
+                break
+            word = self.new.pop(0)
+            self.previous.pop(0)
+            commit.append(word)
+            self.last_committed_time = word[1]
+        self.previous = self.new
+        self.new = []
+        self.committed.extend(commit)
+        return commit
+
+    def pop_committed(self, before_time):
+        while self.committed and self.committed[0][1] <= before_time:
+            self.committed.pop(0)
+
+    def pending(self):
+        return self.previous
+
+
+class StreamingTranscriber:
+    """
+    Rolling-window transcription over a `WhisperASR`.
+
+    Audio is appended with `insert_audio`; every `step_seconds` of new audio
+    `process` re-transcribes the whole window, commits the prefix that agrees
+    with the previous pass and returns it as text. The window is trimmed at the
+    last committed word once it grows past `max_window_seconds`, so each pass
+    overlaps the previous one instead of cutting words at chunk boundaries.
+
+    Pass the capture `ring` the chunks are read from and the window becomes a
+    zero-copy view of it; otherwise chunks are copied into a private ring.
+    """
+
+    def __init__(self, asr, sample_rate=16000, step_seconds=1.0,
+                 max_window_seconds=15.0, prompt_chars=200, ring=None):
+        self.asr = asr
+        self.sample_rate = sample_rate
+        self.step_seconds = step_seconds
+        self.max_window_seconds = max_window_seconds
+        self.prompt_chars = prompt_chars
+
+        self._owns_ring = ring is None
+        self.ring = ring or RingBuffer(int(sample_rate * (max_window_seconds + step_seconds) * 2))
+        self.start_index = self.ring.read_index     # absolute sample index of the window start
+        self.end_index = self.start_index
+        self.last_insert_wall = None
+        self.unprocessed = 0.0
+        self.hypothesis = HypothesisBuffer()
+        self.prompt_text = ""        # committed text that has left the window
+
+        self.stats = {
+            "passes": 0,
+            "audio_seconds": 0.0,
+            "processing_seconds": 0.0,
+            "committed_segments": 0,
+            "latency_sum": 0.0,
+            "latency_max": 0.0,
+        }
+
+    @property
+    def buffer_offset(self):
+        return self.start_index / self.sample_rate
+
+    @property
+    def stream_time(self):
+        return self.end_index / self.sample_rate
+
+    def insert_audio(self, chunk):
+        if self._owns_ring:
+            self.ring.write(chunk)
+            self.end_index = self.ring.write_index
+        else:
+            # The chunk was just consumed from the shared ring, so it ends at the read position
+            self.end_index = self.ring.read_index
+        self.unprocessed += len(chunk) / self.sample_rate
+        self.last_insert_wall = time.time()
+
+    def insert_span(self, start, end):
+        """
+        Shared-ring mode: extend the window with ring samples [start, end).
+
+        A gap before `start` (silence dropped by a VAD) finishes the current
+        segment and starts a new window; returns any text that finishing commits.
+        """
+        texts = []
+        if start > self.end_index:
+            texts = self.finish_segment()
+            self.start_index = self.end_index = start
+        self.unprocessed += (end - max(start, self.end_index)) / self.sample_rate
+        self.end_index = max(end, self.end_index)
+        self.last_insert_wall = time.time()
+        return texts
+
+    def has_audio(self) -> bool:
+        return self.end_index > self.start_index
+
+    def _window(self):
+        oldest = self.ring.write_index - self.ring.capacity
+        if self.start_index < oldest:
+            logger.warning("Streaming window overran the audio ring; dropping the oldest audio")
+            self.start_index = oldest
+        return self.ring.view(self.start_index, self.end_index)
+
+    def ready(self) -> bool:
+        return self.unprocessed >= self.step_seconds
+
+    def _prompt(self):
+        committed_in_window = "".join(w[2] for w in self.hypothesis.committed)
+        return (self.prompt_text + committed_in_window)[-self.prompt_chars:].strip()
+
+    def _received_at(self, stream_t):
+        # Wall-clock time the audio at `stream_t` arrived, assuming real-time capture
+        return self.last_insert_wall - (self.stream_time - stream_t)
+
+    def process(self):
+        """Run one pass over the window and return newly committed text (list of str)."""
+        self.unprocessed = 0.0
+        audio = self._window()
+        if len(audio) == 0:
+            return []
+
+        window_seconds = len(audio) / self.sample_rate
+        started = time.perf_counter()
+        words = self.asr.transcribe_words(audio, prompt=self._prompt())
+        elapsed = time.perf_counter() - started
+
+        self.hypothesis.insert(words, self.buffer_offset)
+        committed = self.hypothesis.flush()
+
+        self.stats["passes"] += 1
+        self.stats["audio_seconds"] += window_seconds
+        self.stats["processing_seconds"] += elapsed
+        rtf = elapsed / window_seconds if window_seconds else 0.0
+
+        texts = []
+        if committed:
+            text = "".join(w[2] for w in committed).strip()
+            latency = time.time() - self._received_at(committed[-1][1])
+            self.stats["committed_segments"] += 1
+            self.stats["latency_sum"] += latency
+            self.stats["latency_max"] = max(self.stats["latency_max"], latency)
+            logger.info(f"Committed {len(committed)} words | latency {latency:.2f}s | "
+                        f"window {window_seconds:.1f}s | RTF {rtf:.2f}")
+            texts.append(text)
+
+        self._trim()
+        return texts
+
+    def _trim(self):
+        window_seconds = (self.end_index - self.start_index) / self.sample_rate
+        if window_seconds <= self.max_window_seconds:
+            return
+
+        committed = self.hypothesis.committed
+        if committed:
+            cut_time = committed[-1][1]
+        else:
+            # Nothing agreed on for a whole window; drop the oldest half rather than grow forever
+            cut_time = self.buffer_offset + window_seconds / 2
+
+        cut = int((cut_time - self.buffer_offset) * self.sample_rate)
+        if cut <= 0:
+            return
+
+        self.prompt_text += "".join(w[2] for w in committed if w[1] <= cut_time)
+        self.prompt_text = self.prompt_text[-self.prompt_chars:]
+        self.hypothesis.pop_committed(cut_time)
+        self.start_index += cut
+
+    def finish_segment(self):
+        """
+        Commit everything still pending and empty the window, e.g. when speech
+        ends or at shutdown; the committed text carries over as the prompt.
+        """
+        texts = []
+        if self.has_audio():
+            if self.unprocessed > 0:
+                texts += self.process()
+            pending = self.hypothesis.pending()
+            text = "".join(w[2] for w in pending).strip()
+            if text:
+                texts.append(text)
+            self.hypothesis.committed.extend(pending)
+
+        self.prompt_text = (self.prompt_text + "".join(w[2] for w in self.hypothesis.committed))[-self.prompt_chars:]
+        self.hypothesis = HypothesisBuffer()
+        self.hypothesis.last_committed_time = self.stream_time
+        self.start_index = self.end_index
+        self.unprocessed = 0.0
+        return texts
+
+    def summary(self):
+        s = self.stats
+        segments = s["committed_segments"] or 1
+        audio = s["audio_seconds"] or 1.0
+        return {
+            "passes": s["passes"],
+            "committed_segments": s["committed_segments"],
+            "avg_latency": s["latency_sum"] / segments,
+            "max_latency": s["latency_max"],
+            "rtf": s["processing_seconds"] / audio,
+        }
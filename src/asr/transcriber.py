@@ -0,0 +1,97 @@
+import logging
+import numpy as np
+from asr.streaming import StreamingTranscriber
+from audio.vad import EnergyVAD
+
+logger = logging.getLogger("Transcriber")
+
+
+class Transcriber:
+    """
+    Turns what an `AudioStream` captured into transcript text, one `step()`
+    at a time.
+
+    Each step takes everything captured since the previous one and drops
+    silence with the VAD. In streaming mode it then advances the streaming
+    transcriber (and commits the tail when speech ends). In batch mode it
+    transcribes once `batch_seconds` of speech has gathered. Steps run
+    Whisper, so they block; call them from one thread.
+    """
+
+    def __init__(self, audio_stream, asr, streaming=True, vad=True, step_seconds=1.0,
+                 max_window_seconds=15.0, batch_seconds=1.0):
+        self.audio_stream = audio_stream
+        self.asr = asr
+        self.ring = audio_stream.ring
+        self.sample_rate = audio_stream.target_rate
+        self.batch_seconds = batch_seconds
+        self.vad = EnergyVAD(sample_rate=self.sample_rate) if vad else None
+        self.streamer = None
+        if streaming:
+            self.streamer = StreamingTranscriber(
+                asr,
+                sample_rate=self.sample_rate,
+                step_seconds=step_seconds,
+                max_window_seconds=max_window_seconds,
+                ring=self.ring
+            )
+        self._buffer = []
+        self._buffered = 0.0
+
+    def pending(self) -> bool:
+        """True if there is speech that a later step or `finish` would still transcribe."""
+        if self.streamer:
+            return self.streamer.has_audio()
+        return bool(self._buffer)
+
+    def step(self):
+        """Process newly captured audio; returns the texts it committed (often none)."""
+        ring = self.ring
+        chunk = self.audio_stream.get_chunk()
+        if chunk is None:
+            return []
+        chunk_end = ring.read_index
+        if self.vad:
+            spans = self.vad.process(chunk, chunk_end - len(chunk))
+        else:
+            spans = [(chunk_end - len(chunk), chunk_end)]
+
+        if self.streamer:
+            texts = []
+            for start, end in spans:
+                texts += self.streamer.insert_span(start, end)
+            if self.streamer.ready():
+                texts += self.streamer.process()
+            elif self.vad and not self.vad.in_speech and self.streamer.has_audio():
+                # Speech ended: commit the tail now instead of waiting for more audio
+                texts += self.streamer.finish_segment()
+            return texts
+
+        for start, end in spans:
+            self._buffer.append(ring.view(start, end).copy())
+            self._buffered += (end - start) / self.sample_rate
+        if self._buffered >= self.batch_seconds:
+            return self._transcribe_buffer()
+        return []
+
+    def _transcribe_buffer(self):
+        audio = np.concatenate(self._buffer)
+        self._buffer = []
+        self._buffered = 0.0
+        return self.asr.transcribe(audio)
+
+    def finish(self):
+        """Transcribe whatever is still held back, e.g. at shutdown."""
+        texts = self.step()
+        if self.streamer:
+            texts += self.streamer.finish_segment()
+        elif self._buffer:
+            texts += self._transcribe_buffer()
+        return texts
+
+    def log_stats(self):
+        if self.streamer:
+            logger.info(f"Streaming ASR stats: {self.streamer.summary()}")
+        if self.vad:
+            logger.info(f"VAD stats: {self.vad.stats()}")
+        logger.info(f"Audio ring stats: {self.audio_stream.stats()}")
@@ -1,13 +1,59 @@
+import time
 from faster_whisper import WhisperModel
+from utils import metrics
+
+SAMPLE_RATE = 16000
+_LATENCY = metrics.histogram("asr_latency_seconds", "Whisper call duration")
+_RTF = metrics.histogram("asr_real_time_factor", "Whisper call duration / audio duration",
+                         buckets=metrics.RATIO_BUCKETS)
+_AUDIO = metrics.counter("asr_audio_seconds_total", "Audio passed to Whisper")
+
+
+def _observe(started, audio):
+    elapsed = time.perf_counter() - started
+    seconds = len(audio) / SAMPLE_RATE
+    _LATENCY.observe(elapsed)
+    _AUDIO.inc(seconds)
+    if seconds:
+        _RTF.observe(elapsed / seconds)
 
 class WhisperASR:
-    def __init__(self, model_size="base"):
-        self.model = WhisperModel(model_size, compute_type="int8")
+    def __init__(self, model_size="base", compute_type="int8", cpu_threads=0, num_workers=1, beam_size=5):
+        self.beam_size = beam_size
+        self.model = WhisperModel(
+            model_size,
+            compute_type=compute_type,
+            cpu_threads=cpu_threads,
+            num_workers=num_workers
+        )
 
     def transcribe(self, audio):
+        started = time.perf_counter()
+        segments, _ = self.model.transcribe(
+            audio,
+            language="en",
+            beam_size=self.beam_size,
+            vad_filter=True
+        )
+        texts = [segment.text for segment in segments]
+        _observe(started, audio)
+        return texts
+
+    def transcribe_words(self, audio, prompt=None):
+        """Return (start, end, word) tuples with timestamps relative to `audio`."""
+        started = time.perf_counter()
         segments, _ = self.model.transcribe(
             audio,
             language="en",
+            beam_size=self.beam_size,
+            initial_prompt=prompt or None,
+            condition_on_previous_text=False,
+            word_timestamps=True,
             vad_filter=True
         )
-        return [segment.text for segment in segments]
+        words = []
+        for segment in segments:
+            for word in segment.words or []:
+                words.append((word.start, word.end, word.word))
+        _observe(started, audio)
+        return words
@@ -1,24 +1,79 @@
-import pyaudiowpatch as pyaudio
-import numpy as np
-import queue
-import scipy.signal
+try:
+    import pyaudiowpatch as pyaudio
+except ImportError:  # Windows-only; replay (benchmarks/bench_replay.py) feeds audio without it
+    pyaudio = None
+from audio.resampler import StreamingResampler
+from audio.ring_buffer import RingBuffer
+from audio.jitter import CallbackJitter
+from utils import metrics
+
+_CALLBACK_FLAGS = metrics.counter("audio_callback_flags_total", "Capture callbacks flagged with an input overflow or other status")
 
 class AudioStream:
-    def __init__(self, device_index=13, target_rate=16000, channels=2, chunk_size=512):
+    """
+    Loopback capture resampled into a ring buffer.
+
+    With `native_rate` given no device is opened: audio is pushed with
+    `feed()` instead, which runs exactly what the capture callback runs.
+
+    `on_audio`, if set, is called from the capture thread each time about
+    `notify_seconds` of new audio has been written, so a consumer can wait
+    for audio instead of polling for it.
+    """
+
+    def __init__(self, device_index=13, target_rate=16000, channels=2, chunk_size=512, buffer_seconds=60,
+                 native_rate=None, notify_seconds=0.25):
         self.device_index = device_index
         self.target_rate = target_rate
         self.channels = channels
         self.chunk_size = chunk_size
-        self.queue = queue.Queue()
-        self.p = pyaudio.PyAudio()
+        # Resampled mono audio, written in place by the callback
+        self.ring = RingBuffer(int(target_rate * buffer_seconds))
+        self.p = None
         self.stream = None
-        self.native_rate = int(self.p.get_device_info_by_index(device_index)["defaultSampleRate"])
+        if native_rate is None:
+            if pyaudio is None:
+                raise RuntimeError("pyaudiowpatch is not installed; pass native_rate and feed() audio instead")
+            self.p = pyaudio.PyAudio()
+            native_rate = int(self.p.get_device_info_by_index(device_index)["defaultSampleRate"])
+        self.native_rate = native_rate
+        self.resampler = StreamingResampler(self.native_rate, target_rate, channels, max_frames=chunk_size)
+        self.jitter = CallbackJitter(chunk_size / self.native_rate)
+        self.on_audio = None
+        self.notify_samples = int(target_rate * notify_seconds)
+        self._unnotified = 0
+
+        # Read at scrape time; nothing is added to the callback
+        ring = self.ring
+        metrics.gauge("audio_ring_depth_seconds", "Captured audio not yet consumed",
+                      fn=lambda: ring.available() / target_rate)
+        metrics.counter("audio_ring_overflows_total", "Samples overwritten before the consumer read them",
+                        fn=lambda: ring.overflows)
+        metrics.counter("audio_callbacks_total", "Capture callbacks", fn=lambda: self.jitter.count)
+        metrics.gauge("audio_callback_jitter_p99_ms", "p99 deviation of the callback interval",
+                      fn=lambda: self.jitter.stats().get("jitter_p99_ms", 0.0))
+
+    def feed(self, in_data, frame_count, status=0):
+        """Resample `frame_count` interleaved PCM16 frames into the ring."""
+        self.jitter.tick()
+        if status:
+            _CALLBACK_FLAGS.inc()
+        out = self.ring.reserve(self.resampler.output_length(frame_count))
+        audio = self.resampler.process(in_data, out=out)
+        self.ring.commit(len(audio))
+        if self.on_audio:
+            self._unnotified += len(audio)
+            if self._unnotified >= self.notify_samples:
+                self._unnotified = 0
+                self.on_audio()
 
     def _callback(self, in_data, frame_count, time_info, status):
-        self.queue.put(in_data)
+        self.feed(in_data, frame_count, status)
         return (in_data, pyaudio.paContinue)
 
     def start(self):
+        if self.p is None:
+            return self
         self.stream = self.p.open(
             format=pyaudio.paInt16,
             channels=self.channels,
@@ -40,20 +95,16 @@ class AudioStream:
         if self.stream:
             self.stream.stop_stream()
             self.stream.close()
-        self.p.terminate()
+        if self.p:
+            self.p.terminate()
 
     def get_chunk(self):
-        try:
-            data = self.queue.get_nowait()
-            audio_np = np.frombuffer(data, dtype=np.int16).astype(np.float32) / 32768.0
-            
-            if self.channels > 1:
-                audio_np = audio_np.reshape(-1, self.channels).mean(axis=1)
-            
-            if self.native_rate != self.target_rate:
-                num_samples = int(len(audio_np) * self.target_rate / self.native_rate)
-                audio_np = scipy.signal.resample(audio_np, num_samples)
-                
-            return audio_np
-        except queue.Empty:
-            return None
+        """Zero-copy view of everything captured since the last call, or None."""
+        return self.ring.read_available()
+
+    def latest(self, seconds):
+        """Zero-copy view of the last `seconds` of captured audio."""
+        return self.ring.latest(int(seconds * self.target_rate))
+
+    def stats(self):
+        return {**self.ring.stats(), **self.jitter.stats()}
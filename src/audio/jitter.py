@@ -0,0 +1,41 @@
+import time
+import numpy as np
+
+
+class CallbackJitter:
+    """Records intervals between audio callbacks in a fixed-size array; `tick` is allocation-free."""
+
+    def __init__(self, expected_interval, size=4096):
+        self.expected_interval = expected_interval
+        self._intervals = np.zeros(size, dtype=np.float64)
+        self._count = 0
+        self._last = None
+
+    @property
+    def count(self):
+        """Intervals recorded since the last reset."""
+        return self._count
+
+    def tick(self):
+        now = time.perf_counter()
+        if self._last is not None:
+            self._intervals[self._count % len(self._intervals)] = now - self._last
+            self._count += 1
+        self._last = now
+
+    def reset(self):
+        self._count = 0
+        self._last = None
+
+    def stats(self):
+        n = min(self._count, len(self._intervals))
+        if not n:
+            return {"callbacks": 0}
+        deviation = np.abs(self._intervals[:n] - self.expected_interval) * 1000
+        return {
+            "callbacks": self._count,
+            "expected_ms": self.expected_interval * 1000,
+            "jitter_mean_ms": float(deviation.mean()),
+            "jitter_p99_ms": float(np.percentile(deviation, 99)),
+            "jitter_max_ms": float(deviation.max()),
+        }
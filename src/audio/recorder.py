@@ -0,0 +1,188 @@
+import os
+import time
+import wave
+import queue
+import logging
+import threading
+from audio.wav_reader import WavFile
+from utils import metrics
+
+try:
+    import soundfile
+except ImportError:  # optional: only needed for compress="flac"
+    soundfile = None
+
+logger = logging.getLogger("Recorder")
+
+_DROPPED = metrics.counter("recorder_dropped_frames_total", "Captured frames dropped because the disk writer fell behind")
+_SEGMENTS = metrics.counter("recorder_segments_total", "Recording segments finished")
+
+
+def _encode_flac(path, target):
+    # Its own function so the memory map is released before the WAV is deleted
+    wav = WavFile(path)
+    with soundfile.SoundFile(target, "w", samplerate=wav.sample_rate, channels=wav.channels,
+                             format="FLAC", subtype="PCM_16") as out:
+        for block in wav.blocks():
+            out.write(block)
+
+
+class SegmentRecorder:
+    """
+    Writes captured PCM16 audio to disk as it arrives, in segments of
+    `segment_seconds`.
+
+    `write()` only queues the block; a writer thread appends it to the open
+    segment's WAV, whose header is kept current so a crash loses at most
+    what is queued. The queue is bounded: if the disk stalls for longer than
+    it holds, blocks are dropped and counted instead of blocking capture.
+    Memory use is the queue plus one block being encoded, however long the
+    recording.
+
+    A full segment is closed and the next one opened. With
+    `compress="flac"` (needs `soundfile`) a second thread re-encodes closed
+    segments to FLAC and deletes the WAVs. Either way that thread then calls
+    `on_segment(path, start_seconds, duration)`, so finished segments can be
+    transcribed while recording continues.
+    """
+
+    def __init__(self, directory, prefix, sample_rate, channels=2, sample_width=2, segment_seconds=300.0,
+                 compress=None, on_segment=None, max_queued_blocks=1024):
+        if compress not in (None, "flac"):
+            raise ValueError(f"Unsupported compression: {compress}")
+        if compress and soundfile is None:
+            logger.warning("soundfile is not installed; keeping segments as WAV")
+            compress = None
+        self.directory = directory
+        self.prefix = prefix
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.sample_width = sample_width
+        self.frame_bytes = channels * sample_width
+        self.segment_frames = int(segment_seconds * sample_rate)
+        self.compress = compress
+        self.on_segment = on_segment
+
+        self._blocks = queue.Queue(maxsize=max_queued_blocks)
+        self._finished = queue.Queue()
+        self._writer_thread = None
+        self._finisher_thread = None
+        self.segments = []
+        self.frames_written = 0
+        self.dropped_frames = 0
+        self.max_queued = 0
+
+    def start(self):
+        os.makedirs(self.directory, exist_ok=True)
+        self._writer_thread = threading.Thread(target=self._writer, name="recorder-writer", daemon=True)
+        self._finisher_thread = threading.Thread(target=self._finisher, name="recorder-finisher", daemon=True)
+        self._writer_thread.start()
+        self._finisher_thread.start()
+        return self
+
+    def write(self, data):
+        """Queue one captured block; never blocks."""
+        try:
+            self._blocks.put_nowait(data)
+        except queue.Full:
+            frames = len(data) // self.frame_bytes
+            self.dropped_frames += frames
+            _DROPPED.inc(frames)
+
+    def stop(self):
+        """Close the last segment and wait until every segment is final; returns their paths."""
+        self._blocks.put(None)
+        self._writer_thread.join()
+        self._finisher_thread.join()
+        return list(self.segments)
+
+    def _open(self, index):
+        path = os.path.join(self.directory, f"{self.prefix}_{index:03d}.wav")
+        wav = wave.open(path, "wb")
+        wav.setnchannels(self.channels)
+        wav.setsampwidth(self.sample_width)
+        wav.setframerate(self.sample_rate)
+        return path, wav
+
+    def _writer(self):
+        index = 0
+        path, wav, in_segment = None, None, 0
+        stopping = False
+        while not stopping:
+            # Take whatever has queued up, so the header is patched once per batch rather than per block
+            pending = [self._blocks.get()]
+            # Real queue depth, not the batch size: how close capture came to dropping frames
+            self.max_queued = max(self.max_queued, 1 + self._blocks.qsize())
+            while len(pending) < 64:
+                try:
+                    pending.append(self._blocks.get_nowait())
+                except queue.Empty:
+                    break
+            if pending[-1] is None:
+                stopping = True
+                pending.pop()
+            data = b"".join(pending)
+            pending = None
+
+            while data:
+                if wav is None:
+                    path, wav = self._open(index)
+                    in_segment = 0
+                room = (self.segment_frames - in_segment) * self.frame_bytes
+                part, data = data[:room], data[room:]
+                wav.writeframes(part)
+                in_segment += len(part) // self.frame_bytes
+                if in_segment >= self.segment_frames:
+                    wav.close()
+                    self._finished.put((path, index * self.segment_frames / self.sample_rate,
+                                        in_segment / self.sample_rate))
+                    index += 1
+                    wav = None
+            self.frames_written = index * self.segment_frames + (in_segment if wav else 0)
+
+        if wav is not None:
+            wav.close()
+            if in_segment:
+                self._finished.put((path, index * self.segment_frames / self.sample_rate, in_segment / self.sample_rate))
+            else:
+                os.remove(path)
+        self._finished.put(None)
+
+    def _finisher(self):
+        while True:
+            item = self._finished.get()
+            if item is None:
+                return
+            path, start, duration = item
+            if self.compress == "flac":
+                path = self._to_flac(path)
+            self.segments.append(path)
+            _SEGMENTS.inc()
+            logger.info(f"Segment {os.path.basename(path)} finished ({duration:.0f}s from {start:.0f}s)")
+            if self.on_segment:
+                try:
+                    self.on_segment(path, start, duration)
+                except Exception:
+                    logger.exception("Error handling finished segment")
+
+    def _to_flac(self, path):
+        target = os.path.splitext(path)[0] + ".flac"
+        started = time.perf_counter()
+        try:
+            _encode_flac(path, target + ".tmp")
+            os.replace(target + ".tmp", target)
+            os.remove(path)
+        except Exception as e:
+            logger.error(f"Could not compress {path}, keeping the WAV: {e}")
+            return path
+        logger.info(f"Compressed {os.path.basename(target)} in {time.perf_counter() - started:.1f}s "
+                    f"({os.path.getsize(target) / 1e6:.1f} MB)")
+        return target
+
+    def stats(self):
+        return {
+            "segments": len(self.segments),
+            "seconds_written": round(self.frames_written / self.sample_rate, 1),
+            "dropped_frames": self.dropped_frames,
+            "max_queued_blocks": self.max_queued,
+        }
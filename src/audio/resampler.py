@@ -0,0 +1,112 @@
+from math import gcd
+import numpy as np
+import scipy.signal
+
+
+class StreamingResampler:
+    """
+    Polyphase FIR resampler that carries filter history between chunks.
+
+    `process` takes raw interleaved int16 bytes and does the int16 -> float
+    conversion, channel downmix and rate conversion in one pass over
+    preallocated buffers, so consecutive chunks join without seams.
+    """
+
+    def __init__(self, in_rate, out_rate, channels=1, taps_per_phase=32, max_frames=4096):
+        self.in_rate = int(in_rate)
+        self.out_rate = int(out_rate)
+        self.channels = channels
+        g = gcd(self.in_rate, self.out_rate)
+        self.up = self.out_rate // g
+        self.down = self.in_rate // g
+        self.passthrough = self.up == self.down
+
+        if self.passthrough:
+            self.taps = 1
+            self.bank = None
+        else:
+            self.taps = taps_per_phase
+            cutoff = 0.9 / max(self.up, self.down)
+            h = scipy.signal.firwin(self.taps * self.up, cutoff, window=("kaiser", 8.0)) * self.up
+            # bank[p] holds phase p's taps, reversed to line up with ascending input windows
+            self.bank = np.ascontiguousarray(h.reshape(self.taps, self.up).T[:, ::-1], dtype=np.float32)
+
+        self.history = self.taps - 1
+        self._next = 0            # upsampled-domain position of the next output, relative to the chunk start
+        self._alloc(max_frames)
+
+    def _alloc(self, max_frames):
+        old = getattr(self, "_buf", None)
+        self.max_frames = max_frames
+        self._buf = np.zeros(self.history + max_frames, dtype=np.float32)
+        if old is not None and self.history:
+            self._buf[:self.history] = old[:self.history]
+        max_out = max_frames * self.up // self.down + 2
+        self._j = np.arange(max_out, dtype=np.int64)
+        self._m = np.empty(max_out, dtype=np.int64)
+        self._base = np.empty(max_out, dtype=np.int64)
+        self._phase = np.empty(max_out, dtype=np.int64)
+        # Polyphase gather targets: a chunk's windows and taps are copied into these, not new arrays
+        self._offsets = np.tile(np.arange(self.taps, dtype=np.int64), (max_out, 1))
+        self._idx = np.empty((max_out, self.taps), dtype=np.int64)
+        self._rows = np.empty((max_out, self.taps), dtype=np.float32)
+        self._coefs = np.empty((max_out, self.taps), dtype=np.float32)
+        self._scale = np.float32(1.0 / (32768.0 * self.channels))
+        self._windows = np.lib.stride_tricks.sliding_window_view(self._buf, self.taps)
+
+    def output_length(self, frames):
+        """Upper bound on the number of output samples for `frames` input frames."""
+        return frames * self.up // self.down + 2
+
+    def process(self, data, out=None):
+        """Resample one chunk of int16 bytes; writes into `out` when given, returns the filled view."""
+        frames = np.frombuffer(data, dtype=np.int16).reshape(-1, self.channels)
+        n = len(frames)
+        if n > self.max_frames:
+            self._alloc(n)
+
+        h = self.history
+        x = self._buf[h:h + n]
+        np.copyto(x, frames[:, 0], casting="unsafe")
+        for c in range(1, self.channels):
+            x += frames[:, c]
+        x *= self._scale
+
+        if self.passthrough:
+            if out is None:
+                return x.copy()
+            out[:n] = x
+            return out[:n]
+
+        # Outputs whose base input index falls inside this chunk
+        limit = n * self.up
+        count = 0 if self._next >= limit else (limit - 1 - self._next) // self.down + 1
+        y = out[:count] if out is not None else np.empty(count, dtype=np.float32)
+        if self.up == 1:
+            # Pure decimation: one phase, outputs sit on a regular stride of the input
+            start = self._next
+            np.matmul(self._windows[start:start + count * self.down:self.down], self.bank[0], out=y)
+        else:
+            m = self._m[:count]
+            np.multiply(self._j[:count], self.down, out=m)
+            m += self._next
+            base = self._base[:count]
+            phase = self._phase[:count]
+            np.floor_divide(m, self.up, out=base)
+            np.remainder(m, self.up, out=phase)
+            # Index the contiguous buffer directly (take() copies a strided view such as _windows
+            # first); broadcasting only in copyto and "clip" mode both keep numpy from buffering
+            idx = self._idx[:count]
+            np.copyto(idx, base[:, None])
+            idx += self._offsets[:count]
+            rows = np.take(self._buf, idx, out=self._rows[:count], mode="clip")
+            coefs = np.take(self.bank, phase, axis=0, out=self._coefs[:count], mode="clip")
+            np.einsum("ij,ij->i", rows, coefs, out=y)
+
+        self._next += count * self.down - limit
+        self._buf[:h] = self._buf[n:n + h]
+        return y
+
+    def reset(self):
+        self._buf[:] = 0.0
+        self._next = 0
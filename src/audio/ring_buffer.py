@@ -0,0 +1,116 @@
+import numpy as np
+
+
+class RingBuffer:
+    """
+    Fixed-capacity single-producer/single-consumer float32 ring buffer.
+
+    Storage is mirrored (every sample lives at i and i + capacity), so any span
+    of up to `capacity` samples is one contiguous slice and reads are zero-copy
+    views. Positions are absolute sample counts since creation: the producer
+    only advances `write_index`, the consumer only advances `read_index`, so no
+    lock is needed between the audio callback and the worker.
+
+    Views stay valid until the producer laps them; size `capacity` for the
+    longest window you read plus a margin for how long you hold it.
+    """
+
+    def __init__(self, capacity, dtype=np.float32):
+        self.capacity = int(capacity)
+        self._data = np.zeros(2 * self.capacity, dtype=dtype)
+        self.write_index = 0
+        self.read_index = 0
+        self.overflows = 0           # samples the producer overwrote before they were read
+        self.underruns = 0           # reads that asked for more than was available
+
+    @property
+    def nbytes(self):
+        return self._data.nbytes
+
+    # Producer side
+
+    def reserve(self, n):
+        """Writable view for the next `n` samples; follow with `commit`."""
+        if n > self.capacity:
+            raise ValueError(f"Cannot reserve {n} samples in a ring of {self.capacity}")
+        w = self.write_index % self.capacity
+        return self._data[w:w + n]
+
+    def commit(self, n):
+        cap = self.capacity
+        w = self.write_index % cap
+        end = w + n
+        head_end = min(end, cap)
+        self._data[w + cap:head_end + cap] = self._data[w:head_end]
+        if end > cap:
+            self._data[:end - cap] = self._data[cap:end]
+
+        unread = self.write_index - self.read_index
+        self.overflows += max(0, unread + n - cap) - max(0, unread - cap)
+        self.write_index += n
+
+    def write(self, samples):
+        n = len(samples)
+        if n > self.capacity:
+            # The head would be overwritten by the tail straight away: skip it, counted like commit counts
+            skip = n - self.capacity
+            unread = self.write_index - self.read_index
+            self.overflows += max(0, unread + skip - self.capacity) - max(0, unread - self.capacity)
+            self.write_index += skip
+            samples = samples[skip:]
+            n = self.capacity
+        self.reserve(n)[:] = samples
+        self.commit(n)
+
+    # Consumer side
+
+    def available(self):
+        return min(self.write_index - self.read_index, self.capacity)
+
+    def _catch_up(self):
+        # Skip whatever the producer has already overwritten
+        oldest = self.write_index - self.capacity
+        if self.read_index < oldest:
+            self.read_index = oldest
+
+    def read(self, n):
+        """View of the next `n` unread samples, or None (and an underrun) if not enough yet."""
+        self._catch_up()
+        if self.write_index - self.read_index < n:
+            self.underruns += 1
+            return None
+        start = self.read_index
+        self.read_index += n
+        return self.view(start, start + n)
+
+    def read_available(self):
+        """View of everything unread, or None if empty."""
+        self._catch_up()
+        end = self.write_index
+        if end == self.read_index:
+            return None
+        start = self.read_index
+        self.read_index = end
+        return self.view(start, end)
+
+    def view(self, start, stop):
+        """Zero-copy view of absolute samples [start, stop); must lie within the last `capacity`."""
+        if stop - start > self.capacity or start < self.write_index - self.capacity or stop > self.write_index:
+            raise IndexError(f"Samples [{start}, {stop}) are not in the ring")
+        s = start % self.capacity
+        return self._data[s:s + (stop - start)]
+
+    def latest(self, n):
+        """View of the last `n` samples written (fewer if the ring holds less)."""
+        end = self.write_index
+        n = min(n, end, self.capacity)
+        return self.view(end - n, end)
+
+    def stats(self):
+        return {
+            "capacity": self.capacity,
+            "available": self.available(),
+            "overflows": self.overflows,
+            "underruns": self.underruns,
+            "nbytes": self.nbytes,
+        }
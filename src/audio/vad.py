@@ -0,0 +1,102 @@
+import numpy as np
+
+
+class EnergyVAD:
+    """
+    Cheap energy gate in front of the ASR.
+
+    Frames whose RMS rises above an adaptive noise floor start a speech run;
+    the run is held open for `hangover_ms` after the level drops and is
+    extended back by `pre_roll_ms` when it starts, so word onsets and tails
+    are not clipped. `process` works on absolute sample indices (as used by
+    `RingBuffer`) and returns the speech spans found in each chunk.
+    """
+
+    def __init__(self, sample_rate=16000, frame_ms=30, threshold_ratio=3.0, min_rms=0.003,
+                 hangover_ms=400, pre_roll_ms=300):
+        self.sample_rate = sample_rate
+        self.frame_len = int(sample_rate * frame_ms / 1000)
+        self.threshold_ratio = threshold_ratio
+        self.min_rms = min_rms
+        self.hangover_frames = max(1, int(hangover_ms / frame_ms))
+        self.pre_roll = int(sample_rate * pre_roll_ms / 1000)
+
+        self.noise_floor = None
+        self.in_speech = False
+        self._hang = 0
+        self._carry = np.zeros(self.frame_len, dtype=np.float32)
+        self._carry_n = 0
+        self._span_start = None      # open speech span, absolute index
+        self._emitted_end = 0        # end of the last emitted span, to keep pre-roll from overlapping it
+
+        self.total_samples = 0
+        self.speech_samples = 0
+
+    def _update_floor(self, rms, voiced):
+        if self.noise_floor is None:
+            self.noise_floor = rms
+        elif rms < self.noise_floor:
+            self.noise_floor += 0.1 * (rms - self.noise_floor)
+        else:
+            # Creep up (very slowly while voiced) so a steady new background such as a fan
+            # is eventually treated as noise; pauses between words pull the floor back down
+            self.noise_floor += (0.0005 if voiced else 0.01) * (rms - self.noise_floor)
+
+    def process(self, chunk, start_index):
+        """Classify `chunk` (starting at absolute sample `start_index`); return [(start, end), ...] speech spans."""
+        if self._carry_n:
+            x = np.concatenate([self._carry[:self._carry_n], chunk])
+            start_index -= self._carry_n
+        else:
+            x = chunk
+
+        frames = len(x) // self.frame_len
+        used = frames * self.frame_len
+        self._carry_n = len(x) - used
+        if self._carry_n:
+            self._carry[:self._carry_n] = x[used:]
+        if not frames:
+            return []
+
+        framed = x[:used].reshape(frames, self.frame_len)
+        levels = np.sqrt(np.einsum("ij,ij->i", framed, framed) / self.frame_len)
+
+        spans = []
+        for i, rms in enumerate(levels):
+            frame_start = start_index + i * self.frame_len
+            threshold = max(self.noise_floor * self.threshold_ratio if self.noise_floor else 0.0, self.min_rms)
+            voiced = rms > threshold
+            if voiced:
+                self._hang = self.hangover_frames
+                if not self.in_speech:
+                    self.in_speech = True
+                    self._span_start = max(frame_start - self.pre_roll, self._emitted_end, 0)
+            elif self.in_speech:
+                self._hang -= 1
+                if self._hang <= 0:
+                    self.in_speech = False
+                    spans.append((self._span_start, frame_start + self.frame_len))
+                    self._span_start = None
+            self._update_floor(float(rms), voiced)
+
+        end_index = start_index + used
+        if self.in_speech and end_index > self._span_start:
+            # Hand over what we have so far; the run continues in the next chunk
+            spans.append((self._span_start, end_index))
+            self._span_start = end_index
+
+        for s, e in spans:
+            self.speech_samples += e - s
+            self._emitted_end = e
+        self.total_samples += used
+        return spans
+
+    def stats(self):
+        transcribed = self.speech_samples / self.sample_rate
+        total = self.total_samples / self.sample_rate
+        return {
+            "audio_seconds": total,
+            "transcribed_seconds": transcribed,
+            "skipped_seconds": max(0.0, total - transcribed),
+            "noise_floor": self.noise_floor or 0.0,
+        }
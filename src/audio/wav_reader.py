@@ -0,0 +1,85 @@
+import struct
+import numpy as np
+from audio.resampler import StreamingResampler
+
+
+class WavFile:
+    """
+    Memory-mapped view of a PCM16 WAV file.
+
+    Only the RIFF header is parsed; samples stay on disk until touched, so a
+    multi-hour recording costs no RAM until it is converted.
+    """
+
+    def __init__(self, path):
+        self.path = str(path)
+        with open(self.path, "rb") as f:
+            riff, _, wave = struct.unpack("<4sI4s", f.read(12))
+            if riff != b"RIFF" or wave != b"WAVE":
+                raise ValueError(f"{self.path} is not a RIFF/WAVE file")
+
+            fmt = None
+            while True:
+                header = f.read(8)
+                if len(header) < 8:
+                    raise ValueError(f"{self.path} has no data chunk")
+                chunk_id, size = struct.unpack("<4sI", header)
+                if chunk_id == b"fmt ":
+                    fmt = struct.unpack("<HHIIHH", f.read(16))
+                    f.seek(size - 16 + (size & 1), 1)
+                elif chunk_id == b"data":
+                    data_offset = f.tell()
+                    data_size = size
+                    break
+                else:
+                    f.seek(size + (size & 1), 1)
+
+        if fmt is None:
+            raise ValueError(f"{self.path} has no fmt chunk")
+        audio_format, self.channels, self.sample_rate, _, _, bits = fmt
+        if audio_format != 1 or bits != 16:
+            raise ValueError(f"{self.path}: only 16-bit PCM is supported (format {audio_format}, {bits} bits)")
+
+        self.frames = data_size // (2 * self.channels)
+        self.samples = np.memmap(self.path, dtype=np.int16, mode="r", offset=data_offset,
+                                 shape=(self.frames, self.channels))
+
+    @property
+    def duration(self):
+        return self.frames / self.sample_rate
+
+    def blocks(self, block_frames=16384):
+        """Yield successive int16 (frames, channels) blocks, still memory-mapped."""
+        for start in range(0, self.frames, block_frames):
+            yield self.samples[start:start + block_frames]
+
+    def to_mono(self, target_rate=16000, block_frames=16384):
+        """Whole file as mono float32 at `target_rate`, in one array; for clips, see `mono_chunks` for recordings."""
+        resampler = StreamingResampler(self.sample_rate, target_rate, self.channels, max_frames=block_frames)
+        out = np.empty(resampler.output_length(self.frames), dtype=np.float32)
+        n = 0
+        for block in self.blocks(block_frames):
+            n += len(resampler.process(block, out=out[n:]))
+        return out[:n]
+
+    def chunk_count(self, chunk_seconds):
+        chunk_frames = int(chunk_seconds * self.sample_rate)
+        return max(1, -(-self.frames // chunk_frames))
+
+    def mono_chunks(self, target_rate=16000, chunk_seconds=600.0, first=0, block_frames=16384):
+        """
+        Yield (index, mono float32 at `target_rate`) per `chunk_seconds` of
+        the file, from chunk `first`. Only one chunk is in memory at a time;
+        the resampler carries over between chunks, so they join without
+        seams, except at `first` when starting mid-file. The yielded array
+        is reused for the next chunk.
+        """
+        chunk_frames = int(chunk_seconds * self.sample_rate)
+        resampler = StreamingResampler(self.sample_rate, target_rate, self.channels, max_frames=block_frames)
+        out = np.empty(resampler.output_length(chunk_frames), dtype=np.float32)
+        for index in range(first, self.chunk_count(chunk_seconds)):
+            n = 0
+            end = min(self.frames, (index + 1) * chunk_frames)
+            for start in range(index * chunk_frames, end, block_frames):
+                n += len(resampler.process(self.samples[start:min(end, start + block_frames)], out=out[n:]))
+            yield index, out[:n]
@@ -0,0 +1,169 @@
+"""
+Batch-transcribe a directory of recordings.
+
+    python src/batch_transcribe.py [recordings] [--out transcriptions] [--workers N] [--batch-size 8]
+
+Each worker process loads the model once and keeps it for every file it is
+given. WAVs are memory-mapped and transcribed in `--chunk-minutes` chunks,
+each converted to 16 kHz mono block by block, so memory doesn't grow with
+the recording. Segments are appended to `<name>.txt.partial` as they are
+produced and `<name>.txt.progress` records each finished chunk; the file is
+renamed to `<name>.txt` when complete. An interrupted run skips finished
+transcripts and picks a WAV up after its last finished chunk. Other formats
+are decoded whole by faster-whisper and start over.
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger("BatchTranscribe")
+
+_asr = None
+_pipeline = None
+
+
+def _init_worker(model_size, compute_type, cpu_threads, batch_size):
+    global _asr, _pipeline
+    from asr.whisper_asr import WhisperASR
+    _asr = WhisperASR(model_size, compute_type=compute_type, cpu_threads=cpu_threads)
+    if batch_size > 1:
+        try:
+            from faster_whisper import BatchedInferencePipeline
+            _pipeline = BatchedInferencePipeline(model=_asr.model)
+        except ImportError:
+            logger.warning("faster-whisper has no BatchedInferencePipeline; transcribing sequentially")
+
+
+def _open_wav(path):
+    from audio.wav_reader import WavFile
+    try:
+        return WavFile(path)
+    except ValueError:
+        # Not PCM16; let faster-whisper decode it
+        return None
+
+
+def _transcribe(audio, batch_size):
+    if _pipeline is not None:
+        segments, info = _pipeline.transcribe(audio, language="en", batch_size=batch_size)
+    else:
+        segments, info = _asr.model.transcribe(audio, language="en", vad_filter=True)
+    return segments, info
+
+
+def _resume_point(partial, progress, chunk_seconds):
+    """(finished chunks, transcript bytes they wrote) from an interrupted run, else (0, 0)."""
+    try:
+        with open(progress, encoding="utf-8") as f:
+            state = json.load(f)
+        if state["chunk_seconds"] == chunk_seconds and os.path.getsize(partial) >= state["bytes"]:
+            return state["chunks"], state["bytes"]
+    except (OSError, ValueError, KeyError):
+        pass
+    return 0, 0
+
+
+def _transcribe_file(path, out_dir, batch_size, chunk_seconds):
+    started = time.perf_counter()
+    target = Path(out_dir) / (Path(path).stem + ".txt")
+    partial = target.with_name(target.name + ".partial")
+    progress = target.with_name(target.name + ".progress")
+    wav = _open_wav(path)
+
+    if wav is None:
+        segments, info = _transcribe(str(path), batch_size)
+        with open(partial, "w", encoding="utf-8") as f:
+            for segment in segments:
+                f.write(segment.text + "\n")
+                f.flush()
+        os.replace(partial, target)
+        return str(path), info.duration, time.perf_counter() - started
+
+    first, size = _resume_point(partial, progress, chunk_seconds)
+    if first:
+        logger.info(f"Resuming {Path(path).name} at chunk {first + 1} of {wav.chunk_count(chunk_seconds)}")
+    with open(partial, "ab") as f:
+        f.truncate(size)          # drop anything written after the last finished chunk
+        for index, audio in wav.mono_chunks(16000, chunk_seconds, first):
+            segments, _ = _transcribe(audio, batch_size)
+            for segment in segments:
+                f.write((segment.text + "\n").encode("utf-8"))
+            f.flush()
+            os.fsync(f.fileno())
+            with open(str(progress) + ".tmp", "w", encoding="utf-8") as p:
+                json.dump({"chunk_seconds": chunk_seconds, "chunks": index + 1, "bytes": f.tell()}, p)
+            os.replace(str(progress) + ".tmp", progress)
+    os.replace(partial, target)
+    os.remove(progress)
+    return str(path), wav.duration, time.perf_counter() - started
+
+
+def pending_files(in_dir, out_dir, pattern, overwrite=False):
+    files = sorted(Path(in_dir).glob(pattern))
+    if overwrite:
+        return files
+    return [f for f in files if not (Path(out_dir) / (f.stem + ".txt")).exists()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch-transcribe recordings with one model per worker.")
+    parser.add_argument("input", nargs="?", default="recordings")
+    parser.add_argument("--out", default="transcriptions")
+    parser.add_argument("--pattern", default="*.wav")
+    parser.add_argument("--model", default="base")
+    parser.add_argument("--compute-type", default="int8")
+    parser.add_argument("--cpu-threads", type=int, default=2, help="CTranslate2 threads per worker")
+    parser.add_argument("--workers", type=int, default=0, help="default: cores / cpu-threads")
+    parser.add_argument("--batch-size", type=int, default=1, help=">1 uses batched inference within each file")
+    parser.add_argument("--chunk-minutes", type=float, default=10.0, help="WAVs are transcribed, and resume, in chunks this long")
+    parser.add_argument("--overwrite", action="store_true", help="redo files that already have a transcript")
+    args = parser.parse_args()
+
+    Path(args.out).mkdir(exist_ok=True)
+    files = pending_files(args.input, args.out, args.pattern, args.overwrite)
+    total = len(list(Path(args.input).glob(args.pattern)))
+    if not files:
+        print(f"Nothing to do: {total} file(s) in {args.input}, all transcribed.")
+        return
+    print(f"{len(files)} of {total} file(s) to transcribe ({total - len(files)} already done).")
+
+    workers = args.workers or max(1, (os.cpu_count() or 1) // max(1, args.cpu_threads))
+    workers = min(workers, len(files))
+    print(f"Using {workers} worker(s) x {args.cpu_threads} thread(s), model '{args.model}' ({args.compute_type})")
+
+    started = time.perf_counter()
+    audio_seconds = 0.0
+    done = 0
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(args.model, args.compute_type, args.cpu_threads, args.batch_size)
+    ) as pool:
+        futures = {pool.submit(_transcribe_file, str(f), args.out, args.batch_size, args.chunk_minutes * 60): f for f in files}
+        for future in as_completed(futures):
+            try:
+                path, duration, elapsed = future.result()
+            except Exception as e:
+                logger.error(f"Failed to transcribe {futures[future]}: {e}")
+                continue
+            done += 1
+            audio_seconds += duration
+            wall = time.perf_counter() - started
+            print(f"[{done}/{len(files)}] {Path(path).name}: {duration:.0f}s audio in {elapsed:.1f}s "
+                  f"(RTF {elapsed / max(duration, 1e-9):.2f}) | overall {audio_seconds / wall:.1f} audio-h/wall-h")
+
+    wall = time.perf_counter() - started
+    print(f"\nTranscribed {done} file(s), {audio_seconds / 3600:.2f} h of audio in {wall / 60:.1f} min "
+          f"-> {audio_seconds / max(wall, 1e-9):.1f} audio-hours per wall-hour")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Audio callback jitter with ASR running in-thread against ProcessASR.
+
+A thread stands in for the PortAudio callback: it wakes every 512 frames at
+48 kHz and resamples into the ring, exactly like AudioStream._callback. A
+transcription thread meanwhile calls the ASR on a 5 s window once a second.
+The default ASR is a pure-Python stand-in that holds the GIL for ~300 ms per
+call (like faster-whisper's segment generator and word assembly); pass
+--whisper to use the real model.
+
+Which way it goes depends on the model and the machine. The stand-in
+shows the case ProcessASR is for: Python-side work holding the GIL in the
+capture process. Real Whisper spends most of a call in CTranslate2 with
+the GIL released, so in-thread jitter is often already low, and on
+machines with few cores the worker process competes with the callback for
+CPU; ProcessASR's p99 can then come out higher than in-thread. Measure
+here before enabling ASR_PROCESS for latency. Its other benefits (a
+crashed or hung model is restarted without taking capture down, and the
+model's memory lives outside the capture process) hold regardless.
+
+    python src/benchmarks/bench_asr_process.py [--seconds 15] [--whisper]
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from audio.jitter import CallbackJitter
+from audio.resampler import StreamingResampler
+from audio.ring_buffer import RingBuffer
+from asr.asr_process import ProcessASR
+
+NATIVE_RATE = 48000
+CHUNK = 512
+
+
+class BusyASR:
+    """Holds the GIL for `busy_seconds` per call."""
+
+    def __init__(self, busy_seconds=0.3):
+        self.busy_seconds = busy_seconds
+
+    def transcribe_words(self, audio, prompt=None):
+        end = time.perf_counter() + self.busy_seconds
+        x = 0
+        while time.perf_counter() < end:
+            x += 1
+        return [(0.0, 0.5, " word")]
+
+
+def whisper_factory():
+    from asr.whisper_asr import WhisperASR
+    return WhisperASR()
+
+
+def run(asr, seconds):
+    ring = RingBuffer(16000 * 60)
+    resampler = StreamingResampler(NATIVE_RATE, 16000, 2, max_frames=CHUNK)
+    period = CHUNK / NATIVE_RATE
+    jitter = CallbackJitter(period)
+    pcm = (np.random.default_rng(0).standard_normal(CHUNK * 2) * 3000).astype(np.int16).tobytes()
+    stop = threading.Event()
+
+    def callback_loop():
+        deadline = time.perf_counter()
+        while not stop.is_set():
+            deadline += period
+            delay = deadline - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            jitter.tick()
+            out = ring.reserve(resampler.output_length(CHUNK))
+            ring.commit(len(resampler.process(pcm, out=out)))
+
+    def asr_loop():
+        while not stop.is_set():
+            time.sleep(1.0)
+            asr.transcribe_words(ring.latest(16000 * 5))
+
+    threads = [threading.Thread(target=callback_loop), threading.Thread(target=asr_loop)]
+    for t in threads:
+        t.start()
+    time.sleep(seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+    return jitter.stats()
+
+
+def report(name, stats):
+    print(f"{name:<14} callbacks {stats['callbacks']:>5}  mean {stats['jitter_mean_ms']:6.2f} ms  "
+          f"p99 {stats['jitter_p99_ms']:6.2f} ms  max {stats['jitter_max_ms']:7.2f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seconds", type=float, default=15.0)
+    parser.add_argument("--whisper", action="store_true", help="use the real Whisper model")
+    args = parser.parse_args()
+
+    factory = whisper_factory if args.whisper else BusyASR
+    print(f"Callback period {CHUNK / NATIVE_RATE * 1000:.2f} ms, {args.seconds:.0f}s per run")
+    report("no ASR", run(type("NoASR", (), {"transcribe_words": lambda self, audio: []})(), args.seconds))
+    report("in-thread ASR", run(factory(), args.seconds))
+    with ProcessASR(factory=factory) as asr:
+        report("ProcessASR", run(asr, args.seconds))
@@ -0,0 +1,100 @@
+"""
+Cost of publishing from a worker thread into the server loop, and how long
+events take to reach the loop.
+
+LoopBus (one call_soon_threadsafe per burst) is compared with one
+run_coroutine_threadsafe per event, the pattern send_message_sync used
+before. The producer emits bursts of LLM token updates the way a streamed
+answer does, with a final response at the end of each burst.
+
+    python src/benchmarks/bench_event_bus.py [--bursts 200] [--burst-size 20] [--gap-ms 5]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import threading
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from live.bus import LoopBus, llm_partial_event, response_event
+
+
+def percentiles(values):
+    values = sorted(values)
+    return statistics.median(values), values[int(len(values) * 0.99) - 1]
+
+
+def produce(publish, bursts, burst_size, gap, costs):
+    for burst in range(bursts):
+        text = ""
+        for i in range(burst_size):
+            text += "token "
+            started = time.perf_counter_ns()
+            publish(llm_partial_event(burst, text))
+            costs.append(time.perf_counter_ns() - started)
+        started = time.perf_counter_ns()
+        publish(response_event(text, "00:00:00"))
+        costs.append(time.perf_counter_ns() - started)
+        time.sleep(gap)
+
+
+async def run(mode, args):
+    loop = asyncio.get_running_loop()
+    latencies = []
+    finals = []
+    done = asyncio.Event()
+    expected = args.bursts
+
+    def deliver(event, key=None):
+        now = time.perf_counter()
+        latencies.append(now - event["sent"])
+        if event["type"] == "response":
+            finals.append(now - event["sent"])
+            if len(finals) == expected:
+                done.set()
+
+    bus = LoopBus(deliver)
+    bus.attach(loop)
+
+    async def deliver_async(event):
+        deliver(event)
+
+    if mode == "bus":
+        def publish(event):
+            event["sent"] = time.perf_counter()
+            bus.publish(event)
+    else:
+        def publish(event):
+            event["sent"] = time.perf_counter()
+            asyncio.run_coroutine_threadsafe(deliver_async(event), loop)
+
+    costs = []
+    producer = threading.Thread(target=produce, args=(publish, args.bursts, args.burst_size, args.gap_ms / 1000, costs))
+    producer.start()
+    await asyncio.wait_for(done.wait(), timeout=120)
+    producer.join()
+
+    cost_p50, cost_p99 = percentiles(costs)
+    lat_p50, lat_p99 = percentiles(latencies)
+    final_p50, final_p99 = percentiles(finals)
+    wakeups = bus.wakeups if mode == "bus" else len(costs)
+    return (f"{mode:>10}: publish p50 {cost_p50 / 1000:6.1f} us  p99 {cost_p99 / 1000:6.1f} us | "
+            f"delivery p50 {lat_p50 * 1000:6.3f} ms  p99 {lat_p99 * 1000:6.3f} ms | "
+            f"final p99 {final_p99 * 1000:6.3f} ms | loop wakeups {wakeups} for {len(costs)} events")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--bursts", type=int, default=200)
+    parser.add_argument("--burst-size", type=int, default=20)
+    parser.add_argument("--gap-ms", type=float, default=5.0)
+    args = parser.parse_args()
+    for mode in ("threadsafe", "bus"):
+        print(asyncio.run(run(mode, args)))
+
+
+if __name__ == "__main__":
+    main()
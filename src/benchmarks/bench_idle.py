@@ -0,0 +1,177 @@
+"""
+Idle cost of the runtime during a silent meeting: CPU and wakeups per
+second, before and after the event-driven orchestrator.
+
+"polling" reproduces the previous main loop: it checks the ESC key every
+10 ms, and the transcription worker polls get_chunk() with a 10 ms sleep.
+It also has the 1 s idle timeouts SummaryMemory and SupabasePublisher
+used to wake on. "orchestrator" runs the Orchestrator with the real
+SummaryMemory and SupabasePublisher.
+
+Both get the same simulated capture: silence fed through AudioStream.feed
+at the device's callback rate. That thread is reported separately; its
+cost is the driver's and is the same either way. The "no callbacks" runs
+leave it out, as when a loopback device has nothing playing and delivers
+no buffers.
+Wakeups are context switches summed over the process's threads
+(/proc/self/task/*/status, so Linux only).
+
+    python src/benchmarks/bench_idle.py [--seconds 10]
+"""
+import argparse
+import asyncio
+import glob
+import logging
+import os
+import sys
+import threading
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+logging.disable(logging.INFO)
+
+from audio.audio_stream import AudioStream
+from asr.transcriber import Transcriber
+from memory.summary_memory import SummaryMemory
+from orchestrator import Orchestrator
+from utils.supabase_publisher import SupabasePublisher
+
+NATIVE_RATE = 48000
+CHUNK = 512
+TICKS = os.sysconf("SC_CLK_TCK")
+
+
+class NullASR:
+    """Never reached on silence (the VAD gates it); here so nothing loads a model."""
+
+    def transcribe(self, audio):
+        return []
+
+    def transcribe_words(self, audio, prompt=None):
+        return []
+
+
+def thread_counters():
+    """tid -> (context switches, CPU seconds) for every thread of this process."""
+    counters = {}
+    for task in glob.glob("/proc/self/task/*"):
+        try:
+            with open(f"{task}/status") as f:
+                status = dict(line.split(":", 1) for line in f if ":" in line)
+            with open(f"{task}/stat") as f:
+                fields = f.read().rsplit(")", 1)[1].split()
+        except OSError:
+            continue
+        switches = int(status["voluntary_ctxt_switches"]) + int(status["nonvoluntary_ctxt_switches"])
+        cpu = (int(fields[11]) + int(fields[12])) / TICKS
+        counters[int(os.path.basename(task))] = (switches, cpu)
+    return counters
+
+
+def capture(stream, stop, tids):
+    """Silence at the device's callback cadence, like PortAudio's thread."""
+    tids.append(threading.get_native_id())
+    silence = bytes(CHUNK * 2 * 2)
+    period = CHUNK / NATIVE_RATE
+    next_at = time.perf_counter()
+    while not stop.is_set():
+        stream.feed(silence, CHUNK)
+        next_at += period
+        time.sleep(max(0.0, next_at - time.perf_counter()))
+
+
+def run_polling(stream, stop):
+    transcriber = Transcriber(stream, NullASR())
+    idle_timers = [threading.Event(), threading.Event()]
+
+    def timer(event):
+        while not stop.is_set():
+            event.wait(timeout=1.0)
+
+    def control_loop():
+        while not stop.is_set():
+            if False:                      # keyboard.is_pressed("esc")
+                pass
+            time.sleep(0.01)
+
+    def transcription_worker():
+        while not stop.is_set():
+            if stream.ring.available():
+                transcriber.step()
+            else:
+                time.sleep(0.01)
+
+    threads = [threading.Thread(target=control_loop), threading.Thread(target=transcription_worker)]
+    threads += [threading.Thread(target=timer, args=(e,)) for e in idle_timers]
+    for t in threads:
+        t.start()
+    return lambda: [t.join() for t in threads]
+
+
+def run_orchestrator(stream, stop):
+    memory = SummaryMemory().start()
+    publisher = SupabasePublisher("http://127.0.0.1:9", "key").start()
+    orchestrator = Orchestrator(stream, Transcriber(stream, NullASR()), lambda text: None, lambda: None)
+    runtime = threading.Thread(target=asyncio.run, args=(orchestrator.run(),))
+    runtime.start()
+
+    def finish():
+        while orchestrator.loop is None:
+            time.sleep(0.001)
+        orchestrator.stop()
+        runtime.join()
+        memory.stop()
+        publisher.stop()
+    return finish
+
+
+def measure(runner, seconds, callbacks):
+    stream = AudioStream(native_rate=NATIVE_RATE, channels=2, chunk_size=CHUNK)
+    stop = threading.Event()
+    capture_tids = []
+    finish = runner(stream, stop)
+    capture_thread = None
+    if callbacks:
+        capture_thread = threading.Thread(target=capture, args=(stream, stop, capture_tids))
+        capture_thread.start()
+    time.sleep(0.5)                        # let everything reach its idle state
+
+    me = threading.get_native_id()
+    before = thread_counters()
+    time.sleep(seconds)
+    after = thread_counters()
+
+    stop.set()
+    finish()
+    if capture_thread:
+        capture_thread.join()
+
+    def delta(tids):
+        switches = sum(after[t][0] - before.get(t, (0, 0))[0] for t in tids)
+        cpu = sum(after[t][1] - before.get(t, (0, 0))[1] for t in tids)
+        return switches / seconds, cpu / seconds * 100
+
+    pipeline = [t for t in after if t != me and t not in capture_tids]
+    return delta(pipeline), delta([t for t in after if t in capture_tids])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seconds", type=float, default=10.0)
+    args = parser.parse_args()
+    if not os.path.isdir("/proc/self/task"):
+        sys.exit("needs /proc (Linux)")
+
+    print(f"{args.seconds:.0f}s of silence per run; wakeups/s and CPU % of one core")
+    for callbacks in (True, False):
+        for name, runner in (("polling", run_polling), ("orchestrator", run_orchestrator)):
+            (wakeups, cpu), (capture_wakeups, capture_cpu) = measure(runner, args.seconds, callbacks)
+            line = f"{name:<12} {'with' if callbacks else 'no':>4} callbacks: {wakeups:7.1f} wakeups/s, CPU {cpu:5.2f}%"
+            if callbacks:
+                line += f"  (capture thread: {capture_wakeups:.0f} wakeups/s, CPU {capture_cpu:.2f}%)"
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+/latest-response cost against the number of saved responses: the old
+glob + stat-every-file + parse approach versus OutputIndex serving from
+memory, plus how long a new file takes to show up in the index.
+
+    python src/benchmarks/bench_latest_response.py [--files 100 1000 10000]
+"""
+import argparse
+import glob
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.output_index import OutputIndex, Observer
+
+
+def old_latest(directory):
+    files = glob.glob(os.path.join(directory, "*.json"))
+    latest = max(files, key=os.path.getmtime)
+    with open(latest, "r", encoding="utf-8") as f:
+        return {"filename": os.path.basename(latest), "data": json.load(f)}
+
+
+def write(directory, i):
+    output = {"timestamp": "2025-01-01 00:00:00", "context": "word " * 200, "response": f"answer {i} " * 40}
+    path = os.path.join(directory, f"response_{i:06d}.json")
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(output, f, indent=2)
+    os.replace(path + ".tmp", path)
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"watcher: {'watchdog' if Observer else 'directory mtime polling'}")
+    print(f"{'files':>7} {'glob+parse us':>14} {'index us':>9} {'startup ms':>11} {'new file visible ms':>20}")
+    for count in args.files:
+        with tempfile.TemporaryDirectory() as directory:
+            for i in range(count):
+                write(directory, i)
+            started = time.perf_counter()
+            index = OutputIndex(directory, poll_interval=0.05).start()
+            startup = (time.perf_counter() - started) * 1000
+
+            old = timed(lambda: old_latest(directory), max(3, args.repeat // (1 + count // 1000)))
+            new = timed(index.current, args.repeat)
+
+            seen = []
+            index.on_change = lambda: seen.append(time.perf_counter())
+            started = time.perf_counter()
+            write(directory, count)
+            while not seen and time.perf_counter() - started < 5:
+                time.sleep(0.001)
+            visible = (seen[0] - started) * 1000 if seen else float("nan")
+            index.stop()
+            print(f"{count:>7} {old:>14.0f} {new:>9.2f} {startup:>11.1f} {visible:>20.1f}")
+
+
+if __name__ == "__main__":
+    main()
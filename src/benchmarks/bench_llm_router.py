@@ -0,0 +1,251 @@
+"""
+Local/remote LLM routing against a stub Ollama server.
+
+The stub speaks enough of Ollama's HTTP API (/api/tags, /api/generate,
+/api/chat with NDJSON streaming) for OllamaBackend. It takes --load-seconds
+to load the model, which stays loaded for the request's keep_alive, then
+answers with --ttft plus --token-seconds per token, and more for long
+prompts (--prefill-tps). The remote backend is a stub with a fixed latency
+in place of Gemini.
+
+Scenarios:
+  cold vs warm      time to first token without and after warm()
+  normal prompts    which backend answers, and latency
+  large prompts     over the local model's max_prompt_tokens
+  slow local        the local model slows past the budget
+  local down        the server stops mid-run, then comes back
+
+    python src/benchmarks/bench_llm_router.py [--requests 20] [--budget 2.0]
+"""
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+logging.disable(logging.WARNING)
+
+from llm.gemini_client import configure_cache
+from llm.ollama_client import OllamaBackend
+from llm.router import LLMRouter
+
+MODEL = "stub:1b"
+
+
+class StubOllama(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, args):
+        super().__init__(("127.0.0.1", 0), StubHandler)
+        self.args = args
+        self.loaded_until = 0.0
+        self.slowdown = 1.0
+        self.up = True
+        self.loads = 0
+        self.lock = threading.Lock()
+
+    def handle_error(self, request, client_address):
+        pass                                # clients closing pooled connections at the end of a run
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def ensure_loaded(self, keep_alive):
+        with self.lock:
+            if time.monotonic() >= self.loaded_until:
+                time.sleep(self.args.load_seconds)
+                self.loads += 1
+            seconds = float(str(keep_alive).rstrip("m")) * 60 if str(keep_alive).endswith("m") else float(keep_alive)
+            self.loaded_until = time.monotonic() + seconds
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _json(self, body):
+        data = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _refuse(self):
+        self.send_response(503)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_GET(self):
+        if not self.server.up:
+            return self._refuse()
+        self._json({"models": [{"name": MODEL}]})
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        if not self.server.up:
+            return self._refuse()
+        server, args = self.server, self.server.args
+        server.ensure_loaded(body.get("keep_alive", "5m"))
+        if self.path == "/api/generate":
+            return self._json({"model": MODEL, "done": True})
+
+        prompt = body["messages"][-1]["content"]
+        tokens = ["This", " is", " a", " stub", " answer", "."] * 4
+        time.sleep((args.ttft + len(prompt) / 4 / args.prefill_tps) * server.slowdown)
+        if not body.get("stream", True):
+            time.sleep(args.token_seconds * len(tokens) * server.slowdown)
+            return self._json({"message": {"role": "assistant", "content": "".join(tokens)}, "done": True})
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for token in tokens:
+            self._chunk({"message": {"role": "assistant", "content": token}, "done": False})
+            time.sleep(args.token_seconds * server.slowdown)
+        self._chunk({"message": {"role": "assistant", "content": ""}, "done": True})
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _chunk(self, body):
+        data = json.dumps(body).encode() + b"\n"
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+
+class StubRemote:
+    """Stands in for GeminiBackend: always available, fixed latency."""
+
+    name = "gemini"
+    model = "remote-stub"
+    max_prompt_tokens = 100_000
+
+    def __init__(self, seconds):
+        self.expected_seconds = seconds
+        self.seconds = seconds
+
+    def available(self):
+        return True
+
+    def warm(self):
+        pass
+
+    def cached(self, context_text):
+        return None
+
+    def complete(self, context_text):
+        time.sleep(self.seconds)
+        return "remote answer"
+
+    def stream(self, context_text):
+        time.sleep(self.seconds * 0.3)
+        yield "remote"
+        time.sleep(self.seconds * 0.7)
+        yield " answer"
+
+    def close(self):
+        pass
+
+
+def ask(router, context):
+    """(provider, time to first token, total) for one streamed request; provider 'error' if it failed."""
+    started = time.perf_counter()
+    try:
+        provider, chunks = router.stream(context)
+        first = None
+        for _ in chunks:
+            if first is None:
+                first = time.perf_counter() - started
+        return provider, first, time.perf_counter() - started
+    except Exception:
+        return "error", None, time.perf_counter() - started
+
+
+def report(label, results):
+    providers = {}
+    for provider, _, _ in results:
+        providers[provider] = providers.get(provider, 0) + 1
+    totals = sorted(total for provider, _, total in results if provider != "error")
+    line = f"{label:<16} {providers}"
+    if totals:
+        line += (f"  total p50 {statistics.median(totals):.2f}s"
+                 f" p95 {totals[max(0, int(len(totals) * 0.95) - 1)]:.2f}s")
+    print(line)
+
+
+def run(args, label, context, local_setup=None, midway=None):
+    server = StubOllama(args)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    local = OllamaBackend(model=MODEL, host=server.url, max_prompt_tokens=args.max_prompt_tokens,
+                          expected_seconds=args.local_expected, health_interval=0.5)
+    router = LLMRouter([local, StubRemote(args.remote_seconds)], budget_seconds=args.budget, cooldown=1.0)
+    router.warm()
+    time.sleep(args.load_seconds + 0.05)
+    if local_setup:
+        local_setup(server)
+    results = []
+    for i in range(args.requests):
+        if midway:
+            midway(server, i)
+        results.append(ask(router, f"{context} (request {i})"))
+    report(label, results)
+    router.close()
+    server.shutdown()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--budget", type=float, default=2.0, help="router latency budget, seconds")
+    parser.add_argument("--load-seconds", type=float, default=1.5, help="stub model load time")
+    parser.add_argument("--ttft", type=float, default=0.05)
+    parser.add_argument("--token-seconds", type=float, default=0.01)
+    parser.add_argument("--prefill-tps", type=float, default=20000.0, help="prompt tokens per second")
+    parser.add_argument("--remote-seconds", type=float, default=0.8)
+    parser.add_argument("--local-expected", type=float, default=1.0)
+    parser.add_argument("--max-prompt-tokens", type=int, default=3000)
+    args = parser.parse_args()
+    configure_cache(enabled=False)
+
+    normal = "Interviewer: Can you walk me through how you would design a rate limiter? " * 20
+    large = "Interviewer: and then we discussed the migration plan in detail. " * 400
+
+    # Cold vs warm: the first request after the keep-alive expired pays the load
+    for warm in (False, True):
+        server = StubOllama(args)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        local = OllamaBackend(model=MODEL, host=server.url)
+        if warm:
+            local.warm().join()
+        started = time.perf_counter()
+        next(local.stream(normal))
+        print(f"{'warm' if warm else 'cold'} first token: {time.perf_counter() - started:.2f}s "
+              f"(model loads: {server.loads})")
+        local.close()
+        server.shutdown()
+
+    run(args, "normal prompts", normal)
+    run(args, "large prompts", large)
+    run(args, "slow local", normal, local_setup=lambda server: setattr(server, "slowdown", 10.0))
+
+    def outage(server, i):
+        if i == args.requests // 4:
+            server.up = False
+        if i == args.requests // 2:
+            server.up = True
+            time.sleep(1.0)                 # past the router's cooldown and the health check interval
+    run(args, "local down/up", normal, midway=outage)
+
+
+if __name__ == "__main__":
+    main()
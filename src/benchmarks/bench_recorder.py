@@ -0,0 +1,117 @@
+"""
+Memory and throughput of recording a long meeting: the old in-memory
+frames list against SegmentRecorder.
+
+Stereo PCM16 at 48 kHz is fed in 512-frame blocks, as loop_reccord reads
+them, at --speed times real time. "frames list" appends every block and
+joins them into one WAV at the end; "recorder" writes segments as they
+fill (FLAC too with --flac, if soundfile is installed). Peak memory is
+what tracemalloc sees allocated while recording and saving. For the
+recorder it also reports how long after a segment's last frame was fed it
+was handed over for transcription.
+
+    python src/benchmarks/bench_recorder.py [--minutes 10] [--speed 100] [--segment-seconds 60] [--flac]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import wave
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from audio.recorder import SegmentRecorder
+
+RATE = 48000
+CHANNELS = 2
+CHUNK = 512
+
+
+def blocks(minutes, rng):
+    # A few distinct noise blocks, cycled: realistic entropy for FLAC without generating hours of audio
+    # (each block a new bytes object, as stream.read returns)
+    pool = [(rng.standard_normal((CHUNK, CHANNELS)) * 3000).astype(np.int16) for _ in range(64)]
+    for i in range(int(minutes * 60 * RATE / CHUNK)):
+        yield i, pool[i % len(pool)].tobytes()
+
+
+def paced(minutes, speed, rng):
+    period = CHUNK / RATE / speed
+    started = time.perf_counter()
+    for i, data in blocks(minutes, rng):
+        yield data
+        delay = started + (i + 1) * period - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+
+
+def frames_list(args, out_dir):
+    frames = []
+    for data in paced(args.minutes, args.speed, np.random.default_rng(0)):
+        frames.append(data)
+    wf = wave.open(os.path.join(out_dir, "meeting.wav"), "wb")
+    wf.setnchannels(CHANNELS)
+    wf.setsampwidth(2)
+    wf.setframerate(RATE)
+    wf.writeframes(b"".join(frames))
+    wf.close()
+    return {}
+
+
+def recorder(args, out_dir):
+    segment_blocks = int(args.segment_seconds * RATE / CHUNK)
+    total_blocks = int(args.minutes * 60 * RATE / CHUNK)
+    fed_at = {}                  # wall time each segment's last block was fed
+    handed = []
+
+    def on_segment(path, start, duration):
+        last_block = round((start + duration) * RATE / CHUNK) - 1
+        handed.append(time.perf_counter() - fed_at[last_block])
+
+    rec = SegmentRecorder(out_dir, "meeting", RATE, channels=CHANNELS, segment_seconds=args.segment_seconds,
+                          compress="flac" if args.flac else None, on_segment=on_segment).start()
+    for i, data in enumerate(paced(args.minutes, args.speed, np.random.default_rng(0))):
+        if (i + 1) % segment_blocks == 0 or i + 1 == total_blocks:
+            fed_at[i] = time.perf_counter()
+        rec.write(data)
+    rec.stop()
+    stats = rec.stats()
+    stats["handover_ms_max"] = round(max(handed) * 1000, 1) if handed else None
+    return stats
+
+
+def run(name, fn, args):
+    with tempfile.TemporaryDirectory() as out_dir:
+        tracemalloc.start()
+        started = time.perf_counter()
+        extra = fn(args, out_dir)
+        elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        size = sum(os.path.getsize(os.path.join(out_dir, f)) for f in os.listdir(out_dir))
+    audio_mb = args.minutes * 60 * RATE * CHANNELS * 2 / 1e6
+    print(f"{name:<12} peak {peak / 1e6:8.1f} MB for {audio_mb:.0f} MB of audio, "
+          f"{elapsed:.1f}s wall, {size / 1e6:.0f} MB on disk")
+    if extra:
+        print(f"{'':<12} {extra}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--minutes", type=float, default=10.0)
+    parser.add_argument("--speed", type=float, default=100.0, help="times real time")
+    parser.add_argument("--segment-seconds", type=float, default=60.0)
+    parser.add_argument("--flac", action="store_true")
+    args = parser.parse_args()
+
+    print(f"{args.minutes:.0f} min of {RATE} Hz stereo at {args.speed:.0f}x real time")
+    run("frames list", frames_list, args)
+    run("recorder", recorder, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,351 @@
+"""
+End-to-end replay: recorded WAVs through the live pipeline, no audio device
+or keyboard needed.
+
+Each file is pushed through AudioStream.feed (the capture callback's
+resample-into-ring path) into the app's Orchestrator, with its Transcriber
+(VAD, streaming ASR) and main.Assistant: the ContextBuffer, speculation
+and, at scripted audio times, the same trigger path as an ESC press, with
+a stub in place of Gemini.
+
+    python src/benchmarks/bench_replay.py [recordings/*.wav] [--speed 1] [--trigger-every 30]
+        [--triggers 12,40] [--model base] [--compute-type int8] [--asr-process] [--json out.json]
+
+--speed 1 replays in real time, 4 four times faster (the transcriber may
+fall behind, as it would on a slower machine), and 0 as fast as the
+transcriber takes the audio, never more than one streaming step ahead.
+ContextBuffer windows are wall-clock, so they cover more audio when
+accelerated.
+
+Reports per-stage latency percentiles (ASR call, capture to ContextBuffer,
+trigger dispatch, trigger to handled response), real-time factor, CPU and
+RSS, and the word error rate against `transcriptions/<name>.txt` when it
+exists.
+"""
+import argparse
+import asyncio
+import bisect
+import glob
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main as pipeline
+from audio.audio_stream import AudioStream
+from audio.wav_reader import WavFile
+from memory.context_manager import ContextBuffer, estimate_tokens
+from memory.summary_memory import SummaryMemory
+from memory.vector_index import VectorIndex
+from asr.transcriber import Transcriber
+from orchestrator import Orchestrator
+from utils.wer import wer, normalize
+
+
+def percentile(values, q):
+    if not values:
+        return float("nan")
+    values = sorted(values)
+    return values[min(len(values) - 1, max(0, int(round(q * len(values))) - 1))]
+
+
+def spread(values, scale=1000.0):
+    """p50/p95/p99/max in ms (by default) and the count."""
+    return {"n": len(values), **{f"p{int(q * 100)}": percentile(values, q) * scale for q in (0.5, 0.95, 0.99)},
+            "max": max(values) * scale if values else float("nan")}
+
+
+def rss_mb():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError, AttributeError):
+        return float("nan")
+
+
+def peak_rss_mb(who=None):
+    if resource is None:
+        return float("nan")
+    peak = resource.getrusage(resource.RUSAGE_SELF if who is None else who).ru_maxrss
+    return peak / 2**20 if sys.platform == "darwin" else peak / 1024
+
+
+class TimedASR:
+    """Times every call exactly; the metrics histograms only keep buckets."""
+
+    def __init__(self, asr, sample_rate=16000):
+        self.asr = asr
+        self.sample_rate = sample_rate
+        self.calls = []              # (seconds, audio seconds)
+
+    def _timed(self, fn, audio, *args):
+        started = time.perf_counter()
+        try:
+            return fn(audio, *args)
+        finally:
+            self.calls.append((time.perf_counter() - started, len(audio) / self.sample_rate))
+
+    def transcribe(self, audio):
+        return self._timed(self.asr.transcribe, audio)
+
+    def transcribe_words(self, audio, prompt=None):
+        return self._timed(self.asr.transcribe_words, audio, prompt)
+
+
+class RecordingBuffer(ContextBuffer):
+    """ContextBuffer that keeps the full transcript and when each segment arrived relative to its audio."""
+
+    def __init__(self, *args, latency_of=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.latency_of = latency_of
+        self.texts = []
+        self.commit_latencies = []
+
+    def add_segment(self, text, timestamp=None):
+        self.texts.append(text)
+        if self.latency_of:
+            self.commit_latencies.append(self.latency_of())
+        return super().add_segment(text, timestamp)
+
+
+class ReplayAssistant(pipeline.Assistant):
+    """The app's Assistant with a stub in place of Gemini: fixed time to first token and to the whole answer."""
+
+    def __init__(self, *args, ttft=0.4, total=1.5, **kwargs):
+        self.ttft = ttft
+        self.total = total
+        self.dispatch = []           # trigger() duration: prompt assembly, speculation match, submit
+        self.handled = []            # submit to handled response
+        self.requests = []
+        super().__init__(*args, **kwargs)
+
+    def _answer(self, snapshot):
+        return f"(stub answer to {estimate_tokens(snapshot)} prompt tokens)"
+
+    def ask(self, snapshot):
+        time.sleep(self.total)
+        return "stub", self._answer(snapshot)
+
+    def ask_stream(self, snapshot):
+        return "stub", self._stream(snapshot)
+
+    def _stream(self, snapshot):
+        time.sleep(self.ttft)
+        yield "(stub answer"
+        time.sleep(max(0.0, self.total - self.ttft))
+        yield self._answer(snapshot)[len("(stub answer"):]
+
+    def trigger(self):
+        started = time.perf_counter()
+        request = super().trigger()
+        self.dispatch.append(time.perf_counter() - started)
+        if request:
+            self.requests.append(request)
+        return request
+
+    def handle_response(self, request):
+        self.handled.append(time.perf_counter() - request.submitted)
+        super().handle_response(request)
+
+
+def trigger_times(args, duration):
+    times = [float(t) for t in args.triggers.split(",") if t.strip()] if args.triggers else []
+    if args.trigger_every:
+        t = args.trigger_every
+        while t < duration:
+            times.append(t)
+            t += args.trigger_every
+    return sorted(times)
+
+
+def replay_file(path, asr, args):
+    wav = WavFile(path)
+    stream = AudioStream(target_rate=16000, channels=wav.channels, chunk_size=args.chunk,
+                         native_rate=wav.sample_rate)
+    ring = stream.ring
+
+    # When each ring position was written, to date the audio behind each transcript segment
+    fed_index = []
+    fed_at = []
+
+    def commit_latency():
+        # Freshest audio the worker had read when the text came out, to now
+        i = bisect.bisect_left(fed_index, ring.read_index)
+        return time.perf_counter() - fed_at[min(i, len(fed_at) - 1)]
+
+    memory = SummaryMemory().start() if pipeline.SUMMARY_MEMORY else None
+    index = VectorIndex().start() if pipeline.VECTOR_INDEX else None
+    buffer = RecordingBuffer(pipeline.WINDOW_SECONDS, max_tokens=pipeline.CONTEXT_MAX_TOKENS,
+                             on_evict=memory.add if memory else None, latency_of=commit_latency)
+
+    assistant = ReplayAssistant(buffer, memory=memory, index=index, ttft=args.llm_ttft, total=args.llm_seconds)
+    transcriber = Transcriber(stream, asr, streaming=pipeline.STREAMING_ASR, vad=pipeline.VAD_GATE,
+                              step_seconds=pipeline.STREAM_STEP_SECONDS,
+                              max_window_seconds=pipeline.STREAM_MAX_WINDOW_SECONDS)
+    # Scripted triggers are never debounced
+    orchestrator = Orchestrator(stream, transcriber, assistant.on_transcript, assistant.trigger, debounce=0.0)
+    runtime = threading.Thread(target=asyncio.run, args=(orchestrator.run(),), name="runtime", daemon=True)
+    triggers = trigger_times(args, wav.duration)
+    step = int(pipeline.STREAM_STEP_SECONDS * stream.target_rate)
+    asr.calls = []
+
+    cpu_started = time.process_time()
+    started = time.perf_counter()
+    runtime.start()
+    while orchestrator.loop is None:
+        time.sleep(0.001)
+    position = 0
+    for block in wav.blocks(args.chunk):
+        if args.speed > 0:
+            delay = started + position / wav.sample_rate / args.speed - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        else:
+            while ring.available() >= step and runtime.is_alive():
+                time.sleep(0.002)
+        stream.feed(block.tobytes(), len(block))
+        fed_index.append(ring.write_index)
+        fed_at.append(time.perf_counter())
+        position += len(block)
+        while triggers and triggers[0] <= position / wav.sample_rate:
+            triggers.pop(0)
+            orchestrator.trigger()
+
+    # Stopping transcribes what is left, as at the end of a meeting
+    orchestrator.stop()
+    runtime.join()
+    for _ in triggers:
+        assistant.trigger()
+    for request in assistant.requests:
+        request.done.wait(pipeline.LLM_DEADLINE_SECONDS)
+    wall = time.perf_counter() - started
+    cpu = time.process_time() - cpu_started
+
+    speculation = assistant.speculator.stats() if assistant.speculator else None
+    assistant.stop()
+    if memory:
+        memory.stop()
+    if index:
+        index.stop()
+
+    asr_seconds = sum(c[0] for c in asr.calls)
+    result = {
+        "file": str(path),
+        "audio_seconds": wav.duration,
+        "wall_seconds": wall,
+        "asr_ms": spread([c[0] for c in asr.calls]),
+        "asr_rtf": spread([c[0] / c[1] for c in asr.calls if c[1]], scale=1.0),
+        "pipeline_rtf": asr_seconds / wav.duration if wav.duration else float("nan"),
+        "commit_latency_ms": spread(buffer.commit_latencies),
+        "trigger_dispatch_ms": spread(assistant.dispatch),
+        "trigger_ms": spread(assistant.handled),
+        "triggers": f"{len(assistant.handled)}/{len(assistant.dispatch)}",
+        "cpu_percent": cpu / wall * 100 if wall else float("nan"),
+        "cpu_per_audio_second": cpu / wav.duration if wav.duration else float("nan"),
+        "rss_mb": rss_mb(),
+        "ring_overflows": ring.overflows,
+        "words": len(normalize(" ".join(buffer.texts))),
+    }
+    if speculation:
+        result["speculation"] = speculation
+    reference = Path(args.refs) / (Path(path).stem + ".txt")
+    if reference.exists():
+        result["wer"] = wer(reference.read_text(encoding="utf-8"), " ".join(buffer.texts))
+        result["reference_words"] = len(normalize(reference.read_text(encoding="utf-8")))
+    return result
+
+
+def describe(result):
+    def line(name, s):
+        return f"  {name:<22} n={s['n']:<5} p50 {s['p50']:9.2f}  p95 {s['p95']:9.2f}  p99 {s['p99']:9.2f}  max {s['max']:9.2f}"
+
+    print(f"\n{result['file']}: {result['audio_seconds']:.1f}s of audio in {result['wall_seconds']:.1f}s")
+    print(line("ASR call (ms)", result["asr_ms"]))
+    print(line("ASR call RTF", result["asr_rtf"]))
+    print(line("capture->context (ms)", result["commit_latency_ms"]))
+    print(line("trigger dispatch (ms)", result["trigger_dispatch_ms"]))
+    print(line("trigger (ms)", result["trigger_ms"]))
+    print(f"  pipeline RTF {result['pipeline_rtf']:.3f}, CPU {result['cpu_percent']:.0f}% "
+          f"({result['cpu_per_audio_second']:.3f} CPU s per audio s), RSS {result['rss_mb']:.0f} MB, "
+          f"ring overflows {result['ring_overflows']}, triggers handled {result['triggers']}")
+    if "speculation" in result:
+        s = result["speculation"]
+        print(f"  speculation: {s['started']} generated, {s['hits']}/{s['triggers']} triggers hit, "
+              f"{s['avg_saved_seconds'] * 1000:.0f} ms saved per hit")
+    if "wer" in result:
+        print(f"  WER {result['wer'] * 100:.1f}% ({result['words']} words vs {result['reference_words']} in the reference)")
+    else:
+        print(f"  {result['words']} words (no reference transcript)")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("files", nargs="*", help="WAV files (default recordings/*.wav)")
+    parser.add_argument("--refs", default="transcriptions", help="directory of <name>.txt reference transcripts")
+    parser.add_argument("--speed", type=float, default=1.0, help="1 = real time, 0 = as fast as the ASR keeps up")
+    parser.add_argument("--triggers", default="", help="comma-separated audio times (s) to press ESC at")
+    parser.add_argument("--trigger-every", type=float, default=30.0, help="also trigger every N seconds of audio; 0 disables")
+    parser.add_argument("--chunk", type=int, default=512, help="frames per simulated capture callback")
+    parser.add_argument("--llm-ttft", type=float, default=0.4, help="stub LLM seconds to first token")
+    parser.add_argument("--llm-seconds", type=float, default=1.5, help="stub LLM seconds to the whole answer")
+    parser.add_argument("--model", default="base")
+    parser.add_argument("--compute-type", default="int8")
+    parser.add_argument("--threads", type=int, default=0)
+    parser.add_argument("--asr-process", action="store_true", help="host Whisper in a worker process (ProcessASR)")
+    parser.add_argument("--batch-asr", action="store_true", help="1-second batches instead of streaming ASR")
+    parser.add_argument("--no-speculation", action="store_true", help="only call the LLM on trigger")
+    parser.add_argument("--json", help="also write the results here")
+    args = parser.parse_args()
+
+    files = args.files or sorted(glob.glob("recordings/*.wav"))
+    if not files:
+        parser.error("no WAV files given and none in recordings/")
+    if args.batch_asr:
+        pipeline.STREAMING_ASR = False
+    if args.no_speculation:
+        pipeline.SPECULATE = False
+    pipeline.OUTPUT_FILES = False
+
+    started = time.perf_counter()
+    if args.asr_process:
+        from asr.asr_process import ProcessASR
+        backend = ProcessASR(model_size=args.model, compute_type=args.compute_type, cpu_threads=args.threads).start()
+    else:
+        from asr.whisper_asr import WhisperASR
+        backend = WhisperASR(args.model, compute_type=args.compute_type, cpu_threads=args.threads)
+    print(f"Model {args.model}/{args.compute_type} loaded in {time.perf_counter() - started:.1f}s, RSS {rss_mb():.0f} MB")
+    asr = TimedASR(backend)
+
+    results = []
+    try:
+        for path in files:
+            results.append(replay_file(path, asr, args))
+            describe(results[-1])
+    finally:
+        if args.asr_process:
+            backend.stop()
+
+    audio = sum(r["audio_seconds"] for r in results)
+    scored = [r for r in results if "wer" in r]
+    print(f"\n{len(results)} file(s), {audio:.1f}s of audio; peak RSS {peak_rss_mb():.0f} MB"
+          + (f", ASR worker peak RSS {peak_rss_mb(resource.RUSAGE_CHILDREN):.0f} MB"
+             if args.asr_process and resource else ""))
+    if scored:
+        errors = sum(r["wer"] * r["reference_words"] for r in scored)
+        print(f"WER over {len(scored)} referenced file(s): {errors / max(1, sum(r['reference_words'] for r in scored)) * 100:.1f}%")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"args": vars(args), "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
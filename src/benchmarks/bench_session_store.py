@@ -0,0 +1,99 @@
+"""
+SessionStore write throughput and query latency at months-of-use sizes,
+against one pretty-printed JSON file per trigger.
+
+    python src/benchmarks/bench_session_store.py [--records 50000]
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from memory.session_store import SessionStore
+
+WORDS = ("budget hiring migration client timeline pricing contract renewal latency dashboard "
+         "onboarding security review roadmap deadline invoice vendor launch metrics churn").split()
+# A realistic spread: a few topic words among a large everyday vocabulary
+VOCABULARY = WORDS + [f"word{i}" for i in range(5000)]
+DAY = 86400
+
+
+def record(rng, i, start):
+    return {
+        "ts": start + i * 60,
+        "session": str(rng.randint(1000, 1100)),
+        "provider": rng.choice(("gemini", "ollama")),
+        "context": " ".join(rng.choice(VOCABULARY) for _ in range(150)),
+        "response": " ".join(rng.choice(VOCABULARY) for _ in range(40)),
+        "window_seconds": 60,
+        "timing": {"ttft": rng.random(), "ttlt": 2 * rng.random()},
+    }
+
+
+def write_files(directory, records):
+    started = time.perf_counter()
+    for i, r in enumerate(records):
+        with open(os.path.join(directory, f"response_{i:07d}.json"), "w", encoding="utf-8") as f:
+            json.dump(r, f, indent=2)
+    return time.perf_counter() - started
+
+
+def write_store(path, records, **kwargs):
+    store = SessionStore(path, **kwargs).start()
+    started = time.perf_counter()
+    for r in records:
+        store.add(r)
+    store.flush()
+    elapsed = time.perf_counter() - started
+    return store, elapsed
+
+
+def timed(fn, repeat=20):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--records", type=int, default=50000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    start = time.time() - args.records * 60
+    records = [record(rng, i, start) for i in range(args.records)]
+    small = records[:2000]
+
+    with tempfile.TemporaryDirectory() as directory:
+        files_dir = os.path.join(directory, "outputs")
+        os.makedirs(files_dir)
+        print(f"json files     : {len(small) / write_files(files_dir, small):8.0f} records/s")
+        for fsync, batch in (("full", 1), ("full", 64), ("normal", 64), ("off", 256)):
+            store, elapsed = write_store(os.path.join(directory, f"{fsync}{batch}.db"), small,
+                                         fsync=fsync, batch_size=batch)
+            print(f"store {fsync:>6} b{batch:<4}: {len(small) / elapsed:8.0f} records/s ({store.batches} transactions)")
+            store.stop()
+
+        store, elapsed = write_store(os.path.join(directory, "big.db"), records, fsync="normal", batch_size=256)
+        size = os.path.getsize(os.path.join(directory, "big.db")) / 2**20
+        print(f"\n{args.records} records loaded at {args.records / elapsed:.0f}/s, {size:.0f} MiB on disk")
+        mid = start + args.records * 30
+        print(f"last 24 h          : {timed(lambda: store.query(start=time.time() - DAY, limit=100)):7.2f} ms")
+        print(f"one day, mid-range : {timed(lambda: store.query(start=mid, end=mid + DAY, limit=100)):7.2f} ms")
+        print(f"session + range    : {timed(lambda: store.query(start=mid, end=mid + 7 * DAY, session='1042')):7.2f} ms")
+        print(f"full text          : {timed(lambda: store.query(text='invoice vendor', limit=20)):7.2f} ms")
+        print(f"full text + range  : {timed(lambda: store.query(text='churn', start=mid, end=mid + DAY, limit=20)):7.2f} ms")
+        store.stop()
+
+
+if __name__ == "__main__":
+    main()
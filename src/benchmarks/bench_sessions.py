@@ -0,0 +1,121 @@
+"""
+One server hosting many meetings: memory per session and the cost of
+routing an event to one session's subscribers.
+
+Builds 1,000 sessions (token + subscribers each) with SessionRegistry and
+ConnectionManager groups on fake sockets, then publishes events to random
+sessions. Routing through the group index is compared with scanning every
+client for the right session, which is what a single global fan-out turns
+into once meetings share the server.
+
+    python src/benchmarks/bench_sessions.py [--sessions 1000] [--subscribers 3] [--events 5000]
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+logging.getLogger("WebServer").setLevel(logging.WARNING)
+
+from live.connections import ConnectionManager
+from live.sessions import SessionRegistry
+from live.bus import response_event
+
+
+class FakeSocket:
+    def __init__(self):
+        self.received = 0
+        self.last = 0.0
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, payload):
+        self.received += 1
+        self.last = time.perf_counter()
+
+    async def close(self, code=1000):
+        pass
+
+
+def scan_publish(manager, message, group):
+    # Global fan-out filtered per client: O(all clients) per event
+    payload = json.dumps(message, ensure_ascii=False)
+    for client in list(manager.clients.values()):
+        if client.group == group:
+            client.offer(payload)
+
+
+async def build(args):
+    registry = SessionRegistry()
+    manager = ConnectionManager()
+    sockets = {}
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    for _ in range(args.sessions):
+        code = registry.create().code
+        token = registry.issue_token(code)
+        session = registry.resolve(token)
+        sockets[code] = [FakeSocket() for _ in range(args.subscribers)]
+        for socket in sockets[code]:
+            await manager.connect(socket, group=session.code)
+    await asyncio.sleep(0)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    used = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    return registry, manager, sockets, used
+
+
+async def route(manager, sockets, args, mode):
+    rng = random.Random(1)
+    codes = list(sockets)
+    costs = []
+    latencies = []
+    for _ in range(args.events):
+        code = rng.choice(codes)
+        started = time.perf_counter()
+        event = response_event("answer " * 20, "00:00:00", code)
+        if mode == "group":
+            manager.publish(event, group=code)
+        else:
+            scan_publish(manager, event, code)
+        costs.append(time.perf_counter() - started)
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        latencies.append(max(s.last for s in sockets[code]) - started)
+    costs.sort()
+    latencies.sort()
+    return (f"{mode:>6}: publish p50 {statistics.median(costs) * 1e6:7.1f} us  p99 {costs[int(len(costs) * 0.99)] * 1e6:7.1f} us | "
+            f"delivery p50 {statistics.median(latencies) * 1000:6.3f} ms  p99 {latencies[int(len(latencies) * 0.99)] * 1000:6.3f} ms")
+
+
+async def run(args):
+    registry, manager, sockets, used = await build(args)
+    print(f"{args.sessions} sessions x {args.subscribers} subscribers: {used / 2**20:.1f} MiB, "
+          f"{used / args.sessions / 1024:.1f} KiB per session "
+          f"({used / (args.sessions * args.subscribers) / 1024:.1f} KiB per subscriber incl. sender task)")
+    print(await route(manager, sockets, args, "scan"))
+    print(await route(manager, sockets, args, "group"))
+    for client in list(manager.clients.values()):
+        client.task.cancel()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, default=1000)
+    parser.add_argument("--subscribers", type=int, default=3, help="at least 1")
+    parser.add_argument("--events", type=int, default=5000)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
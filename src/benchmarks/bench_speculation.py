@@ -0,0 +1,174 @@
+"""
+Speculative pre-generation: question detector accuracy and cost, and the
+trigger latency it saves in a simulated interview.
+
+The simulation streams a scripted conversation into a ContextBuffer as
+ASR-sized fragments; after each question the user presses ESC after a
+random reaction time, sometimes after the interviewer has added a
+follow-up. Every ESC is answered once by calling the stub LLM directly
+and once through the Speculator, and the time from ESC to answer is
+compared. Times are scaled down by --scale so the run is quick.
+
+    python src/benchmarks/bench_speculation.py [--llm-seconds 2.0] [--scale 0.1] [--rounds 3]
+"""
+import argparse
+import random
+import statistics
+import sys
+import os
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from memory.context_manager import ContextBuffer
+from llm.speculation import QuestionDetector, Speculator
+
+QUESTIONS = [
+    "Can you tell me about a project you're proud of?",
+    "So how would you design a rate limiter for this API?",
+    "What do you think is the biggest risk in this migration?",
+    "Walk me through how you debugged that outage.",
+    "Have you worked with Kubernetes in production?",
+    "Why did you choose Postgres over MongoDB there?",
+    "Tell us about a time you disagreed with your manager.",
+    "And what would you do differently next time?",
+    "Could you explain the difference between a process and a thread?",
+    "How do you usually test asynchronous code",
+    "What's your experience with streaming systems?",
+    "Describe the architecture of your last service.",
+    "Do you have any questions for us?",
+    "Okay so which of those approaches would you pick",
+    "How long did the rollout take?",
+]
+STATEMENTS = [
+    "We moved the billing service to a new cluster last quarter.",
+    "The team is about twelve people split across two time zones.",
+    "Most of our traffic comes in during the European morning.",
+    "I think the main issue was the connection pool size.",
+    "Let me share my screen for a second.",
+    "That makes sense, thanks for explaining.",
+    "Our stack is mostly Python with some Go services.",
+    "The interview will take about forty five minutes.",
+    "We had a similar problem with caching last year.",
+    "Right, so the deadline for that was in March.",
+    "I'll send over the details after the call.",
+    "The dashboard shows the p99 latency per endpoint.",
+    "You mentioned earlier that you used Redis for this.",
+    "It was a good learning experience for everyone.",
+    "We do code review on every pull request.",
+]
+
+
+def fragments(sentence, rng):
+    """Split like streaming ASR commits: one to three pieces, punctuation only at the end."""
+    words = sentence.split()
+    cuts = sorted(rng.sample(range(1, len(words)), min(len(words) - 1, rng.randint(0, 2))))
+    pieces, last = [], 0
+    for cut in cuts + [len(words)]:
+        pieces.append(" ".join(words[last:cut]))
+        last = cut
+    return pieces
+
+
+def detector_accuracy(rng, rounds):
+    tp = fp = fn = tn = 0
+    checks = 0
+    started = time.perf_counter()
+    for _ in range(rounds):
+        detector = QuestionDetector()
+        script = [(s, True) for s in QUESTIONS] + [(s, False) for s in STATEMENTS]
+        rng.shuffle(script)
+        for sentence, is_question in script:
+            fired = False
+            for piece in fragments(sentence, rng):
+                fired = detector.observe(piece) is not None or fired
+                checks += 1
+            tp += fired and is_question
+            fp += fired and not is_question
+            fn += not fired and is_question
+            tn += not fired and not is_question
+    per_check = (time.perf_counter() - started) / checks
+    return tp / max(1, tp + fp), tp / max(1, tp + fn), per_check, (tp, fp, fn, tn)
+
+
+def simulate(args, rng, speculate):
+    scale = args.scale
+    llm_calls = []
+
+    def llm(snapshot):
+        llm_calls.append(snapshot)
+        time.sleep(args.llm_seconds * scale * rng.uniform(0.7, 1.3))
+        return f"answer to ...{snapshot[-40:]}"
+
+    buffer = ContextBuffer(window_seconds=600)
+    speculator = None
+    if speculate:
+        speculator = Speculator(llm, buffer.get_snapshot, lambda: buffer.version,
+                                settle=args.settle * scale, partial_settle=1.5 * scale, max_wait=4.0 * scale,
+                                max_changes=args.max_changes).start()
+        buffer.on_add = speculator.on_segment
+
+    waits = []
+    script = [(s, False) for s in STATEMENTS] + [(s, True) for s in QUESTIONS]
+    rng.shuffle(script)
+    for sentence, is_question in script:
+        for piece in fragments(sentence, rng):
+            buffer.add_segment(piece)
+            time.sleep(args.segment_seconds * scale)
+        if not is_question:
+            continue
+        # The user reacts; sometimes the interviewer adds a follow-up first
+        time.sleep(rng.uniform(0.5, 3.0) * scale)
+        if rng.random() < args.follow_up:
+            buffer.add_segment("I mean in your current role.")
+        pressed = time.perf_counter()
+        snapshot = buffer.get_snapshot()
+        text = None
+        if speculator:
+            snapshot = speculator.match(snapshot, buffer.version)
+            text = speculator.answer(snapshot, timeout=30)
+        if text is None:
+            text = llm(snapshot)
+        waits.append((time.perf_counter() - pressed) / scale)
+
+    stats = speculator.stats() if speculator else None
+    if speculator:
+        speculator.stop()
+    return waits, len(llm_calls), stats
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--llm-seconds", type=float, default=2.0, help="stub LLM latency (unscaled)")
+    parser.add_argument("--segment-seconds", type=float, default=1.0, help="time between ASR commits (unscaled)")
+    parser.add_argument("--settle", type=float, default=0.6)
+    parser.add_argument("--max-changes", type=int, default=2)
+    parser.add_argument("--follow-up", type=float, default=0.3, help="chance of a follow-up segment before ESC")
+    parser.add_argument("--scale", type=float, default=0.1, help="wall seconds per simulated second")
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    precision, recall, per_check, counts = detector_accuracy(random.Random(0), 50)
+    print(f"detector: precision {precision:.2f}, recall {recall:.2f} (tp/fp/fn/tn {counts}), "
+          f"{per_check * 1e6:.1f} us per segment")
+
+    for speculate in (False, True):
+        waits, calls, hits, triggers = [], 0, 0, 0
+        for r in range(args.rounds):
+            w, c, stats = simulate(args, random.Random(r), speculate)
+            waits += w
+            calls += c
+            if stats:
+                hits += stats["hits"]
+                triggers += stats["triggers"]
+        waits.sort()
+        label = "speculative" if speculate else "on ESC only"
+        line = (f"{label:<12}: ESC to answer p50 {statistics.median(waits):.2f}s, "
+                f"p95 {waits[int(len(waits) * 0.95) - 1]:.2f}s, {calls} LLM calls for {len(waits)} triggers")
+        if speculate:
+            line += f", hit rate {hits / max(1, triggers):.0%}"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Prompt size and trigger-time prompt assembly for 10, 30 and 90 minute
+meetings: ContextBuffer + SummaryMemory against keeping the whole transcript.
+
+Segments are replayed with back-dated timestamps so the window evicts as it
+would live. The summarizer is the extractive fallback with an artificial
+delay standing in for the LLM; it runs on the background thread and the
+trigger never waits for it.
+
+    python src/benchmarks/bench_summary_memory.py [--summarize-delay 0.05]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from memory.context_manager import ContextBuffer, estimate_tokens
+from memory.summary_memory import SummaryMemory, extractive_summary
+
+WORDS = ("the budget for next quarter depends on hiring two engineers and the migration "
+         "timeline we agreed with the client last week so please confirm the numbers by friday").split()
+SEGMENT_SECONDS = 3.0
+BUDGET = 2000
+
+
+def sentence(rng):
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(6, 14))).capitalize() + "."
+
+
+def run(minutes, delay):
+    rng = random.Random(minutes)
+
+    def summarize(text, max_words):
+        time.sleep(delay)
+        return extractive_summary(text, int(max_words / 0.75))
+
+    memory = SummaryMemory(summarize).start()
+    buffer = ContextBuffer(60, on_evict=memory.add)
+    full_transcript = []
+
+    segments = int(minutes * 60 / SEGMENT_SECONDS)
+    start = time.time() - minutes * 60
+    trigger_times = []
+    for i in range(segments):
+        text = sentence(rng)
+        full_transcript.append(text)
+        buffer.add_segment(text, timestamp=start + i * SEGMENT_SECONDS)
+        if i % 200 == 0:
+            # 200 segments is ten minutes live; give the background summarizer that long to catch up
+            while memory.stats()["raw_tokens"] >= memory.chunk_tokens:
+                time.sleep(0.001)
+            t0 = time.perf_counter()
+            memory.render(buffer.get_snapshot(), BUDGET)
+            trigger_times.append(time.perf_counter() - t0)
+
+    t0 = time.perf_counter()
+    prompt = memory.render(buffer.get_snapshot(), BUDGET)
+    trigger_times.append(time.perf_counter() - t0)
+    memory.stop()
+
+    naive_tokens = estimate_tokens(" ".join(full_transcript))
+    print(f"{minutes:>3} min | transcript {naive_tokens:>6} tokens | prompt {estimate_tokens(prompt):>5} tokens "
+          f"(budget {BUDGET}) | prompt build median {statistics.median(trigger_times) * 1e3:.3f} ms, "
+          f"max {max(trigger_times) * 1e3:.3f} ms | memory {memory.stats()['summaries']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--summarize-delay", type=float, default=0.02, help="simulated LLM latency per summary")
+    args = parser.parse_args()
+    for minutes in (10, 30, 90):
+        run(minutes, args.summarize_delay)
@@ -0,0 +1,184 @@
+"""
+SupabasePublisher against a local fake PostgREST endpoint.
+
+The fake serves PATCH /rest/v1/sessions?id=eq.<id> and POST
+/rest/v1/transcripts with a configurable round-trip delay, and can be
+switched to answer 503 to simulate an outage. A streamed answer pushes
+one update per token; we compare sending each update inline on the
+producer thread (what SupabaseSink used to do) with queueing it on the
+publisher, then replay the stream with an outage in the middle.
+
+    python src/benchmarks/bench_supabase_publisher.py [--tokens 200] [--rate 100] [--rtt-ms 50]
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import httpx
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+logging.getLogger("SupabasePublisher").setLevel(logging.ERROR)
+
+from utils.supabase_publisher import SupabasePublisher
+
+
+class FakeSupabase:
+    """Just enough PostgREST for the publisher: session rows, transcript inserts, outages."""
+
+    def __init__(self, rtt):
+        self.rtt = rtt
+        self.down = False
+        self.rows = {}
+        self.transcripts = []
+        self.requests = 0
+        self.connections = 0
+        self.updated_at = {}
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                fake.connections += 1
+
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, status):
+                self.send_response(status)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def _body(self):
+                return json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"null")
+
+            def do_PATCH(self):
+                body = self._body()
+                time.sleep(fake.rtt)
+                fake.requests += 1
+                if fake.down:
+                    return self._reply(503)
+                url = urlparse(self.path)
+                session = parse_qs(url.query)["id"][0].removeprefix("eq.")
+                fake.rows.setdefault(session, {}).update(body)
+                fake.updated_at[session] = time.perf_counter()
+                self._reply(204)
+
+            def do_POST(self):
+                body = self._body()
+                time.sleep(fake.rtt)
+                fake.requests += 1
+                if fake.down:
+                    return self._reply(503)
+                fake.transcripts.append(body)
+                self._reply(201)
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def reset(self):
+        self.rows.clear()
+        self.transcripts.clear()
+        self.requests = 0
+        self.connections = 0
+
+    def close(self):
+        self.server.shutdown()
+
+
+def stream(publish, tokens, rate):
+    """Feeds `tokens` growing answers; returns seconds the producer spent inside publish()."""
+    blocked = 0.0
+    text = ""
+    for i in range(tokens):
+        text += f"token{i} "
+        started = time.perf_counter()
+        publish(text)
+        blocked += time.perf_counter() - started
+        time.sleep(1 / rate)
+    return blocked, text
+
+
+def wait_for(fake, session, text, timeout=60):
+    while fake.rows.get(session, {}).get("response") != text and timeout > 0:
+        time.sleep(0.005)
+        timeout -= 0.005
+    return time.perf_counter()
+
+
+def run_inline(fake, args):
+    client = httpx.Client(base_url=fake.url + "/rest/v1", headers={"Prefer": "return=minimal"})
+
+    def publish(text):
+        client.patch("/sessions", params={"id": "eq.1"}, json={"response": text})
+
+    started = time.perf_counter()
+    blocked, text = stream(publish, args.tokens, args.rate)
+    done = wait_for(fake, "1", text)
+    client.close()
+    return blocked, done - started
+
+
+def run_publisher(fake, args, outage=None):
+    publisher = SupabasePublisher(fake.url, "key", transcript_interval=0.5, max_backoff=1.0).start()
+
+    def publish(text):
+        publisher.publish_response("1", text, "00:00:00")
+        publisher.publish_transcript("1", text.rsplit(" ", 2)[-2])
+
+    if outage:
+        def flap():
+            time.sleep(outage[0])
+            fake.down = True
+            time.sleep(outage[1])
+            fake.down = False
+        threading.Thread(target=flap, daemon=True).start()
+
+    started = time.perf_counter()
+    blocked, text = stream(publish, args.tokens, args.rate)
+    stream_end = time.perf_counter()
+    done = wait_for(fake, "1", text)
+    publisher.stop()
+    return blocked, done - started, done - stream_end, publisher.stats()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tokens", type=int, default=200)
+    parser.add_argument("--rate", type=float, default=100, help="token updates per second")
+    parser.add_argument("--rtt-ms", type=float, default=50)
+    args = parser.parse_args()
+
+    fake = FakeSupabase(args.rtt_ms / 1000)
+    stream_seconds = args.tokens / args.rate
+    print(f"{args.tokens} updates at {args.rate}/s ({stream_seconds:.1f}s of streaming), fake RTT {args.rtt_ms} ms")
+
+    blocked, total = run_inline(fake, args)
+    print(f"inline   : producer blocked {blocked:6.2f}s, final visible after {total:6.2f}s, "
+          f"{fake.requests} requests")
+
+    fake.reset()
+    blocked, total, lag, stats = run_publisher(fake, args)
+    print(f"publisher: producer blocked {blocked:6.3f}s, final visible after {total:6.2f}s "
+          f"({lag * 1000:.0f} ms after the last token), {fake.requests} requests on {fake.connections} connection(s), "
+          f"{stats['coalesced']} coalesced, {len(fake.transcripts)} transcript rows")
+
+    fake.reset()
+    outage = (stream_seconds * 0.3, stream_seconds * 0.4)
+    blocked, total, lag, stats = run_publisher(fake, args, outage)
+    print(f"outage {outage[1]:.1f}s: producer blocked {blocked:6.3f}s, final visible {lag * 1000:.0f} ms after the last token, "
+          f"{stats['retries']} retries, {fake.requests} requests, transcript rows {len(fake.transcripts)}")
+    fake.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Embedding throughput and trigger-time retrieval latency for VectorIndex at
+meeting lengths from one to twenty hours (one 40-word passage is roughly
+15 seconds of speech).
+
+Uses the hashing embedder by default; pass --fastembed to measure the
+ONNX model instead (needs `pip install fastembed`).
+
+    python src/benchmarks/bench_vector_index.py [--fastembed] [--queries 200]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from memory.vector_index import VectorIndex, HashingEmbedder, FastEmbedEmbedder
+
+WORDS = ("the budget for next quarter depends on hiring two engineers and the migration "
+         "timeline we agreed with the client last week so please confirm the numbers by friday "
+         "pricing contract renewal latency dashboard onboarding security review roadmap").split()
+PASSAGE_SECONDS = 15.0
+
+
+def passage(rng, words=40):
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def run(embedder, hours, queries):
+    rng = random.Random(hours)
+    count = int(hours * 3600 / PASSAGE_SECONDS)
+    texts = [passage(rng) for _ in range(count)]
+
+    index = VectorIndex(embedder, passage_words=40)
+    started = time.perf_counter()
+    for start in range(0, count, 256):
+        batch = texts[start:start + 256]
+        index._append([(i * PASSAGE_SECONDS, t) for i, t in enumerate(batch, start)], embedder.embed(batch))
+    embed_seconds = time.perf_counter() - started
+
+    latencies = []
+    for _ in range(queries):
+        query = passage(rng, 50)
+        started = time.perf_counter()
+        index.search(query, k=3, before=count * PASSAGE_SECONDS - 60)
+        latencies.append((time.perf_counter() - started) * 1000)
+    latencies.sort()
+    return {
+        "passages": count,
+        "embed/s": count / embed_seconds,
+        "index_mb": index._vectors.nbytes / 2**20,
+        "p50_ms": statistics.median(latencies),
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--fastembed", action="store_true")
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    embedder = FastEmbedEmbedder() if args.fastembed else HashingEmbedder()
+    print(f"embedder: {type(embedder).__name__} (dim {embedder.dim})")
+    print(f"{'hours':>6} {'passages':>9} {'embed/s':>9} {'index MB':>9} {'p50 ms':>8} {'p99 ms':>8}")
+    for hours in (1, 4, 20):
+        r = run(embedder, hours, args.queries)
+        print(f"{hours:>6} {r['passages']:>9} {r['embed/s']:>9.0f} {r['index_mb']:>9.1f} "
+              f"{r['p50_ms']:>8.2f} {r['p99_ms']:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
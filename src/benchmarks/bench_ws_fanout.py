@@ -0,0 +1,143 @@
+"""
+WebSocket fan-out under load: hundreds of simulated clients on one event
+loop, a few of them on a "bad network" (slow or stalled sends).
+
+Compares the old sequential broadcast (await send_json per socket in turn)
+against ConnectionManager's per-client queues, reporting delivery latency
+to the healthy clients and what happened to the slow ones.
+
+    python src/benchmarks/bench_ws_fanout.py [--clients 500] [--slow 5] [--messages 200] [--rate 50]
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from live.connections import ConnectionManager
+
+
+class FakeSocket:
+    """Stands in for a starlette WebSocket; records when each message arrives."""
+
+    def __init__(self, delay, rng):
+        self.delay = delay
+        self.rng = rng
+        self.received = []
+        self.closed = False
+
+    async def accept(self):
+        pass
+
+    async def _wire(self):
+        if self.delay:
+            await asyncio.sleep(self.delay * (0.5 + self.rng.random()))
+        else:
+            await asyncio.sleep(0)
+
+    async def send_text(self, payload):
+        await self._wire()
+        self.received.append((json.loads(payload)["seq"], time.perf_counter()))
+
+    async def send_json(self, message):
+        payload = json.dumps(message)
+        await self._wire()
+        self.received.append((json.loads(payload)["seq"], time.perf_counter()))
+
+    async def close(self, code=1000):
+        self.closed = True
+
+
+async def sequential_broadcast(sockets, message):
+    # The previous ConnectionManager.broadcast
+    for socket in sockets:
+        await socket.send_json(message)
+
+
+def make_sockets(clients, slow, slow_delay):
+    rng = random.Random(0)
+    return [FakeSocket(slow_delay if i < slow else 0.0, rng) for i in range(clients)]
+
+
+def summarize(sockets, sent_at, slow, elapsed):
+    healthy = sockets[slow:]
+    latencies = [(t - sent_at[seq]) * 1000 for s in healthy for seq, t in s.received]
+    delivered = sum(len(s.received) for s in healthy)
+    latencies.sort()
+    return {
+        "healthy_delivered": f"{delivered}/{len(healthy) * len(sent_at)}",
+        "p50_ms": statistics.median(latencies) if latencies else float("nan"),
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] if latencies else float("nan"),
+        "wall_s": elapsed,
+    }
+
+
+async def run_sequential(args):
+    sockets = make_sockets(args.clients, args.slow, args.slow_delay)
+    sent_at = {}
+    started = time.perf_counter()
+    for seq in range(args.messages):
+        sent_at[seq] = time.perf_counter()
+        await sequential_broadcast(sockets, {"seq": seq, "text": "x" * args.size})
+        await asyncio.sleep(max(0.0, sent_at[seq] + 1 / args.rate - time.perf_counter()))
+    return summarize(sockets, sent_at, args.slow, time.perf_counter() - started)
+
+
+async def run_queued(args):
+    manager = ConnectionManager(max_queue=args.max_queue, send_timeout=args.send_timeout)
+    sockets = make_sockets(args.clients, args.slow, args.slow_delay)
+    for socket in sockets:
+        await manager.connect(socket)
+    sent_at = {}
+    publish = []
+    depth_max = 0
+    started = time.perf_counter()
+    for seq in range(args.messages):
+        sent_at[seq] = time.perf_counter()
+        manager.publish({"seq": seq, "text": "x" * args.size})
+        publish.append(time.perf_counter() - sent_at[seq])
+        depth_max = max(depth_max, manager.stats()["queue_depth_max"])
+        await asyncio.sleep(max(0.0, sent_at[seq] + 1 / args.rate - time.perf_counter()))
+    # Let the healthy clients drain
+    while any(c.queue for c in manager.clients.values() if c.websocket not in sockets[:args.slow]):
+        await asyncio.sleep(0.01)
+    elapsed = time.perf_counter() - started
+    result = summarize(sockets, sent_at, args.slow, elapsed)
+    stats = manager.stats()
+    result["publish_us"] = statistics.median(publish) * 1e6
+    result["queue_depth_max"] = depth_max
+    result["dropped_clients"] = stats["dropped_clients"]
+    for client in list(manager.clients.values()):
+        client.task.cancel()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", type=int, default=500)
+    parser.add_argument("--slow", type=int, default=5, help="clients on a bad network")
+    parser.add_argument("--slow-delay", type=float, default=0.5, help="seconds per send for slow clients")
+    parser.add_argument("--messages", type=int, default=200)
+    parser.add_argument("--rate", type=float, default=50, help="broadcasts per second")
+    parser.add_argument("--size", type=int, default=200, help="payload characters")
+    parser.add_argument("--max-queue", type=int, default=64)
+    parser.add_argument("--send-timeout", type=float, default=5.0)
+    parser.add_argument("--skip-sequential", action="store_true")
+    args = parser.parse_args()
+
+    print(f"{args.clients} clients ({args.slow} slow at ~{args.slow_delay}s/send), "
+          f"{args.messages} broadcasts at {args.rate}/s")
+    if not args.skip_sequential:
+        # The old path stalls on every slow send; cap the run so it finishes
+        seq_args = argparse.Namespace(**{**vars(args), "messages": min(args.messages, 20)})
+        print(f"sequential ({seq_args.messages} msgs): {asyncio.run(run_sequential(seq_args))}")
+    print(f"queued: {asyncio.run(run_queued(args))}")
+
+
+if __name__ == "__main__":
+    main()
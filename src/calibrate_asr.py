@@ -0,0 +1,56 @@
+"""
+Calibrate Whisper for this machine and cache the choice main.py loads.
+
+    python src/calibrate_asr.py clip.wav [--max-rtf 0.3] [--max-latency 1.0] [--models small.en,base.en]
+
+`clip.wav` should be a minute or two of representative speech; a
+`clip.txt` beside it is used as the reference transcript. Prints every
+configuration tried and caches the chosen one for this machine.
+"""
+import argparse
+import logging
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+from asr.autotune import MODELS, calibrate, load_clip, save_choice, thread_counts, _config
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pick the Whisper configuration for this machine.")
+    parser.add_argument("clip")
+    parser.add_argument("--max-rtf", type=float, default=0.3, help="Whisper seconds per audio second, at most")
+    parser.add_argument("--max-latency", type=float, default=1.0, help="p95 seconds per call, at most")
+    parser.add_argument("--window", type=float, default=5.0, help="audio seconds per call")
+    parser.add_argument("--models", default=",".join(MODELS), help="most accurate first")
+    parser.add_argument("--threads", default=None, help=f"comma-separated (default here: {thread_counts()})")
+    parser.add_argument("--cache", default=".cache/asr_tuning.json")
+    parser.add_argument("--dry-run", action="store_true", help="don't cache the choice")
+    args = parser.parse_args()
+
+    audio, reference = load_clip(args.clip)
+    threads = tuple(int(t) for t in args.threads.split(",")) if args.threads else None
+    config, results = calibrate(audio, reference, args.max_rtf, args.max_latency, args.window,
+                                models=tuple(args.models.split(",")), threads=threads)
+
+    print(f"\n{len(audio) / 16000:.0f}s clip, {'reference transcript' if reference else 'no reference (WER vs the most accurate model)'}")
+    print(f"{'model':<10} {'compute':<13} {'threads':>7} {'beam':>4} {'RTF':>6} {'p95 s':>6} {'WER':>6}")
+    for r in results:
+        mark = "  <- chosen" if config and r["passed"] and _config(r) == config else ("" if r["passed"] else "  (misses target)")
+        print(f"{r['model_size']:<10} {r['compute_type']:<13} {r['cpu_threads']:>7} {r['beam_size']:>4} "
+              f"{r['rtf']:6.2f} {r['p95_latency']:6.2f} {r['wer'] * 100:5.1f}%{mark}")
+
+    if config is None:
+        sys.exit("Nothing met the targets; relax --max-rtf / --max-latency or add a smaller model.")
+    if not args.dry_run:
+        targets = {"max_rtf": args.max_rtf, "max_latency": args.max_latency, "window_seconds": args.window}
+        chosen = next(r for r in results if r["passed"] and _config(r) == config)
+        save_choice(args.cache, config, targets, chosen)
+        print(f"\nCached for this machine in {args.cache}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+import os
+import asyncio
+import logging
+import threading
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException
+from fastapi.staticfiles import StaticFiles
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+from live.connections import ConnectionManager
+from live.sessions import SessionRegistry
+from live.bus import LoopBus, transcript_event, llm_partial_event, response_event
+from utils import metrics
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("WebServer")
+
+app = FastAPI()
+
+# Store connected clients
+manager = ConnectionManager()
+
+# State
+TOKEN_TTL_SECONDS = 12 * 3600
+registry = SessionRegistry(token_ttl=TOKEN_TTL_SECONDS)
+PAIRING_CODE = None     # default session for the publish helpers below
+
+class PairingRequest(BaseModel):
+    code: str
+
+def set_pairing_code(code: str):
+    global PAIRING_CODE
+    registry.create(code)
+    PAIRING_CODE = code
+    logger.info(f"Pairing code set to: {code}")
+
+def create_session(code: str = None) -> str:
+    """Host another meeting on this server; returns its pairing code."""
+    return registry.create(code).code
+
+def end_session(code: str):
+    """Forget a meeting: its tokens stop working and its sockets are closed."""
+    if registry.close(code) and SERVER_LOOP:
+        asyncio.run_coroutine_threadsafe(manager.close_group(code), SERVER_LOOP)
+
+@app.post("/verify")
+async def verify_code(request: PairingRequest):
+    if not registry:
+        raise HTTPException(status_code=500, detail="Server not ready")
+    
+    token = registry.issue_token(request.code)
+    if token:
+        return {"valid": True, "token": token}
+    else:
+        return {"valid": False}
+
+@app.websocket("/ws")
+async def websocket_endpoint(websocket: WebSocket, token: str = None):
+    session = registry.resolve(token)
+    if session is None:
+        await websocket.close(code=4003) # Forbidden
+        return
+
+    await manager.connect(websocket, group=session.code)
+    try:
+        while True:
+            # Keep connection alive, maybe handle ping/pong
+            data = await websocket.receive_text()
+            # We don't expect messages from client, but just in case
+    except WebSocketDisconnect:
+        manager.disconnect(websocket)
+    except Exception as e:
+        logger.error(f"WebSocket error: {e}")
+        manager.disconnect(websocket)
+
+@app.get("/connections")
+async def connection_stats():
+    return {**manager.stats(), "bus": bus.stats(), **registry.stats()}
+
+@app.get("/metrics")
+async def metrics_endpoint():
+    return Response(metrics.render(), media_type=metrics.CONTENT_TYPE)
+
+# Serve static files
+# We assume the 'client' folder is in the project root
+CLIENT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "client"))
+
+if os.path.exists(CLIENT_DIR):
+    app.mount("/", StaticFiles(directory=CLIENT_DIR, html=True), name="client")
+else:
+    logger.error(f"Client directory not found at {CLIENT_DIR}")
+
+# Thread-safe communication
+SERVER_LOOP = None
+
+def deliver_event(event, key):
+    # Events never fan out across meetings; one without a session has nowhere to go
+    if event["session"] is not None:
+        manager.publish(event, coalesce_key=key, group=event["session"])
+
+bus = LoopBus(deliver_event)
+
+@app.on_event("startup")
+async def startup_event():
+    global SERVER_LOOP
+    SERVER_LOOP = asyncio.get_running_loop()
+    bus.attach(SERVER_LOOP)
+    logger.info("Server loop captured.")
+
+# The helpers below go to `session`'s subscribers, or the pairing code's if not given
+
+def publish_transcript(text: str, partial: bool = False, session: str = None):
+    """Called from the ASR thread: committed text, or the current partial hypothesis."""
+    return bus.publish(transcript_event(text, partial, session or PAIRING_CODE))
+
+def publish_llm_partial(request_id, text: str, session: str = None):
+    """Called from the LLM thread with the answer so far; intermediate updates may be skipped."""
+    return bus.publish(llm_partial_event(request_id, text, session or PAIRING_CODE))
+
+def send_message_sync(text: str, timestamp: str, session: str = None):
+    """
+    Thread-safe: queue the final response for the session's clients without waiting on the loop.
+    """
+    if not bus.publish(response_event(text, timestamp, session or PAIRING_CODE)):
+        logger.warning("Server loop not running, cannot broadcast message.")
+
+def serve_in_thread(host: str = "127.0.0.1", port: int = 8001):
+    """
+    Run this app on a daemon thread of the calling process, so its worker
+    threads can publish straight to the bus; returns a function that stops it.
+    The default host only accepts local clients; pass "0.0.0.0" for paired
+    devices elsewhere on the network.
+    """
+    import uvicorn
+    server = uvicorn.Server(uvicorn.Config(app, host=host, port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, name="ws-server", daemon=True)
+    thread.start()
+    logger.info(f"WebSocket server on ws://{host}:{port}/ws")
+
+    def stop():
+        server.should_exit = True
+        thread.join(timeout=5)
+    return stop
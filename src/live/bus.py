@@ -0,0 +1,107 @@
+import time
+import logging
+from collections import deque
+
+logger = logging.getLogger("WebServer")
+
+# Event types pushed to the browser
+TRANSCRIPT = "transcript"        # {"text", "partial"}
+LLM_PARTIAL = "llm_partial"      # {"request_id", "text"}: the answer so far, not a delta
+RESPONSE = "response"            # {"text", "timestamp"}
+# Every event also carries "session", the pairing code of the meeting it belongs to
+
+
+def transcript_event(text, partial=False, session=None):
+    return {"type": TRANSCRIPT, "session": session, "text": text, "partial": partial}
+
+
+def llm_partial_event(request_id, text, session=None):
+    return {"type": LLM_PARTIAL, "session": session, "request_id": request_id, "text": text}
+
+
+def response_event(text, timestamp, session=None):
+    return {"type": RESPONSE, "session": session, "text": text, "timestamp": timestamp}
+
+
+def coalesce_key(event):
+    """Events that only matter as the latest value share a key; the rest must all be delivered."""
+    if event["type"] == TRANSCRIPT and event.get("partial"):
+        return f"{TRANSCRIPT}:{event.get('session')}"
+    if event["type"] == LLM_PARTIAL:
+        return f"{LLM_PARTIAL}:{event.get('session')}:{event['request_id']}"
+    return None
+
+
+class LoopBus:
+    """
+    Hands events from worker threads (ASR, LLM) to the server's event loop.
+
+    `publish` appends to a deque and, only if no drain is already scheduled,
+    wakes the loop with one `call_soon_threadsafe`. So the producer never
+    blocks or waits on the loop, and a burst of events costs a single loop
+    wakeup. The drain runs on the loop, drops partial events superseded by
+    a later one in the same batch and passes the rest to
+    `deliver(event, coalesce_key)`.
+    """
+
+    def __init__(self, deliver):
+        self.deliver = deliver
+        self.loop = None
+        self._events = deque()
+        self._scheduled = False
+        self.published = 0
+        self.wakeups = 0
+        self.superseded = 0
+
+    def attach(self, loop):
+        self.loop = loop
+
+    def publish(self, event) -> bool:
+        """Thread-safe and non-blocking; False if the server loop isn't running."""
+        loop = self.loop
+        if loop is None or loop.is_closed():
+            return False
+        event["ts"] = time.time()
+        self._events.append(event)
+        self.published += 1
+        if not self._scheduled:
+            # Two producers racing here can both schedule; the second drain just finds nothing
+            self._scheduled = True
+            try:
+                loop.call_soon_threadsafe(self._drain)
+            except RuntimeError:
+                self._scheduled = False
+                return False
+        return True
+
+    def _drain(self):
+        self._scheduled = False
+        self.wakeups += 1
+        batch = []
+        while self._events:
+            batch.append(self._events.popleft())
+        if not batch:
+            return
+
+        latest = {}
+        for i, event in enumerate(batch):
+            key = coalesce_key(event)
+            if key is not None:
+                latest[key] = i
+        for i, event in enumerate(batch):
+            key = coalesce_key(event)
+            if key is not None and latest[key] != i:
+                self.superseded += 1
+                continue
+            try:
+                self.deliver(event, key)
+            except Exception as e:
+                logger.error(f"Failed to deliver {event['type']} event: {e}")
+
+    def stats(self):
+        return {
+            "published": self.published,
+            "wakeups": self.wakeups,
+            "superseded": self.superseded,
+            "events_per_wakeup": self.published / self.wakeups if self.wakeups else 0.0,
+        }
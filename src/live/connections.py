@@ -0,0 +1,178 @@
+import json
+import time
+import asyncio
+import logging
+from collections import deque
+from utils import metrics
+
+logger = logging.getLogger("WebServer")
+
+_LATENCY = metrics.histogram("publish_latency_seconds", "Queued to acknowledged", target="websocket")
+_DROPPED = metrics.counter("websocket_dropped_clients_total", "Clients disconnected for falling behind")
+
+
+class Client:
+    """One connected socket: a bounded outbound queue drained by its own sender task."""
+
+    def __init__(self, websocket, max_queue, group=None):
+        self.websocket = websocket
+        self.group = group
+        self.max_queue = max_queue
+        self.queue = deque()          # [coalesce_key, payload, enqueued_at]
+        self.ready = asyncio.Event()
+        self.task = None
+        self.sent = 0
+        self.coalesced = 0
+
+    def offer(self, payload, key=None) -> bool:
+        """Queue a payload; False if the client is too far behind to take it."""
+        now = time.perf_counter()
+        if key is not None:
+            # A newer partial update replaces the queued one instead of queueing behind it
+            for entry in self.queue:
+                if entry[0] == key:
+                    entry[1] = payload
+                    self.coalesced += 1
+                    return True
+        if len(self.queue) >= self.max_queue:
+            return False
+        self.queue.append([key, payload, now])
+        self.ready.set()
+        return True
+
+
+class ConnectionManager:
+    """
+    Broadcasts to WebSocket clients without letting one slow client hold up the rest.
+
+    `broadcast` serializes the message once and only appends it to each
+    client's queue; every client has its own sender task that writes to the
+    socket. Messages with a `coalesce_key` replace a queued message with the
+    same key. A client whose queue is full, or whose send takes longer than
+    `send_timeout`, is disconnected.
+
+    Clients can join a group (a meeting session); publishing to a group
+    looks its subscribers up directly instead of scanning every client.
+    """
+
+    def __init__(self, max_queue=64, send_timeout=5.0, latency_samples=4096):
+        self.max_queue = max_queue
+        self.send_timeout = send_timeout
+        self.clients = {}
+        self.groups = {}             # group -> {websocket: Client}
+        self.dropped = 0
+        self.messages = 0
+        self._latencies = deque(maxlen=latency_samples)   # enqueue -> sent, seconds
+        metrics.gauge("websocket_clients", "Connected WebSocket clients", fn=lambda: len(self.clients))
+        metrics.gauge("websocket_queue_depth_max", "Deepest per-client outbound queue",
+                      fn=lambda: max((len(c.queue) for c in self.clients.values()), default=0))
+
+    @property
+    def active_connections(self):
+        return list(self.clients)
+
+    async def connect(self, websocket, group=None):
+        await websocket.accept()
+        self.attach(websocket, group)
+
+    def attach(self, websocket, group=None):
+        """Register an already accepted socket and start its sender."""
+        client = Client(websocket, self.max_queue, group)
+        client.task = asyncio.create_task(self._sender(client))
+        self.clients[websocket] = client
+        if group is not None:
+            self.groups.setdefault(group, {})[websocket] = client
+        logger.info(f"Client connected. Total: {len(self.clients)}")
+        return client
+
+    def disconnect(self, websocket):
+        client = self.clients.pop(websocket, None)
+        if client is None:
+            return
+        if client.group is not None:
+            members = self.groups.get(client.group)
+            if members is not None:
+                members.pop(websocket, None)
+                if not members:
+                    del self.groups[client.group]
+        if client.task and client.task is not asyncio.current_task():
+            client.task.cancel()
+        logger.info(f"Client disconnected. Total: {len(self.clients)}")
+
+    async def _drop(self, client, reason):
+        self.dropped += 1
+        _DROPPED.inc()
+        logger.warning(f"Dropping client ({reason}); {len(client.queue)} messages queued")
+        self.disconnect(client.websocket)
+        try:
+            await client.websocket.close(code=1013)   # try again later
+        except Exception:
+            pass
+
+    async def _sender(self, client):
+        websocket = client.websocket
+        try:
+            while True:
+                await client.ready.wait()
+                while client.queue:
+                    _, payload, enqueued = client.queue.popleft()
+                    try:
+                        await asyncio.wait_for(websocket.send_text(payload), self.send_timeout)
+                    except asyncio.TimeoutError:
+                        await self._drop(client, "send timed out")
+                        return
+                    except Exception as e:
+                        logger.error(f"Error sending to client: {e}")
+                        self.disconnect(websocket)
+                        return
+                    client.sent += 1
+                    latency = time.perf_counter() - enqueued
+                    self._latencies.append(latency)
+                    _LATENCY.observe(latency)
+                client.ready.clear()
+        except asyncio.CancelledError:
+            pass
+
+    def publish(self, message: dict, coalesce_key=None, group=None):
+        """Queue `message` for every client, or only `group`'s; never awaits a socket."""
+        targets = self.clients if group is None else self.groups.get(group)
+        self.messages += 1
+        if not targets:
+            return
+        payload = json.dumps(message, ensure_ascii=False)
+        slow = []
+        for client in list(targets.values()):
+            if not client.offer(payload, coalesce_key):
+                slow.append(client)
+        for client in slow:
+            asyncio.create_task(self._drop(client, "outbound queue full"))
+
+    async def broadcast(self, message: dict, coalesce_key=None, group=None):
+        self.publish(message, coalesce_key, group)
+
+    async def close_group(self, group, code=1000):
+        for client in list(self.groups.get(group, {}).values()):
+            self.disconnect(client.websocket)
+            try:
+                await client.websocket.close(code=code)
+            except Exception:
+                pass
+
+    def stats(self):
+        depths = [len(c.queue) for c in self.clients.values()]
+        latencies = sorted(self._latencies)
+
+        def pct(p):
+            return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000 if latencies else 0.0
+
+        return {
+            "clients": len(self.clients),
+            "groups": len(self.groups),
+            "messages": self.messages,
+            "queue_depth_max": max(depths, default=0),
+            "queue_depth_total": sum(depths),
+            "coalesced": sum(c.coalesced for c in self.clients.values()),
+            "dropped_clients": self.dropped,
+            "send_latency_p50_ms": pct(0.50),
+            "send_latency_p99_ms": pct(0.99),
+        }
@@ -0,0 +1,91 @@
+import time
+import secrets
+import logging
+from collections import deque
+
+logger = logging.getLogger("WebServer")
+
+
+class Session:
+    __slots__ = ("code", "created", "tokens")
+
+    def __init__(self, code):
+        self.code = code
+        self.created = time.time()
+        self.tokens = set()
+
+
+class SessionRegistry:
+    """
+    Meetings hosted by this server, keyed by pairing code.
+
+    `/verify` exchanges a pairing code for a token bound to that session;
+    tokens expire after `token_ttl` seconds. Every token has the same
+    lifetime, so expiry order is issue order and expired tokens are swept
+    from the front of a deque as a side effect of issuing and resolving.
+    """
+
+    def __init__(self, token_ttl=12 * 3600):
+        self.token_ttl = token_ttl
+        self.sessions = {}
+        self._tokens = {}            # token -> (session code, expires)
+        self._expiry = deque()       # (expires, token) in issue order
+
+    def __len__(self):
+        return len(self.sessions)
+
+    def create(self, code=None):
+        if code is None:
+            code = str(secrets.randbelow(9000) + 1000)
+            while code in self.sessions:
+                code = str(secrets.randbelow(9000) + 1000)
+        session = self.sessions.get(code)
+        if session is None:
+            session = self.sessions[code] = Session(code)
+            logger.info(f"Session {code} created. Total: {len(self.sessions)}")
+        return session
+
+    def get(self, code):
+        return self.sessions.get(code)
+
+    def close(self, code):
+        session = self.sessions.pop(code, None)
+        if session is None:
+            return None
+        for token in session.tokens:
+            self._tokens.pop(token, None)
+        logger.info(f"Session {code} closed. Total: {len(self.sessions)}")
+        return session
+
+    def issue_token(self, code):
+        session = self.sessions.get(code)
+        if session is None:
+            return None
+        self.sweep()
+        token = secrets.token_hex(16)
+        expires = time.monotonic() + self.token_ttl
+        self._tokens[token] = (code, expires)
+        self._expiry.append((expires, token))
+        session.tokens.add(token)
+        return token
+
+    def resolve(self, token):
+        """The session a token belongs to, or None if it is unknown, expired or its session has closed."""
+        self.sweep()
+        entry = self._tokens.get(token)
+        if entry is None or entry[1] <= time.monotonic():
+            return None
+        return self.sessions.get(entry[0])
+
+    def sweep(self):
+        now = time.monotonic()
+        while self._expiry and self._expiry[0][0] <= now:
+            _, token = self._expiry.popleft()
+            entry = self._tokens.pop(token, None)
+            if entry:
+                session = self.sessions.get(entry[0])
+                if session:
+                    session.tokens.discard(token)
+
+    def stats(self):
+        return {"sessions": len(self.sessions), "tokens": len(self._tokens)}
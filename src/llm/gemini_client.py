@@ -1,11 +1,31 @@
 import os
+import time
 from dotenv import load_dotenv
 from google import genai
-from utils.text_cleaner import clean_llm_output
+from utils.text_cleaner import clean_llm_output, StreamingCleaner
+from llm.response_cache import ResponseCache
+from utils import metrics
 
 load_dotenv()
 
+MODEL = "gemini-2.0-flash"
+
 _client = None
+_cache = ResponseCache()
+
+_LATENCY = metrics.histogram("llm_latency_seconds", "Gemini call duration (to the last token when streaming)", backend="gemini")
+_FIRST_TOKEN = metrics.histogram("llm_first_token_seconds", "Time to the first streamed token", backend="gemini")
+_ERRORS = metrics.counter("llm_errors_total", "Failed Gemini calls", backend="gemini")
+metrics.counter("llm_cache_hits_total", "Answers served from the response cache", fn=lambda: _cache.hits)
+
+def configure_cache(enabled=True, max_entries=256, ttl_seconds=600.0, path=None):
+    global _cache
+    _cache = ResponseCache(max_entries=max_entries, ttl_seconds=ttl_seconds, path=path)
+    _cache.enabled = enabled
+    return _cache
+
+def get_cache() -> ResponseCache:
+    return _cache
 
 def get_client():
     global _client
@@ -19,10 +39,8 @@ def get_client():
     _client = genai.Client(api_key=api_key)
     return _client
 
-def ask_gemini(context_text: str) -> str:
-    try:
-        client = get_client()
-        prompt = f"""
+def build_prompt(context_text: str) -> str:
+    return f"""
 You are a senior corporate professional.
 
 Respond in plain text only.
@@ -32,10 +50,99 @@ Be concise, calm, and confident.
 Recent conversation:
 {context_text}
 """
+
+def ask_gemini(context_text: str, raise_errors: bool = False, bypass_cache: bool = False) -> str:
+    prompt = build_prompt(context_text)
+    if not bypass_cache:
+        cached = _cache.get(prompt, MODEL)
+        if cached is not None:
+            return cached
+    started = time.perf_counter()
+    try:
+        client = get_client()
         response = client.models.generate_content(
-            model="gemini-2.0-flash",
+            model=MODEL,
             contents=prompt
         )
-        return clean_llm_output(response.text)
+        text = clean_llm_output(response.text)
+        _LATENCY.observe(time.perf_counter() - started)
+        _cache.put(prompt, MODEL, text)
+        return text
     except Exception as e:
+        _ERRORS.inc()
+        if raise_errors:
+            raise
         return f"AI Error: {str(e)}"
+
+def ask_gemini_stream(context_text: str, raise_errors: bool = False, bypass_cache: bool = False):
+    """Yield cleaned text pieces as Gemini produces them."""
+    prompt = build_prompt(context_text)
+    if not bypass_cache:
+        cached = _cache.get(prompt, MODEL)
+        if cached is not None:
+            yield cached
+            return
+    cleaner = StreamingCleaner()
+    full_text = ""
+    started = time.perf_counter()
+    try:
+        client = get_client()
+        for chunk in client.models.generate_content_stream(
+            model=MODEL,
+            contents=prompt
+        ):
+            text = cleaner.feed(chunk.text or "")
+            if text:
+                if not full_text:
+                    _FIRST_TOKEN.observe(time.perf_counter() - started)
+                full_text += text
+                yield text
+        _LATENCY.observe(time.perf_counter() - started)
+        # Only complete answers are cached; an abandoned stream never gets here
+        _cache.put(prompt, MODEL, full_text)
+    except Exception as e:
+        _ERRORS.inc()
+        if raise_errors:
+            raise
+        yield f"AI Error: {str(e)}"
+
+def summarize_gemini(text: str, max_words: int) -> str:
+    """Condense meeting transcript (or earlier summaries) for long-term memory; raises on failure."""
+    client = get_client()
+    prompt = f"""
+Summarize this part of a meeting in at most {max_words} words.
+Keep decisions, open questions, names, numbers and action items.
+Plain text only, no bullet points.
+
+{text}
+"""
+    response = client.models.generate_content(model=MODEL, contents=prompt)
+    return clean_llm_output(response.text)
+
+class GeminiBackend:
+    """`ask_gemini` / `ask_gemini_stream` as an `LLMRouter` backend."""
+
+    name = "gemini"
+    model = MODEL
+
+    def __init__(self, max_prompt_tokens=100_000, expected_seconds=2.0):
+        self.max_prompt_tokens = max_prompt_tokens
+        self.expected_seconds = expected_seconds
+
+    def available(self) -> bool:
+        return bool(os.getenv("GEMINI_API_KEY"))
+
+    def warm(self):
+        pass
+
+    def cached(self, context_text):
+        return _cache.get(build_prompt(context_text), MODEL)
+
+    def complete(self, context_text):
+        return ask_gemini(context_text, raise_errors=True, bypass_cache=True)
+
+    def stream(self, context_text):
+        return ask_gemini_stream(context_text, raise_errors=True, bypass_cache=True)
+
+    def close(self):
+        pass
@@ -0,0 +1,143 @@
+import json
+import time
+import logging
+import threading
+
+import httpx
+from utils.text_cleaner import clean_llm_output, StreamingCleaner
+from llm.gemini_client import build_prompt, get_cache
+from utils import metrics
+
+logger = logging.getLogger("Ollama")
+
+_LATENCY = metrics.histogram("llm_latency_seconds", "Ollama call duration (to the last token when streaming)", backend="ollama")
+_FIRST_TOKEN = metrics.histogram("llm_first_token_seconds", "Time to the first streamed token", backend="ollama")
+_ERRORS = metrics.counter("llm_errors_total", "Failed Ollama calls", backend="ollama")
+
+
+class OllamaBackend:
+    """
+    A local model served by Ollama (`/api/chat`), over one pooled
+    keep-alive connection.
+
+    Every request asks the server to keep the model loaded for `keep_alive`
+    and `warm()` loads it ahead of the first trigger, so answers don't pay
+    the model load. `available()` is a cached health check: the server
+    answers and has `model` pulled. A failed call marks the backend
+    unavailable until the next check.
+    """
+
+    name = "ollama"
+
+    def __init__(self, model="llama3.2:3b", host="http://127.0.0.1:11434", keep_alive="30m",
+                 max_prompt_tokens=3000, expected_seconds=3.0, timeout=60.0, health_interval=10.0,
+                 options=None, transport=None):
+        self.model = model
+        self.keep_alive = keep_alive
+        self.max_prompt_tokens = max_prompt_tokens
+        self.expected_seconds = expected_seconds
+        self.health_interval = health_interval
+        self.options = options or {}
+        self.client = httpx.Client(
+            base_url=host.rstrip("/"),
+            timeout=httpx.Timeout(timeout, connect=1.0),
+            limits=httpx.Limits(max_connections=2, max_keepalive_connections=2),
+            transport=transport,
+        )
+        self._healthy = None
+        self._checked = 0.0
+
+    def available(self) -> bool:
+        now = time.monotonic()
+        if self._healthy is None or now - self._checked >= self.health_interval:
+            self._checked = now
+            try:
+                response = self.client.get("/api/tags", timeout=1.0)
+                response.raise_for_status()
+                names = {m.get("name") for m in response.json().get("models", [])}
+                self._healthy = self.model in names or f"{self.model}:latest" in names
+                if not self._healthy:
+                    logger.warning(f"Ollama is up but {self.model} is not pulled")
+            except (httpx.HTTPError, ValueError):
+                self._healthy = False
+        return self._healthy
+
+    def warm(self):
+        """Load the model in the background; a generate request without a prompt only loads it."""
+        def load():
+            started = time.perf_counter()
+            try:
+                self.client.post("/api/generate", json={"model": self.model, "keep_alive": self.keep_alive}).raise_for_status()
+                logger.info(f"{self.model} loaded in {time.perf_counter() - started:.1f}s")
+            except httpx.HTTPError as e:
+                logger.warning(f"Could not warm {self.model}: {e}")
+
+        thread = threading.Thread(target=load, name="ollama-warm", daemon=True)
+        thread.start()
+        return thread
+
+    def cached(self, context_text):
+        return get_cache().get(build_prompt(context_text), self.model)
+
+    def _payload(self, prompt, stream):
+        return {
+            "model": self.model,
+            "messages": [{"role": "user", "content": prompt}],
+            "stream": stream,
+            "keep_alive": self.keep_alive,
+            "options": self.options,
+        }
+
+    def _failed(self):
+        _ERRORS.inc()
+        self._healthy = False
+        self._checked = time.monotonic()
+
+    def complete(self, context_text):
+        prompt = build_prompt(context_text)
+        started = time.perf_counter()
+        try:
+            response = self.client.post("/api/chat", json=self._payload(prompt, False))
+            response.raise_for_status()
+            data = response.json()
+            if data.get("error"):
+                raise RuntimeError(data["error"])
+        except Exception:
+            self._failed()
+            raise
+        text = clean_llm_output(data.get("message", {}).get("content", ""))
+        _LATENCY.observe(time.perf_counter() - started)
+        get_cache().put(prompt, self.model, text)
+        return text
+
+    def stream(self, context_text):
+        """Yield cleaned text pieces as the model produces them."""
+        prompt = build_prompt(context_text)
+        cleaner = StreamingCleaner()
+        full_text = ""
+        started = time.perf_counter()
+        try:
+            with self.client.stream("POST", "/api/chat", json=self._payload(prompt, True)) as response:
+                response.raise_for_status()
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    data = json.loads(line)
+                    if data.get("error"):
+                        raise RuntimeError(data["error"])
+                    text = cleaner.feed(data.get("message", {}).get("content", ""))
+                    if text:
+                        if not full_text:
+                            _FIRST_TOKEN.observe(time.perf_counter() - started)
+                        full_text += text
+                        yield text
+                    if data.get("done"):
+                        break
+        except Exception:
+            self._failed()
+            raise
+        _LATENCY.observe(time.perf_counter() - started)
+        get_cache().put(prompt, self.model, full_text)
+
+    def close(self):
+        self.client.close()
@@ -0,0 +1,184 @@
+import time
+import logging
+import threading
+from collections import deque
+from llm.gemini_client import build_prompt
+from memory.context_manager import estimate_tokens
+from utils import metrics
+
+logger = logging.getLogger("LLMRouter")
+
+
+class LLMRouter:
+    """
+    Chooses which LLM backend answers each request.
+
+    A backend is anything with `name`, `model`, `max_prompt_tokens`,
+    `expected_seconds`, `available()`, `cached(context)`, `complete(context)`,
+    `stream(context)`, `warm()` and `close()` (see `GeminiBackend` and
+    `OllamaBackend`). `backends` is in order of preference.
+
+    A backend is eligible when its own health check passes, it is not
+    cooling down after `failures` consecutive errors, and the prompt fits
+    its `max_prompt_tokens`. The first eligible backend whose p95 latency
+    over its last `window` answers (from the last `max_age` seconds) is
+    within `budget_seconds` wins; with fewer than `min_samples` of them its
+    `expected_seconds` stands in, so a backend that was too slow gets tried
+    again later. If none is within budget, the eligible one with the lowest
+    p95 does. A call that fails before producing text falls over to the next
+    candidate. A cached answer from any backend is returned without a call.
+    """
+
+    def __init__(self, backends, budget_seconds=4.0, window=50, min_samples=3, max_age=300.0,
+                 failures=2, cooldown=30.0):
+        self.backends = list(backends)
+        self.budget_seconds = budget_seconds
+        self.min_samples = min_samples
+        self.max_age = max_age
+        self.failures = failures
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        self._latencies = {b.name: deque(maxlen=window) for b in self.backends}
+        self._errors = {b.name: 0 for b in self.backends}
+        self._down_until = {b.name: 0.0 for b in self.backends}
+        self._routed = {b.name: 0 for b in self.backends}
+        self.cache_hits = 0
+        self._routed_metric = {
+            b.name: metrics.counter("llm_routed_total", "Requests sent to each LLM backend", backend=b.name)
+            for b in self.backends
+        }
+        for b in self.backends:
+            metrics.gauge("llm_p95_seconds", "Recent p95 answer latency the router routes on",
+                          backend=b.name, fn=lambda b=b: self.p95(b))
+
+    def warm(self):
+        for backend in self.backends:
+            backend.warm()
+
+    def p95(self, backend):
+        oldest = time.monotonic() - self.max_age
+        with self._lock:
+            samples = sorted(seconds for at, seconds in self._latencies[backend.name] if at >= oldest)
+        if len(samples) < self.min_samples:
+            return backend.expected_seconds
+        return samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+
+    def _eligible(self, backend, prompt_tokens):
+        if prompt_tokens > backend.max_prompt_tokens:
+            return False
+        if time.monotonic() < self._down_until[backend.name]:
+            return False
+        return backend.available()
+
+    def candidates(self, context_text):
+        """Eligible backends for `context_text`, best first; raises if there are none."""
+        prompt_tokens = estimate_tokens(build_prompt(context_text))
+        eligible = [b for b in self.backends if self._eligible(b, prompt_tokens)]
+        if not eligible:
+            raise RuntimeError(f"No LLM backend available for a {prompt_tokens}-token prompt")
+        p95 = {b.name: self.p95(b) for b in eligible}
+        within = [b for b in eligible if p95[b.name] <= self.budget_seconds]
+        over = sorted((b for b in eligible if p95[b.name] > self.budget_seconds), key=lambda b: p95[b.name])
+        best = (within + over)[0]
+        logger.info(f"Routing {prompt_tokens}-token prompt to {best.name} ({best.model}, p95 {p95[best.name]:.1f}s)")
+        return within + over
+
+    def _routed_to(self, backend):
+        with self._lock:
+            self._routed[backend.name] += 1
+        self._routed_metric[backend.name].inc()
+
+    def _cached(self, context_text):
+        for backend in self.backends:
+            text = backend.cached(context_text)
+            if text is not None:
+                with self._lock:
+                    self.cache_hits += 1
+                return backend, text
+        return None, None
+
+    def _succeeded(self, backend, seconds):
+        with self._lock:
+            self._latencies[backend.name].append((time.monotonic(), seconds))
+            self._errors[backend.name] = 0
+
+    def _failed(self, backend):
+        with self._lock:
+            self._errors[backend.name] += 1
+            if self._errors[backend.name] >= self.failures:
+                self._down_until[backend.name] = time.monotonic() + self.cooldown
+                self._errors[backend.name] = 0
+                logger.warning(f"{backend.name} failed {self.failures} times in a row; not routing to it for {self.cooldown:.0f}s")
+
+    def complete(self, context_text):
+        """Returns (backend name, text)."""
+        backend, text = self._cached(context_text)
+        if text is not None:
+            return backend.name, text
+        error = None
+        for backend in self.candidates(context_text):
+            self._routed_to(backend)
+            started = time.perf_counter()
+            try:
+                text = backend.complete(context_text)
+            except Exception as e:
+                self._failed(backend)
+                error = e
+                continue
+            self._succeeded(backend, time.perf_counter() - started)
+            return backend.name, text
+        raise error
+
+    def stream(self, context_text):
+        """Returns (backend name, generator of text pieces); blocks until the first piece."""
+        backend, text = self._cached(context_text)
+        if text is not None:
+            return backend.name, self._prepend(text, iter(()))
+        error = None
+        for backend in self.candidates(context_text):
+            self._routed_to(backend)
+            chunks = self._timed(backend, context_text)
+            try:
+                first = next(chunks)
+            except StopIteration:
+                return backend.name, self._prepend("", iter(()))
+            except Exception as e:
+                error = e
+                continue
+            return backend.name, self._prepend(first, chunks)
+        raise error
+
+    @staticmethod
+    def _prepend(first, chunks):
+        # A generator either way, so callers can always close() it
+        try:
+            if first:
+                yield first
+            yield from chunks
+        finally:
+            close = getattr(chunks, "close", None)
+            if close:
+                close()
+
+    def _timed(self, backend, context_text):
+        started = time.perf_counter()
+        try:
+            yield from backend.stream(context_text)
+        except Exception:
+            self._failed(backend)
+            raise
+        # An abandoned stream (a hedge that lost) never gets here, so its time isn't counted
+        self._succeeded(backend, time.perf_counter() - started)
+
+    def close(self):
+        for backend in self.backends:
+            backend.close()
+
+    def stats(self):
+        with self._lock:
+            routed = dict(self._routed)
+        return {
+            "routed": routed,
+            "cache_hits": self.cache_hits,
+            "p95_seconds": {b.name: round(self.p95(b), 2) for b in self.backends},
+        }
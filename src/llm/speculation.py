@@ -0,0 +1,226 @@
+import re
+import time
+import logging
+import threading
+from collections import deque
+from utils import metrics
+
+logger = logging.getLogger("Speculation")
+
+_STARTED = metrics.counter("speculation_started_total", "Speculative generations started")
+_HITS = metrics.counter("speculation_hits_total", "Triggers answered from a speculative generation")
+_MISSES = {reason: metrics.counter("speculation_misses_total", "Triggers that fell back to a normal call", reason=reason)
+           for reason in ("none", "stale", "failed")}
+_SAVED = metrics.histogram("speculation_saved_seconds", "LLM latency a speculative hit saved the trigger")
+
+_SENTENCE_END = re.compile(r"[.!?]+")
+_FILLER = r"(?:(?:so|and|but|okay|ok|now|well|right|alright|then|also|um|uh),?\s+)*"
+_QUESTION_START = re.compile(
+    r"^" + _FILLER + r"(?:what|why|how|when|where|who|whose|which|can|could|would|will|should|"
+    r"do|does|did|is|are|was|were|have|has|any)\b", re.IGNORECASE)
+_REQUEST = re.compile(
+    r"\b(?:tell (?:me|us)|walk (?:me|us) through|explain|describe|give (?:me|us)|talk (?:me|us) through|"
+    r"what do you think|your (?:thoughts|take|opinion|experience)|how would you|can you|could you|"
+    r"would you|have you|do you|are you|were you)\b", re.IGNORECASE)
+_YOU = re.compile(r"\byou(?:r|rs|'ve|'re|'d|'ll)?\b", re.IGNORECASE)
+
+
+class QuestionDetector:
+    """
+    Text heuristics for "someone just asked the user something".
+
+    Looks at the sentence the newest segment ends, joined with the tail of
+    the previous segments since streaming ASR splits sentences. It fires on
+    a question mark, on a sentence opening like a question and addressing
+    "you", or on request phrasing ("tell me about", "walk us through").
+    `observe` returns "question" for a finished sentence, "partial" when
+    the sentence looks like one but has not ended yet, else None.
+    """
+
+    def __init__(self, tail_words=40):
+        self.tail_words = tail_words
+        self._tail = deque(maxlen=tail_words)
+
+    def last_sentence(self):
+        text = " ".join(self._tail)
+        parts = [p for p in _SENTENCE_END.split(text) if p.strip()]
+        if not parts:
+            return "", ""
+        # The last character tells whether that sentence is finished, and how
+        return parts[-1].strip(), text.rstrip()[-1:]
+
+    def observe(self, text):
+        self._tail.extend(text.split())
+        sentence, ended_with = self.last_sentence()
+        if not sentence:
+            return None
+        if ended_with == "?":
+            return "question"
+        if _REQUEST.search(sentence) or (_QUESTION_START.search(sentence) and _YOU.search(sentence)):
+            return "question" if ended_with in ".!" else "partial"
+        return None
+
+
+class Speculation:
+    def __init__(self, snapshot, version):
+        self.snapshot = snapshot
+        self.version = version
+        self.started = time.perf_counter()
+        self.finished = None
+        self.text = None
+        self.error = None
+        self.done = threading.Event()
+
+
+class Speculator:
+    """
+    Generates answers ahead of the trigger.
+
+    `on_segment` is the `ContextBuffer.on_add` hook: segments go through a
+    `QuestionDetector`, and once a detected question has been followed by
+    `settle` seconds without further speech (`partial_settle` if the
+    sentence has not visibly ended; capped at `max_wait`) the
+    background thread builds the prompt with `build_context()` and calls
+    `generate(snapshot)`. One generation runs at a time and the newest
+    question wins.
+
+    On trigger, `match(snapshot, version)` returns the speculated snapshot
+    instead of the fresh one when the context has changed by at most
+    `max_changes` (ContextBuffer.version steps) since it was built, and
+    `answer(snapshot)` then hands out the text, waiting for it if the
+    generation is still running.
+    """
+
+    def __init__(self, generate, build_context, version, detector=None, settle=0.6, partial_settle=1.5,
+                 max_wait=4.0, max_changes=2, max_age=120.0, keep=4):
+        self.generate = generate
+        self.build_context = build_context
+        self.version = version
+        self.detector = detector or QuestionDetector()
+        self.settle = settle
+        self.partial_settle = partial_settle
+        self.max_wait = max_wait
+        self.max_changes = max_changes
+        self.max_age = max_age
+        self._recent = deque(maxlen=keep)     # Speculation, newest last
+        self._cond = threading.Condition()
+        self._due = None
+        self._first_detected = None
+        self._running = False
+        self._thread = None
+        self.started = 0
+        self.triggers = 0
+        self.hits = 0
+        self.misses = {"none": 0, "stale": 0, "failed": 0}
+        self.saved = 0.0
+
+    def start(self):
+        self._running = True
+        self._thread = threading.Thread(target=self._worker, name="speculation", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def on_segment(self, timestamp, text):
+        now = time.monotonic()
+        with self._cond:
+            detected = self.detector.observe(text)
+            if detected:
+                if self._due is None:
+                    self._first_detected = now
+                settle = self.settle if detected == "question" else self.partial_settle
+                self._due = min(now + settle, self._first_detected + self.max_wait)
+                self._cond.notify()
+            elif self._due is not None:
+                # Still talking: wait for the question to finish, up to max_wait
+                self._due = min(now + self.settle, self._first_detected + self.max_wait)
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                while self._running and (self._due is None or self._due > time.monotonic()):
+                    self._cond.wait(None if self._due is None else self._due - time.monotonic())
+                if not self._running:
+                    return
+                self._due = None
+            try:
+                self._speculate()
+            except Exception:
+                logger.exception("Speculative generation failed")
+
+    def _speculate(self):
+        version = self.version()
+        snapshot = self.build_context()
+        if not snapshot:
+            return
+        with self._cond:
+            latest = self._recent[-1] if self._recent else None
+        if latest and latest.snapshot == snapshot:
+            return
+        speculation = Speculation(snapshot, version)
+        with self._cond:
+            self._recent.append(speculation)
+            self.started += 1
+        _STARTED.inc()
+        logger.info(f"Question detected; generating speculatively (context v{version})")
+        try:
+            speculation.text = self.generate(snapshot)
+        except Exception as e:
+            speculation.error = e
+            logger.warning(f"Speculative generation failed: {e}")
+        finally:
+            speculation.finished = time.perf_counter()
+            speculation.done.set()
+
+    def match(self, snapshot, version):
+        """The snapshot a trigger should answer: the newest speculation's if still fresh, else `snapshot`."""
+        with self._cond:
+            self.triggers += 1
+            speculation = self._recent[-1] if self._recent else None
+            if speculation is None or time.perf_counter() - speculation.started > self.max_age:
+                self.misses["none"] += 1
+                _MISSES["none"].inc()
+                return snapshot
+            if speculation.error is not None or (speculation.done.is_set() and not speculation.text):
+                self.misses["failed"] += 1
+                _MISSES["failed"].inc()
+                return snapshot
+            if version - speculation.version > self.max_changes:
+                self.misses["stale"] += 1
+                _MISSES["stale"].inc()
+                return snapshot
+            self.hits += 1
+            now = time.perf_counter()
+            # A finished answer saves the whole call; one in flight saves its head start
+            saved = (speculation.finished or now) - speculation.started
+            self.saved += saved
+        _HITS.inc()
+        _SAVED.observe(saved)
+        logger.info(f"Speculative hit: {version - speculation.version} change(s) since, saves {saved:.2f}s")
+        return speculation.snapshot
+
+    def answer(self, snapshot, timeout=None):
+        """Text generated for `snapshot`, waiting for it if still running; None if there is none."""
+        with self._cond:
+            speculation = next((s for s in reversed(self._recent) if s.snapshot == snapshot), None)
+        if speculation is None or not speculation.done.wait(timeout):
+            return None
+        return speculation.text
+
+    def stats(self):
+        with self._cond:
+            return {
+                "started": self.started,
+                "triggers": self.triggers,
+                "hits": self.hits,
+                "hit_rate": self.hits / self.triggers if self.triggers else 0.0,
+                "misses": dict(self.misses),
+                "saved_seconds": self.saved,
+                "avg_saved_seconds": self.saved / self.hits if self.hits else 0.0,
+            }
@@ -0,0 +1,102 @@
+import sys
+import time
+import logging
+
+logger = logging.getLogger("StreamSinks")
+
+
+class ConsoleSink:
+    def start(self):
+        print("\nAI RESPONSE:")
+
+    def write(self, text, full_text):
+        sys.stdout.write(text)
+        sys.stdout.flush()
+
+    def close(self, full_text, timestamp):
+        print()
+
+
+class SupabaseSink:
+    """Pushes the growing response to the session row, at most every `min_interval` seconds.
+
+    `publisher` is a `SupabasePublisher`; updates are queued, never sent from the streaming thread.
+    """
+
+    def __init__(self, publisher, session_id, min_interval=0.5):
+        self.publisher = publisher
+        self.session_id = session_id
+        self.min_interval = min_interval
+        self._last = 0.0
+
+    def _update(self, response, timestamp):
+        self.publisher.publish_response(self.session_id, response, timestamp)
+
+    def start(self):
+        self._last = 0.0
+
+    def write(self, text, full_text):
+        now = time.monotonic()
+        if now - self._last >= self.min_interval:
+            self._last = now
+            self._update(full_text, time.strftime("%Y-%m-%d %H:%M:%S", time.localtime()))
+
+    def close(self, full_text, timestamp):
+        self._update(full_text, timestamp)
+
+
+class CallbackSink:
+    """Forwards each piece to `callback(text, full_text)`, e.g. a WebSocket publisher."""
+
+    def __init__(self, callback, on_close=None):
+        self.callback = callback
+        self.on_close = on_close
+
+    def start(self):
+        pass
+
+    def write(self, text, full_text):
+        self.callback(text, full_text)
+
+    def close(self, full_text, timestamp):
+        if self.on_close:
+            self.on_close(full_text, timestamp)
+
+
+def stream_to_sinks(chunks, sinks):
+    """
+    Drain a text-chunk iterator into every sink as pieces arrive.
+
+    Returns the full text and timings: time to first token, time to last
+    token and the number of chunks.
+    """
+    started = time.perf_counter()
+    first = None
+    full_text = ""
+    count = 0
+    for sink in sinks:
+        sink.start()
+
+    for text in chunks:
+        if first is None:
+            first = time.perf_counter() - started
+        full_text += text
+        count += 1
+        for sink in sinks:
+            try:
+                sink.write(text, full_text)
+            except Exception as e:
+                logger.error(f"Stream sink {type(sink).__name__} failed: {e}")
+
+    timing = {
+        "ttft": first if first is not None else 0.0,
+        "ttlt": time.perf_counter() - started,
+        "chunks": count,
+    }
+    timestamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime())
+    for sink in sinks:
+        try:
+            sink.close(full_text, timestamp)
+        except Exception as e:
+            logger.error(f"Stream sink {type(sink).__name__} failed: {e}")
+    return full_text, timing
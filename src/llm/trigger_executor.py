@@ -0,0 +1,211 @@
+import time
+import itertools
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from utils import metrics
+
+logger = logging.getLogger("TriggerExecutor")
+
+_TOTAL = metrics.histogram("trigger_seconds", "Trigger submitted to response handled")
+_FAILURES = metrics.counter("trigger_failures_total", "Triggers that failed after retries")
+_HEDGED = metrics.counter("trigger_hedged_total", "Triggers that started a hedged attempt")
+
+
+class Superseded(Exception):
+    pass
+
+
+class DeadlineExceeded(TimeoutError):
+    pass
+
+
+class Attempt:
+    """One network call for a request; hedged duplicates are separate attempts."""
+
+    def __init__(self, request, number):
+        self.request = request
+        self.number = number
+        self.round = request.round       # retry round it was started in; earlier rounds can't win
+
+    def should_stop(self) -> bool:
+        request = self.request
+        return (request.cancelled.is_set() or request.remaining() <= 0 or self.round != request.round
+                or request.winner not in (None, self.number))
+
+    def claim(self) -> bool:
+        """Become the attempt whose output is shown; False if another attempt got there first."""
+        with self.request.lock:
+            if self.request.cancelled.is_set() or self.round != self.request.round:
+                return False
+            if self.request.winner is None:
+                self.request.winner = self.number
+            return self.request.winner == self.number
+
+
+class LLMRequest:
+    def __init__(self, request_id, snapshot, deadline):
+        self.id = request_id
+        self.snapshot = snapshot
+        self.submitted = time.perf_counter()
+        self.deadline = self.submitted + deadline
+        self.cancelled = threading.Event()
+        self.done = threading.Event()
+        self.lock = threading.Lock()
+        self.winner = None
+        self.round = 0
+        self.result = None
+        self.error = None
+        self.provider = None
+        self.timing = {"attempts": 0, "hedged": False}
+
+    def remaining(self):
+        return self.deadline - time.perf_counter()
+
+    def cancel(self):
+        self.cancelled.set()
+
+
+class TriggerExecutor:
+    """
+    Runs LLM triggers off the control loop.
+
+    `submit` returns immediately. Each request gets a deadline; failed calls
+    are retried with exponential backoff while time remains, and if an
+    attempt is still running after `hedge_after` seconds a duplicate is
+    started and whichever answers first wins. A retry starts a new round:
+    attempts left over from an earlier round can no longer claim. A newer
+    submit supersedes the in-flight request: it is cancelled, gives up its
+    worker within `poll_interval` and its result is discarded.
+
+    `call(snapshot, attempt)` does the network work and returns the text; it
+    should poll `attempt.should_stop()` and call `attempt.claim()` before
+    producing visible output. `on_result(request)` does post-processing.
+    Timings for queueing, the network call and post-processing are recorded
+    in `request.timing`.
+    """
+
+    def __init__(self, call, on_result, on_error=None, deadline=30.0, retries=2,
+                 backoff=0.5, hedge_after=5.0, max_attempts_in_flight=4, poll_interval=0.1):
+        self.call = call
+        self.on_result = on_result
+        self.on_error = on_error
+        self.deadline = deadline
+        self.retries = retries
+        self.backoff = backoff
+        self.hedge_after = hedge_after
+        self.poll_interval = poll_interval
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._current = None
+        self._requests = ThreadPoolExecutor(max_workers=2, thread_name_prefix="trigger")
+        self._attempts = ThreadPoolExecutor(max_workers=max_attempts_in_flight, thread_name_prefix="llm-attempt")
+
+    def submit(self, snapshot) -> LLMRequest:
+        request = LLMRequest(next(self._ids), snapshot, self.deadline)
+        with self._lock:
+            if self._current and not self._current.done.is_set():
+                logger.info(f"Request #{self._current.id} superseded by #{request.id}")
+                self._current.cancel()
+            self._current = request
+        self._requests.submit(self._run, request)
+        return request
+
+    def _run(self, request):
+        started = time.perf_counter()
+        request.timing["queue"] = started - request.submitted
+        try:
+            if request.cancelled.is_set():
+                raise Superseded()
+            request.result = self._call_with_retries(request)
+            request.timing["network"] = time.perf_counter() - started
+            if request.cancelled.is_set():
+                raise Superseded()
+
+            post_started = time.perf_counter()
+            self.on_result(request)
+            request.timing["post"] = time.perf_counter() - post_started
+            request.timing["total"] = time.perf_counter() - request.submitted
+            _TOTAL.observe(request.timing["total"])
+            logger.info(f"Request #{request.id} timing: {request.timing}")
+        except Superseded:
+            logger.info(f"Request #{request.id} discarded (superseded)")
+        except Exception as e:
+            request.error = e
+            _FAILURES.inc()
+            logger.error(f"Request #{request.id} failed: {e}")
+            if self.on_error:
+                self.on_error(request, e)
+        finally:
+            request.done.set()
+
+    def _call_with_retries(self, request):
+        for retry in range(self.retries + 1):
+            if request.cancelled.is_set():
+                raise Superseded()
+            if request.remaining() <= 0:
+                raise DeadlineExceeded(f"Request #{request.id} missed its {self.deadline:.0f}s deadline")
+            try:
+                return self._hedged_call(request)
+            except (Superseded, DeadlineExceeded):
+                raise
+            except Exception as e:
+                if retry == self.retries:
+                    raise
+                delay = min(self.backoff * (2 ** retry), max(0.0, request.remaining()))
+                logger.warning(f"Request #{request.id} attempt failed ({e}); retrying in {delay:.1f}s")
+                with request.lock:
+                    # Attempts still running from this round may not claim the next one
+                    request.round += 1
+                    request.winner = None
+                if request.cancelled.wait(delay):
+                    raise Superseded()
+
+    def _start_attempt(self, request, attempts):
+        request.timing["attempts"] += 1
+        attempt = Attempt(request, request.timing["attempts"])
+        future = self._attempts.submit(self.call, request.snapshot, attempt)
+        attempts[future] = attempt
+        return future
+
+    def _hedged_call(self, request):
+        started = time.perf_counter()
+        attempts = {}
+        pending = {self._start_attempt(request, attempts)}
+        hedged = False
+        error = None
+        while pending:
+            remaining = request.remaining()
+            if remaining <= 0:
+                raise DeadlineExceeded(f"Request #{request.id} missed its {self.deadline:.0f}s deadline")
+            # Short slices, so a superseded request frees its worker promptly
+            done, pending = wait(pending, timeout=min(remaining, self.poll_interval), return_when=FIRST_COMPLETED)
+
+            for future in done:
+                if future.exception() is not None:
+                    error = future.exception()
+                    continue
+                # A losing attempt returns early with partial output; only the winner counts
+                if attempts[future].claim():
+                    return future.result()
+
+            if request.cancelled.is_set():
+                raise Superseded()
+            slow = time.perf_counter() - started >= self.hedge_after
+            if slow and not hedged and request.winner is None:
+                # Slow and no output yet: race a duplicate against it
+                hedged = True
+                request.timing["hedged"] = True
+                _HEDGED.inc()
+                logger.info(f"Request #{request.id} hedging after {self.hedge_after:.1f}s")
+                pending.add(self._start_attempt(request, attempts))
+        if request.cancelled.is_set():
+            raise Superseded()
+        raise error or RuntimeError(f"Request #{request.id}: no attempt succeeded")
+
+    def shutdown(self):
+        with self._lock:
+            if self._current:
+                self._current.cancel()
+        self._requests.shutdown(wait=False, cancel_futures=True)
+        self._attempts.shutdown(wait=False, cancel_futures=True)
@@ -1,9 +1,12 @@
 import pyaudiowpatch as pyaudio
-import wave
 import keyboard
 import random
 import re
-from faster_whisper import WhisperModel
+import queue
+import threading
+from asr.whisper_asr import WhisperASR
+from asr.autotune import load_choice
+from audio.recorder import SegmentRecorder
 from pathlib import Path
 from google import genai
 import os
@@ -18,6 +21,9 @@ Path("outputs").mkdir(exist_ok=True)
 
 num = str(random.randint(0, 100))
 
+SEGMENT_SECONDS = 300         # finished segments are transcribed while recording continues
+COMPRESS = "flac"             # None keeps WAV segments; FLAC needs soundfile (WAV with a warning without it)
+
 def clean_llm_output(text: str) -> str:
     if not text:
         return ""
@@ -39,14 +45,24 @@ def clean_llm_output(text: str) -> str:
 
     return text
 
-def record():
+def record(on_segment=None):
     chunk_size = 512
     dev_format = pyaudio.paInt16
     channels = 2
     p = pyaudio.PyAudio()
     device_index = 13
     sample_rate = int(p.get_device_info_by_index(device_index)['defaultSampleRate'])
-    frames = []
+    # Written to disk as it arrives, so memory stays flat however long the meeting
+    recorder = SegmentRecorder(
+        "recordings",
+        "test_audio" + num,
+        sample_rate,
+        channels=channels,
+        sample_width=p.get_sample_size(dev_format),
+        segment_seconds=SEGMENT_SECONDS,
+        compress=COMPRESS,
+        on_segment=on_segment
+    ).start()
     stream = p.open(format=dev_format,
                     channels=channels,
                     rate=sample_rate,
@@ -56,32 +72,31 @@ def record():
     print("Start recording...")
     while True:
         data = stream.read(chunk_size, exception_on_overflow=False)
-        frames.append(data)
+        recorder.write(data)
         if keyboard.is_pressed('esc'):
             break
-    if not frames:
-        print("No frames recorded.")
-        return
     print("Recording stopped.")
     stream.stop_stream()
     stream.close()
     p.terminate()
-    filename = "recordings/test_audio" + num + ".wav"
-    wf = wave.open(filename, 'wb')
-    wf.setnchannels(channels)
-    wf.setsampwidth(p.get_sample_size(dev_format))
-    wf.setframerate(sample_rate)
-    wf.writeframes(b''.join(frames))
-    wf.close()
-
-def transcribe():
-    model_size = "base"
-    model = WhisperModel(model_size)
-    file = "recordings/test_audio" + num + ".wav"
-    segments, info = model.transcribe(file)
+    segments = recorder.stop()
+    if not segments:
+        print("No frames recorded.")
+    print(f"Recorder stats: {recorder.stats()}")
+    return segments
+
+def transcribe(segments):
+    """Transcribe recorded segments as they are handed over, until None."""
+    # Same model as the live assistant: the configuration calibrated for this machine, if any
+    config = load_choice(".cache/asr_tuning.json") or {"model_size": "base", "compute_type": "int8"}
+    asr = WhisperASR(**config)
     with open("transcriptions/test_audio" + num + ".txt", "w") as f:
-        for segment in segments:
-            f.write(segment.text + "\n")
+        for file in iter(segments.get, None):
+            parts, info = asr.model.transcribe(file, language="en", beam_size=asr.beam_size, vad_filter=True)
+            for part in parts:
+                f.write(part.text + "\n")
+            f.flush()
+            print(f"Transcribed {os.path.basename(file)}")
     print("Transcription completed.")
 
 def fetch_result():
@@ -108,6 +123,13 @@ def fetch_result():
         json.dump(clean_llm_output(response.text), f, ensure_ascii=False)   
     print("Result fetched.")
 
-record()
-transcribe()
+finished = queue.Queue()
+transcriber = threading.Thread(target=transcribe, args=(finished,))
+transcriber.start()
+try:
+    record(on_segment=lambda path, start, duration: finished.put(path))
+finally:
+    # Even if recording failed, so the transcriber thread ends and the process can exit
+    finished.put(None)
+    transcriber.join()
 fetch_result()
@@ -1,6 +1,6 @@
 import time
 import json
-import keyboard
+import asyncio
 import threading
 import random
 import logging
@@ -8,6 +8,11 @@ import sys
 import os
 from dotenv import load_dotenv
 
+try:
+    import keyboard
+except ImportError:  # triggers then come from stdin (Enter)
+    keyboard = None
+
 # Load env vars
 load_dotenv()
 
@@ -16,14 +21,70 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from audio.audio_stream import AudioStream
 from asr.whisper_asr import WhisperASR
-from memory.context_manager import ContextBuffer
-from llm.gemini_client import ask_gemini
+from asr.transcriber import Transcriber
+from asr.asr_process import ProcessASR
+from asr.autotune import BackgroundASR, load_choice, tuned_config
+from memory.context_manager import ContextBuffer, estimate_tokens
+from memory.summary_memory import SummaryMemory
+from memory.vector_index import VectorIndex
+from memory.session_store import SessionStore
+from llm.gemini_client import GeminiBackend, configure_cache, summarize_gemini
+from llm.ollama_client import OllamaBackend
+from llm.router import LLMRouter
+from llm.stream_sinks import ConsoleSink, SupabaseSink, CallbackSink, stream_to_sinks
+from llm.trigger_executor import TriggerExecutor
+from llm.speculation import Speculator
+from utils.supabase_publisher import SupabasePublisher
+from utils import metrics
+from orchestrator import Orchestrator
 
 # Supabase Client
-from supabase import create_client, Client
+from supabase import create_client
 
 # Configuration
 WINDOW_SECONDS = 60
+CONTEXT_MAX_TOKENS = None     # optional cap on the prompt context on top of the time window
+SUMMARY_MEMORY = True         # keep condensed summaries of everything older than the window
+PROMPT_TOKEN_BUDGET = 2000    # recent window + summaries sent on trigger
+VECTOR_INDEX = True           # embed the full transcript and retrieve relevant older passages on trigger
+RETRIEVAL_TOP_K = 3
+RETRIEVAL_QUERY_WORDS = 50    # the tail of the window used as the search query
+STREAMING_ASR = True          # rolling-window transcription with committed-prefix output
+STREAM_STEP_SECONDS = 1.0
+STREAM_MAX_WINDOW_SECONDS = 15.0
+VAD_GATE = True               # skip Whisper entirely on silence
+ASR_PROCESS = False           # host Whisper in its own process: restartable, isolated from capture; jitter: see bench_asr_process
+ASR_CONFIG = {"model_size": "base", "compute_type": "int8"}   # used when not auto-tuned
+ASR_AUTOTUNE = True           # first run: pick model, compute type, threads and beam for this machine
+ASR_CALIBRATION_CLIP = "calibration/reference.wav"   # speech to calibrate on; a .txt beside it is the reference
+ASR_TARGET_RTF = 0.3          # Whisper seconds per audio second, at most
+ASR_TARGET_LATENCY_SECONDS = 1.0   # p95 of one 5 s call, at most
+ASR_TUNING_PATH = ".cache/asr_tuning.json"      # per-machine choice; delete to recalibrate
+STREAM_LLM = True             # show the answer token by token as the model generates it
+LLM_DEADLINE_SECONDS = 30.0
+LLM_RETRIES = 2
+LLM_HEDGE_AFTER_SECONDS = 5.0 # start a duplicate call if no token has arrived by then
+SPECULATE = True              # start generating when a question is detected, before ESC
+SPECULATION_SETTLE_SECONDS = 0.6   # quiet time after a question before generating
+SPECULATION_MAX_CHANGES = 2   # ESC reuses the answer if the context moved at most this many versions
+LOCAL_LLM = False             # also route to a local Ollama model when it answers within the budget
+OLLAMA_MODEL = "llama3.2:3b"
+OLLAMA_HOST = "http://127.0.0.1:11434"
+OLLAMA_KEEP_ALIVE = "30m"     # keep the model loaded between triggers
+OLLAMA_MAX_PROMPT_TOKENS = 3000    # larger prompts go to Gemini
+LLM_LATENCY_BUDGET_SECONDS = 4.0   # prefer local while its recent p95 is within this
+LLM_CACHE = True              # reuse answers for an unchanged context (False bypasses the cache)
+LLM_CACHE_TTL_SECONDS = 600
+LLM_CACHE_PATH = ".cache/llm_responses.json"   # None keeps the cache in memory only
+SESSION_STORE_PATH = ".data/sessions.db"       # every trigger result, queryable; None disables
+SESSION_STORE_FSYNC = "normal"                 # "off", "normal" or "full"
+PUBLISH_TRANSCRIPT = False    # website mode: also insert transcript text into a `transcripts` table
+TRANSCRIPT_PUBLISH_SECONDS = 1.0
+WEBSOCKET_HOST = "0.0.0.0"    # paired devices on the network connect here; "127.0.0.1" keeps it local
+WEBSOCKET_PORT = 8001         # website mode: also push transcripts and answers over live.api's WebSocket; None disables
+METRICS_PORT = None           # e.g. 9100 to serve /metrics from this process
+METRICS_SUMMARY_SECONDS = None   # e.g. 60 to log a metrics summary periodically
+OUTPUT_FILES = True           # also write outputs/response_*.json (what server.py's /latest-response serves)
 
 # Logging Setup
 logging.basicConfig(
@@ -36,11 +97,6 @@ logging.basicConfig(
 )
 logger = logging.getLogger("Main")
 
-running = True
-website_mode = False
-supabase: Client = None
-pairing_code = None
-
 def init_supabase():
     url = os.environ.get("VITE_SUPABASE_URL")
     key = os.environ.get("VITE_SUPABASE_KEY")
@@ -54,155 +110,393 @@ def init_supabase():
         logger.error(f"Failed to init Supabase: {e}")
         return None
 
-def transcription_worker(audio_stream, asr, context_buffer):
-    import numpy as np
-    buffer = []
-    buffer_duration = 0.0
-    
-    logger.info("Transcription worker started.")
-    
-    while running:
+def retrieve_earlier(index, snapshot):
+    """Older passages relevant to the end of the current window, formatted for the prompt."""
+    query = " ".join(snapshot.split()[-RETRIEVAL_QUERY_WORDS:])
+    started = time.perf_counter()
+    hits = index.search(query, k=RETRIEVAL_TOP_K, before=time.time() - WINDOW_SECONDS)
+    logger.info(f"Retrieved {len(hits)} passages in {(time.perf_counter() - started) * 1000:.1f} ms")
+    if not hits:
+        return ""
+    # Chronological order reads more naturally than score order
+    lines = [f"- [{time.strftime('%H:%M', time.localtime(ts))}] {text}" for _, ts, text in sorted(hits, key=lambda h: h[1])]
+    return "Possibly relevant earlier discussion:\n" + "\n".join(lines) + "\n\n"
+
+def build_prompt_context(context_buffer, memory=None, index=None):
+    """What a trigger sends: retrieved passages, summaries and the recent window; None if nothing was said."""
+    snapshot = context_buffer.get_snapshot()
+    if not snapshot.strip():
+        return None
+    budget = PROMPT_TOKEN_BUDGET
+    retrieved = retrieve_earlier(index, snapshot) if index else ""
+    if retrieved:
+        budget -= estimate_tokens(retrieved)
+    if memory:
+        snapshot = memory.render(snapshot, budget)
+    return retrieved + snapshot
+
+class Assistant:
+    """
+    Everything downstream of the transcript: the context window and its
+    memories, triggers, speculation and where answers go. The orchestrator
+    calls `on_transcript` and `trigger` from its event loop; both only hand
+    work off.
+    """
+
+    def __init__(self, context_buffer, memory=None, index=None, session_store=None,
+                 publisher=None, pairing_code=None, website_mode=False, router=None, events=None):
+        self.context_buffer = context_buffer
+        self.router = router or LLMRouter([GeminiBackend()], budget_seconds=LLM_LATENCY_BUDGET_SECONDS)
+        self.memory = memory
+        self.index = index
+        self.session_store = session_store
+        self.publisher = publisher
+        self.pairing_code = pairing_code
+        self.website_mode = website_mode
+        self.events = events          # live.api when it runs in this process: publishes to WebSocket clients
+        self.executor = TriggerExecutor(
+            self.generate_response,
+            self.handle_response,
+            on_error=self.handle_error,
+            deadline=LLM_DEADLINE_SECONDS,
+            retries=LLM_RETRIES,
+            hedge_after=LLM_HEDGE_AFTER_SECONDS
+        )
+        self.speculator = None
+        self._speculated = {}         # snapshot -> provider of its speculative answer
+        if SPECULATE:
+            self.speculator = Speculator(
+                self.speculate,
+                self.prompt_context,
+                lambda: context_buffer.version,
+                settle=SPECULATION_SETTLE_SECONDS,
+                max_changes=SPECULATION_MAX_CHANGES
+            ).start()
+            context_buffer.on_add = self.speculator.on_segment
+
+    # LLM calls, each returning (provider, answer); the replay benchmark overrides these with a stub
+
+    def ask(self, snapshot):
+        return self.router.complete(snapshot)
+
+    def ask_stream(self, snapshot):
+        return self.router.stream(snapshot)
+
+    def speculate(self, snapshot):
+        provider, text = self.ask(snapshot)
+        self._speculated[snapshot] = provider
+        while len(self._speculated) > 8:
+            self._speculated.pop(next(iter(self._speculated)))
+        return text
+
+    def prompt_context(self):
+        return build_prompt_context(self.context_buffer, self.memory, self.index)
+
+    def on_transcript(self, text):
+        print(f"📝 Transcribed: {text}")
+        now = time.time()
+        self.context_buffer.add_segment(text, now)
+        if self.publisher and PUBLISH_TRANSCRIPT:
+            self.publisher.publish_transcript(self.pairing_code, text)
+        if self.events:
+            self.events.publish_transcript(text, session=self.pairing_code)
+        if self.index:
+            self.index.add(text, now)
+
+    def trigger(self):
+        snapshot = self.prompt_context()
+        if snapshot is None:
+            print("Buffer empty, nothing to send.")
+            return None
+        if self.speculator:
+            snapshot = self.speculator.match(snapshot, self.context_buffer.version)
+        request = self.executor.submit(snapshot)
+        print(f"\nTriggered! Generating response (request #{request.id})...")
+        return request
+
+    def response_sinks(self, request):
+        sinks = [ConsoleSink()]
+        if self.website_mode and self.publisher:
+            sinks.append(SupabaseSink(self.publisher, self.pairing_code))
+        if self.events:
+            session = self.pairing_code
+            sinks.append(CallbackSink(
+                lambda text, full_text: self.events.publish_llm_partial(request.id, full_text, session=session),
+                on_close=lambda full_text, timestamp: self.events.send_message_sync(full_text, timestamp, session=session)
+            ))
+        return sinks
+
+    def generate_response(self, snapshot, attempt):
+        """Network half of a trigger; runs on the executor for each (possibly hedged) attempt."""
+        request = attempt.request
+        if self.speculator:
+            # Waits if the speculative call for this snapshot is still running; it is ahead of a new one
+            text = self.speculator.answer(snapshot, timeout=max(0.0, request.remaining()))
+            if text:
+                if not attempt.claim():
+                    return None
+                request.timing["speculative"] = True
+                request.provider = self._speculated.get(snapshot)
+                if STREAM_LLM:
+                    stream_to_sinks(iter([text]), self.response_sinks(request))
+                return text
+
+        if not STREAM_LLM:
+            provider, text = self.ask(snapshot)
+            if not attempt.claim():
+                return None
+            request.provider = provider
+            return text
+
+        started = time.perf_counter()
+        provider, chunks = self.ask_stream(snapshot)
+        first = next(chunks, "")
+        # Whichever attempt produces a token first owns the console and the sinks
+        if attempt.should_stop() or not attempt.claim():
+            chunks.close()
+            return None
+        request.provider = provider
+        request.timing["ttft"] = time.perf_counter() - started
+
+        def until_stopped():
+            yield first
+            for text in chunks:
+                if attempt.should_stop():
+                    chunks.close()
+                    return
+                yield text
+
+        ai_response, _ = stream_to_sinks(until_stopped(), self.response_sinks(request))
+        request.timing["ttlt"] = time.perf_counter() - started
+        return ai_response
+
+    def handle_response(self, request):
+        """Post-processing half of a trigger: save the response and publish it."""
+        ai_response = request.result
+        timestamp_str = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime())
+
+        output = {
+            "timestamp": timestamp_str,
+            "window_seconds": WINDOW_SECONDS,
+            "context": request.snapshot,
+            "response": ai_response,
+            "provider": request.provider,
+            "timing": dict(request.timing)
+        }
+
+        filename = None
+        if OUTPUT_FILES:
+            file_ts = time.strftime("%Y%m%d_%H%M%S", time.gmtime())
+            random_suffix = random.randint(1000, 9999)
+            filename = f"outputs/response_{file_ts}_{random_suffix}.json"
+
+        if self.session_store:
+            # Queued; the store's writer thread commits in batches. The file name as source
+            # keeps a later `session_store.py import outputs/` from adding this row again.
+            self.session_store.add({**output, "ts": time.time(), "session": self.pairing_code,
+                                    "source": os.path.basename(filename) if filename else None})
+
+        if not STREAM_LLM:
+            print(f"\nAI RESPONSE:\n{ai_response}")
+
+        if filename:
+            # Write then rename, so the server's output watcher never sees a half-written file
+            with open(filename + ".tmp", "w", encoding="utf-8") as f:
+                json.dump(output, f, indent=2, ensure_ascii=False)
+            os.replace(filename + ".tmp", filename)
+            print(f"\nSaved to {filename}")
+
+        if self.website_mode and self.publisher and not STREAM_LLM:
+            # Queued; the publisher retries in the background if the network is flaky
+            self.publisher.publish_response(self.pairing_code, ai_response, timestamp_str)
+        if self.events and not STREAM_LLM:
+            self.events.send_message_sync(ai_response, timestamp_str, session=self.pairing_code)
+
+    def handle_error(self, request, error):
+        print(f"\nError: {error}")
+
+    def stop(self):
+        self.executor.shutdown()
+        if self.speculator:
+            self.speculator.stop()
+            logger.info(f"Speculation stats: {self.speculator.stats()}")
+        logger.info(f"LLM routing stats: {self.router.stats()}")
+        self.router.close()
+
+def register_triggers(orchestrator):
+    """ESC triggers through the keyboard hook; without it (not installed, Linux without root) Enter on stdin does."""
+    if keyboard is not None:
         try:
-            chunk = audio_stream.get_chunk()
-            if chunk is not None:
-                # Calculate RMS to check for silence
-                rms = np.sqrt(np.mean(chunk**2))
-                
-                buffer.append(chunk)
-                buffer_duration += len(chunk) / audio_stream.target_rate
-                
-                # Process when we have ~1 second of audio
-                if buffer_duration >= 1.0:
-                    full_audio = np.concatenate(buffer)
-                    texts = asr.transcribe(full_audio)
-                    for text in texts:
-                        print(f"📝 Transcribed: {text}")
-                        context_buffer.add_segment(text)
-                    
-                    # Reset buffer
-                    buffer = []
-                    buffer_duration = 0.0
-            else:
-                time.sleep(0.01)
+            keyboard.add_hotkey("esc", orchestrator.trigger)
+            return "ESC"
         except Exception as e:
-            logger.error(f"Error in transcription worker: {e}")
-            time.sleep(1)
+            logger.warning(f"Keyboard hook unavailable ({e}); reading triggers from stdin")
 
-def main():
-    global running, website_mode, supabase, pairing_code
-    
-    print("\n" + "="*50)
-    print(" AI MEETING ASSISTANT ".center(50, "="))
-    print("="*50 + "\n")
+    def read_stdin():
+        for line in sys.stdin:
+            if line.strip().lower() in ("q", "quit", "exit"):
+                orchestrator.stop()
+                return
+            orchestrator.trigger()
+
+    threading.Thread(target=read_stdin, name="stdin-triggers", daemon=True).start()
+    return "Enter (q to quit)"
 
+def choose_mode():
     print("Select Mode:")
     print("1. Normal Mode (Console Output)")
     print("2. Website Mode (Supabase Realtime)")
-    
+
     while True:
         choice = input("\nEnter choice (1 or 2): ").strip()
         if choice == '1':
-            website_mode = False
-            break
+            return False
         elif choice == '2':
-            website_mode = True
-            break
+            return True
         else:
             print("Invalid choice. Please enter 1 or 2.")
 
+def start_website_session():
+    """Create the pairing session; returns (pairing_code, publisher), or (None, None) to fall back to normal mode."""
+    supabase = init_supabase()
+    if not supabase:
+        print("Falling back to Normal Mode due to Supabase error.")
+        return None, None
+
+    # Generate Pairing Code
+    pairing_code = str(random.randint(1000, 9999))
+
+    # Create session in DB
+    try:
+        # Upsert session
+        data = {
+            "id": pairing_code,
+            "response": "Waiting for AI...",
+            "timestamp": time.strftime("%H:%M:%S")
+        }
+        supabase.table("sessions").upsert(data).execute()
+        publisher = SupabasePublisher(
+            os.environ["VITE_SUPABASE_URL"],
+            os.environ["VITE_SUPABASE_KEY"],
+            transcript_interval=TRANSCRIPT_PUBLISH_SECONDS
+        ).start()
+
+        print("\n" + "*"*50)
+        print(f" WEBSITE MODE ACTIVE ".center(50, "*"))
+        print(f" PAIRING CODE: {pairing_code} ".center(50, " "))
+        print(f" Open your Vercel App and enter this code. ".center(50, " "))
+        print("*"*50 + "\n")
+        return pairing_code, publisher
+
+    except Exception as e:
+        logger.error(f"Supabase Error: {e}")
+        print(f"Error creating session: {e}")
+        return None, None
+
+def main():
+    print("\n" + "="*50)
+    print(" AI MEETING ASSISTANT ".center(50, "="))
+    print("="*50 + "\n")
+
+    website_mode = choose_mode()
+    pairing_code, publisher = None, None
     if website_mode:
-        supabase = init_supabase()
-        if not supabase:
-            print("Falling back to Normal Mode due to Supabase error.")
-            website_mode = False
-        else:
-            # Generate Pairing Code
-            pairing_code = str(random.randint(1000, 9999))
-            
-            # Create session in DB
-            try:
-                # Upsert session
-                data = {
-                    "id": pairing_code,
-                    "response": "Waiting for AI...",
-                    "timestamp": time.strftime("%H:%M:%S")
-                }
-                supabase.table("sessions").upsert(data).execute()
-                
-                print("\n" + "*"*50)
-                print(f" WEBSITE MODE ACTIVE ".center(50, "*"))
-                print(f" PAIRING CODE: {pairing_code} ".center(50, " "))
-                print(f" Open your Vercel App and enter this code. ".center(50, " "))
-                print("*"*50 + "\n")
-                
-            except Exception as e:
-                logger.error(f"Supabase Error: {e}")
-                print(f"Error creating session: {e}")
-                website_mode = False
+        pairing_code, publisher = start_website_session()
+        website_mode = publisher is not None
 
+    asr = None
+    assistant = None
+    events = None
+    stop_ws_server = None
+    memory = None
+    index = None
+    session_store = None
+    if METRICS_PORT:
+        metrics.serve(METRICS_PORT)
+    if METRICS_SUMMARY_SECONDS:
+        metrics.start_console_summary(METRICS_SUMMARY_SECONDS)
+    if website_mode and WEBSOCKET_PORT:
+        # Imported here so its logging setup doesn't run before ours
+        from live import api as events
+        events.set_pairing_code(pairing_code)
+        stop_ws_server = events.serve_in_thread(host=WEBSOCKET_HOST, port=WEBSOCKET_PORT)
+    llm_cache = configure_cache(enabled=LLM_CACHE, ttl_seconds=LLM_CACHE_TTL_SECONDS, path=LLM_CACHE_PATH)
     try:
         audio_stream = AudioStream()
-        asr = WhisperASR()
-        context_buffer = ContextBuffer(WINDOW_SECONDS)
-        
+
+        def make_asr(config):
+            if ASR_PROCESS:
+                return ProcessASR(**config).start()
+            return WhisperASR(**config)
+
+        asr_config = ASR_CONFIG
+        calibrate = None
+        if ASR_AUTOTUNE:
+            asr_targets = {"max_rtf": ASR_TARGET_RTF, "max_latency": ASR_TARGET_LATENCY_SECONDS, "window_seconds": 5.0}
+            tuned = load_choice(ASR_TUNING_PATH, asr_targets)
+            if tuned:
+                asr_config = tuned
+            else:
+                def calibrate():
+                    # First run: the default model serves while this measures; the tuned one replaces it
+                    config = tuned_config(
+                        ASR_CALIBRATION_CLIP,
+                        ASR_TUNING_PATH,
+                        max_rtf=ASR_TARGET_RTF,
+                        max_latency=ASR_TARGET_LATENCY_SECONDS
+                    )
+                    return make_asr(config) if config and config != asr_config else None
+        logger.info(f"ASR configuration: {asr_config}")
+
+        # Loads while capture starts; the ring holds audio until the first step can run
+        asr = BackgroundASR(lambda: make_asr(asr_config), upgrade=calibrate).start()
+        if SUMMARY_MEMORY:
+            memory = SummaryMemory(summarize_gemini).start()
+        if VECTOR_INDEX:
+            index = VectorIndex().start()
+        if SESSION_STORE_PATH:
+            session_store = SessionStore(SESSION_STORE_PATH, fsync=SESSION_STORE_FSYNC).start()
+        backends = [GeminiBackend()]
+        if LOCAL_LLM:
+            backends.insert(0, OllamaBackend(
+                model=OLLAMA_MODEL,
+                host=OLLAMA_HOST,
+                keep_alive=OLLAMA_KEEP_ALIVE,
+                max_prompt_tokens=OLLAMA_MAX_PROMPT_TOKENS
+            ))
+        router = LLMRouter(backends, budget_seconds=LLM_LATENCY_BUDGET_SECONDS)
+        router.warm()
+        context_buffer = ContextBuffer(
+            WINDOW_SECONDS,
+            max_tokens=CONTEXT_MAX_TOKENS,
+            on_evict=memory.add if memory else None
+        )
+        assistant = Assistant(
+            context_buffer,
+            memory=memory,
+            index=index,
+            session_store=session_store,
+            publisher=publisher,
+            pairing_code=pairing_code,
+            website_mode=website_mode,
+            router=router,
+            events=events
+        )
+        transcriber = Transcriber(
+            audio_stream,
+            asr,
+            streaming=STREAMING_ASR,
+            vad=VAD_GATE,
+            step_seconds=STREAM_STEP_SECONDS,
+            max_window_seconds=STREAM_MAX_WINDOW_SECONDS
+        )
+        orchestrator = Orchestrator(audio_stream, transcriber, assistant.on_transcript, assistant.trigger)
+
         print("Initializing Audio Stream...")
-        t = threading.Thread(target=transcription_worker, args=(audio_stream, asr, context_buffer))
-        t.daemon = True
-        
-        with audio_stream.start():
-            t.start()
-            print("Listening... Press ESC to trigger AI")
-            
-            while True:
-                if keyboard.is_pressed("esc"):
-                    print("\nTriggered! Generating response...")
-                    try:
-                        snapshot = context_buffer.get_snapshot()
-                        if not snapshot.strip():
-                            print("Buffer empty, nothing to send.")
-                            time.sleep(0.5)
-                            continue
-
-                        ai_response = ask_gemini(snapshot)
-                        timestamp_str = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime())
-                        
-                        # Save to file
-                        file_ts = time.strftime("%Y%m%d_%H%M%S", time.gmtime())
-                        random_suffix = random.randint(1000, 9999)
-                        filename = f"outputs/response_{file_ts}_{random_suffix}.json"
-
-                        output = {
-                            "timestamp": timestamp_str,
-                            "window_seconds": WINDOW_SECONDS,
-                            "context": snapshot,
-                            "response": ai_response,
-                            "provider": "gemini"
-                        }
-
-                        with open(filename, "w", encoding="utf-8") as f:
-                            json.dump(output, f, indent=2, ensure_ascii=False)
-
-                        print(f"\nAI RESPONSE:\n{ai_response}")
-                        print(f"\nSaved to {filename}")
-
-                        if website_mode and supabase:
-                            try:
-                                supabase.table("sessions").update({
-                                    "response": ai_response,
-                                    "timestamp": timestamp_str
-                                }).eq("id", pairing_code).execute()
-                                print("Sent to Supabase.")
-                            except Exception as e:
-                                logger.error(f"Failed to send to Supabase: {e}")
-                            
-                    except Exception as e:
-                        logger.error(f"Error during trigger: {e}")
-                        print(f"Error: {e}")
-                    
-                    # Debounce
-                    time.sleep(0.5)
-                
-                time.sleep(0.01)
+        key = register_triggers(orchestrator)
+        print(f"Listening... Press {key} to trigger AI, Ctrl+C to stop")
+        asyncio.run(orchestrator.run())
+        print("\nStopping...")
 
     except KeyboardInterrupt:
         print("\nStopping...")
@@ -210,7 +504,29 @@ def main():
         logger.critical(f"Fatal error: {e}")
         print(f"\nFatal Error: {e}")
     finally:
-        running = False
+        if keyboard is not None:
+            try:
+                keyboard.unhook_all_hotkeys()
+            except Exception:
+                pass
+        if assistant:
+            assistant.stop()
+        if memory:
+            memory.stop()
+            logger.info(f"Summary memory stats: {memory.stats()}")
+        if index:
+            index.stop()
+            logger.info(f"Vector index: {index.size} passages")
+        logger.info(f"LLM cache stats: {llm_cache.stats()}")
+        if session_store:
+            session_store.stop()
+        if stop_ws_server:
+            stop_ws_server()
+        if publisher:
+            publisher.stop()
+            logger.info(f"Supabase publisher stats: {publisher.stats()}")
+        if asr:
+            asr.stop()
         print("Exited.")
 
 if __name__ == "__main__":
@@ -1,13 +1,54 @@
 import time
 from collections import deque
 from threading import Lock
+from utils import metrics
+
+
+def estimate_tokens(text: str) -> int:
+    # ~4 characters per token for English; close enough for budgeting prompts
+    return max(1, (len(text) + 3) // 4)
+
 
 class ContextBuffer:
-    def __init__(self, window_seconds=60):
+    """
+    Rolling transcript window.
+
+    Segments live in parallel deques (timestamp, start offset, length, token
+    estimate) over a single snapshot string that is kept up to date as
+    segments are added and evicted, so `get_snapshot` is O(1) when nothing
+    has changed. Segments are evicted once older than `window_seconds`, and
+    oldest-first whenever `max_chars` or `max_tokens` is exceeded.
+
+    `on_evict`, if given, is called with a list of (timestamp, text) for the
+    segments that leave the window. It runs under the buffer lock, so it
+    should only hand them off (e.g. to a queue). `on_add(timestamp, text)`
+    is called after each new segment, outside the lock.
+    """
+
+    def __init__(self, window_seconds=60, max_chars=None, max_tokens=None, on_evict=None, on_add=None):
         self.window_seconds = window_seconds
-        self.buffer = deque()
+        self.max_chars = max_chars
+        self.max_tokens = max_tokens
+        self.on_evict = on_evict
+        self.on_add = on_add
         self.lock = Lock()
 
+        self._times = deque()
+        self._starts = deque()       # absolute character offset of each segment
+        self._lengths = deque()
+        self._tokens = deque()
+        self._snapshot = ""
+        self._origin = 0             # absolute offset of _snapshot[0]
+        self._next_start = 0
+        self.token_count = 0
+        self.version = 0             # bumped on every change; cheap "has the context moved?" check
+
+        metrics.gauge("context_segments", "Segments in the context window", fn=lambda: len(self._times))
+        metrics.gauge("context_tokens", "Estimated tokens in the context window", fn=lambda: self.token_count)
+
+    def __len__(self):
+        return len(self._times)
+
     def add_segment(self, text: str, timestamp: float = None):
         if not text:
             return
@@ -16,23 +57,64 @@ class ContextBuffer:
             timestamp = time.time()
 
         with self.lock:
-            content = {"timestamp": timestamp, "text": text}
-            self.buffer.append(content)
+            if self._snapshot:
+                self._snapshot += " " + text
+                start = self._next_start + 1
+            else:
+                self._snapshot = text
+                self._origin = start = self._next_start
+            self._next_start = start + len(text)
+
+            tokens = estimate_tokens(text)
+            self._times.append(timestamp)
+            self._starts.append(start)
+            self._lengths.append(len(text))
+            self._tokens.append(tokens)
+            self.token_count += tokens
+            self.version += 1
             self.prune()
+        if self.on_add:
+            self.on_add(timestamp, text)
+
+    def _evict_oldest(self):
+        timestamp = self._times.popleft()
+        start = self._starts.popleft() - self._origin
+        text = self._snapshot[start:start + self._lengths.popleft()]
+        self.token_count -= self._tokens.popleft()
+        return timestamp, text
 
     def prune(self):
-        now = time.time()
-        cutoff = now - self.window_seconds
-        
-        while self.buffer and self.buffer[0]["timestamp"] < cutoff:
-            self.buffer.popleft()
+        cutoff = time.time() - self.window_seconds
+        evicted = []
+        while self._times and self._times[0] < cutoff:
+            evicted.append(self._evict_oldest())
+        while self._times and (
+            (self.max_chars is not None and self._next_start - self._starts[0] > self.max_chars) or
+            (self.max_tokens is not None and self.token_count > self.max_tokens)
+        ):
+            evicted.append(self._evict_oldest())
+
+        if evicted:
+            if self._times:
+                new_origin = self._starts[0]
+                self._snapshot = self._snapshot[new_origin - self._origin:]
+                self._origin = new_origin
+            else:
+                self._snapshot = ""
+                self._origin = self._next_start
+            self.version += 1
+            if self.on_evict:
+                self.on_evict(evicted)
 
     def get_snapshot(self) -> str:
         with self.lock:
-            self.prune()
-            return " ".join(entry["text"] for entry in self.buffer)
+            if self._times and self._times[0] < time.time() - self.window_seconds:
+                self.prune()
+            return self._snapshot
 
-c = ContextBuffer()
-c.add_segment("Hello")
-c.add_segment("World")
-print(c.buffer[1])
+    def stats(self):
+        return {
+            "segments": len(self._times),
+            "chars": len(self._snapshot),
+            "tokens": self.token_count,
+        }
@@ -0,0 +1,310 @@
+"""
+Durable store for trigger results (context, response, timing) in SQLite.
+
+    python src/memory/session_store.py import outputs/
+    python src/memory/session_store.py search "rate limits" [--since 2025-12-01]
+"""
+import os
+import sys
+import json
+import time
+import queue
+import sqlite3
+import logging
+import argparse
+import calendar
+import threading
+
+logger = logging.getLogger("SessionStore")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    session TEXT,
+    provider TEXT,
+    source TEXT UNIQUE,
+    context TEXT NOT NULL DEFAULT '',
+    response TEXT NOT NULL DEFAULT '',
+    extra TEXT
+);
+CREATE INDEX IF NOT EXISTS responses_ts ON responses (ts);
+CREATE INDEX IF NOT EXISTS responses_session_ts ON responses (session, ts);
+CREATE INDEX IF NOT EXISTS responses_provider_ts ON responses (provider, ts);
+"""
+
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS responses_fts USING fts5(
+    context, response, content='responses', content_rowid='id'
+);
+CREATE TRIGGER IF NOT EXISTS responses_fts_insert AFTER INSERT ON responses BEGIN
+    INSERT INTO responses_fts (rowid, context, response) VALUES (new.id, new.context, new.response);
+END;
+CREATE TRIGGER IF NOT EXISTS responses_fts_delete AFTER DELETE ON responses BEGIN
+    INSERT INTO responses_fts (responses_fts, rowid, context, response)
+    VALUES ('delete', old.id, old.context, old.response);
+END;
+"""
+
+_COLUMNS = ("ts", "session", "provider", "source", "context", "response", "extra")
+_SYNC_MODES = {"off": "OFF", "normal": "NORMAL", "full": "FULL"}
+
+
+def parse_timestamp(value):
+    """Epoch seconds from the formats outputs/ has used (ISO UTC and local "%Y-%m-%d %H:%M:%S")."""
+    if isinstance(value, (int, float)):
+        return float(value)
+    for fmt, utc in (("%Y-%m-%dT%H:%M:%SZ", True), ("%Y-%m-%d %H:%M:%S", False), ("%Y-%m-%d", False)):
+        try:
+            parsed = time.strptime(value, fmt)
+        except (TypeError, ValueError):
+            continue
+        return float(calendar.timegm(parsed) if utc else time.mktime(parsed))
+    return None
+
+
+class SessionStore:
+    """
+    Append-mostly SQLite store for trigger results.
+
+    `add` only queues the record; a writer thread commits whatever has
+    queued up (up to `batch_size`, or after `flush_interval` seconds) in one
+    transaction. `fsync` picks SQLite's synchronous level in WAL mode:
+    "off" leaves flushing to the OS, "normal" (default) syncs at
+    checkpoints and can lose the last transactions on power loss but never
+    corrupts, "full" syncs every commit.
+
+    Queries use their own connection, so they don't wait on the writer.
+    Full-text search uses FTS5 when SQLite has it and falls back to LIKE.
+    """
+
+    def __init__(self, path=".data/sessions.db", batch_size=64, flush_interval=1.0, fsync="normal"):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.fsync = _SYNC_MODES[fsync]
+        self._queue = queue.Queue()
+        self._thread = None
+        self._read = None
+        self._read_lock = threading.Lock()
+        self.fts = False
+        self.written = 0
+        self.batches = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.executescript(_SCHEMA)
+            try:
+                conn.executescript(_FTS_SCHEMA)
+                self.fts = True
+            except sqlite3.OperationalError as e:
+                logger.warning(f"FTS5 unavailable, text search falls back to LIKE: {e}")
+        finally:
+            conn.close()
+        self._read = self._connect(check_same_thread=False)
+
+    def _connect(self, **kwargs):
+        conn = sqlite3.connect(self.path, **kwargs)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(f"PRAGMA synchronous={self.fsync}")
+        return conn
+
+    def start(self):
+        self._thread = threading.Thread(target=self._writer, name="session-store", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._thread:
+            self._queue.put(None)
+            self._thread.join(timeout=10)
+            self._thread = None
+        with self._read_lock:
+            self._read.close()
+
+    def add(self, record: dict):
+        """Queue one result; keys are the table's columns, anything else goes into `extra`."""
+        row = {key: record.get(key) for key in _COLUMNS}
+        extra = {k: v for k, v in record.items() if k not in _COLUMNS}
+        if extra:
+            row["extra"] = json.dumps(extra, ensure_ascii=False)
+        row["ts"] = parse_timestamp(row["ts"]) or time.time()
+        row["context"] = row["context"] or ""
+        row["response"] = row["response"] or ""
+        if self._thread is None:
+            self._write([row])
+        else:
+            self._queue.put(row)
+
+    def flush(self):
+        """Block until everything queued so far is committed."""
+        if self._thread is None:
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait()
+
+    def _write(self, rows, conn=None):
+        own = conn is None
+        conn = conn or self._connect()
+        try:
+            with conn:
+                cursor = conn.executemany(
+                    f"INSERT OR IGNORE INTO responses ({', '.join(_COLUMNS)}) "
+                    f"VALUES ({', '.join(':' + c for c in _COLUMNS)})",
+                    rows
+                )
+            self.written += max(0, cursor.rowcount)
+            self.batches += 1
+        finally:
+            if own:
+                conn.close()
+
+    def _writer(self):
+        conn = self._connect()
+        running = True
+        while running:
+            rows, waiters = [], []
+            item = self._queue.get()
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                if item is None:
+                    running = False
+                elif isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    rows.append(item)
+                if not running or waiters or len(rows) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+            if rows:
+                try:
+                    self._write(rows, conn)
+                except Exception as e:
+                    logger.error(f"Failed to write {len(rows)} records: {e}")
+            for waiter in waiters:
+                waiter.set()
+        conn.close()
+
+    def query(self, start=None, end=None, session=None, provider=None, text=None, limit=100):
+        """
+        Results newest first. `start`/`end` are epoch seconds or timestamp
+        strings (ValueError if one can't be parsed); `text` is a full-text
+        query over context and response.
+        """
+        where, params = [], []
+        source = "responses r"
+        if text:
+            if self.fts:
+                source = "responses_fts f JOIN responses r ON r.id = f.rowid"
+                where.append("responses_fts MATCH ?")
+                # Quote each word so punctuation in the query isn't read as FTS syntax
+                params.append(" ".join('"' + word.replace('"', '""') + '"' for word in text.split()))
+            else:
+                where.append("(r.context LIKE ? OR r.response LIKE ?)")
+                params += [f"%{text}%"] * 2
+        for value, op in ((start, ">="), (end, "<")):
+            if value is None:
+                continue
+            ts = parse_timestamp(value)
+            if ts is None:
+                raise ValueError(f"Unrecognised timestamp {value!r}; use YYYY-MM-DD or YYYY-MM-DD HH:MM:SS")
+            where.append(f"r.ts {op} ?")
+            params.append(ts)
+        if session is not None:
+            where.append("r.session = ?")
+            params.append(session)
+        if provider is not None:
+            where.append("r.provider = ?")
+            params.append(provider)
+
+        sql = f"SELECT r.id, {', '.join('r.' + c for c in _COLUMNS)} FROM {source}"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY r.ts DESC LIMIT ?"
+        params.append(limit)
+        with self._read_lock:
+            rows = self._read.execute(sql, params).fetchall()
+
+        results = []
+        for row in rows:
+            record = dict(zip(("id",) + _COLUMNS, row))
+            extra = record.pop("extra")
+            if extra:
+                record.update(json.loads(extra))
+            results.append(record)
+        return results
+
+    def count(self):
+        with self._read_lock:
+            return self._read.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def import_outputs(self, directory="outputs"):
+        """One-shot import of outputs/*.json; files already imported are skipped."""
+        rows = []
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if not entry.name.endswith(".json") or not entry.is_file():
+                    continue
+                try:
+                    with open(entry.path, "r", encoding="utf-8") as f:
+                        data = json.load(f)
+                except (OSError, ValueError) as e:
+                    logger.warning(f"Skipping {entry.name}: {e}")
+                    continue
+                if not isinstance(data, dict):
+                    # loop_reccord.py saves just the cleaned response text
+                    data = {"response": data if isinstance(data, str) else json.dumps(data)}
+                record = dict(data)
+                record["source"] = entry.name
+                record["ts"] = parse_timestamp(data.get("timestamp")) or entry.stat().st_mtime
+                record.pop("timestamp", None)
+                rows.append(record)
+        before = self.written
+        for record in rows:
+            self.add(record)
+        self.flush()
+        return self.written - before
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import and query saved trigger results.")
+    parser.add_argument("--db", default=".data/sessions.db")
+    commands = parser.add_subparsers(dest="command", required=True)
+    imp = commands.add_parser("import", help="import outputs/*.json")
+    imp.add_argument("directory", nargs="?", default="outputs")
+    search = commands.add_parser("search", help="full-text and time-range query")
+    search.add_argument("text", nargs="?")
+    search.add_argument("--since")
+    search.add_argument("--until")
+    search.add_argument("--session")
+    search.add_argument("--provider")
+    search.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    store = SessionStore(args.db).start()
+    try:
+        if args.command == "import":
+            started = time.perf_counter()
+            added = store.import_outputs(args.directory)
+            print(f"Imported {added} responses in {time.perf_counter() - started:.2f}s ({store.count()} stored)")
+        else:
+            try:
+                records = store.query(args.since, args.until, args.session, args.provider, args.text, args.limit)
+            except ValueError as e:
+                parser.error(str(e))
+            for record in records:
+                when = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(record["ts"]))
+                print(f"[{when}] {record['source'] or record['session'] or ''}\n  {record['response'][:200]}\n")
+    finally:
+        store.stop()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
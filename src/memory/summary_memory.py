@@ -0,0 +1,180 @@
+import re
+import logging
+import threading
+from memory.context_manager import estimate_tokens
+
+logger = logging.getLogger("SummaryMemory")
+
+_SENTENCE = re.compile(r"(?<=[.!?])\s+")
+_EARLIER = "Earlier in the meeting (condensed):\n"
+_RECENT = "\n\nMost recent:\n"
+
+
+def extractive_summary(text: str, max_tokens: int) -> str:
+    """Cheap fallback: keep evenly spaced sentences until the budget is used."""
+    sentences = [s for s in _SENTENCE.split(text.strip()) if s]
+    if estimate_tokens(text) <= max_tokens or not sentences:
+        return text.strip()[:max_tokens * 4]
+    kept = []
+    used = 0
+    step = max(1, round(estimate_tokens(text) / max(1, max_tokens)))
+    for sentence in sentences[::step]:
+        tokens = estimate_tokens(sentence)
+        if used + tokens > max_tokens:
+            break
+        kept.append(sentence)
+        used += tokens
+    return " ".join(kept) or sentences[0][:max_tokens * 4]
+
+
+def _truncate_front(text: str, max_tokens: int) -> str:
+    max_chars = max_tokens * 4 - 4
+    if len(text) <= max_chars:
+        return text
+    cut = text[-max_chars:]
+    space = cut.find(" ")
+    return "..." + (cut[space:] if 0 <= space < 40 else cut)
+
+
+class SummaryMemory:
+    """
+    Tiered memory for everything that has left the `ContextBuffer` window.
+
+    Evicted segments collect as raw text; once `chunk_tokens` have gathered a
+    background thread condenses them into a level-0 summary. When a level
+    holds more than `fanout` summaries the oldest `fanout` are merged into
+    one summary a level up, so a meeting of any length is held in a bounded
+    number of progressively coarser summaries. `render` never waits on that
+    work: raw text that hasn't been summarized yet is used directly.
+
+    `summarize(text, max_words)` does the condensing (e.g. the LLM); if it
+    fails `extractive_summary` is used instead.
+    """
+
+    def __init__(self, summarize=None, chunk_tokens=400, summary_tokens=100, fanout=4, max_levels=4):
+        self.summarize = summarize
+        self.chunk_tokens = chunk_tokens
+        self.summary_tokens = summary_tokens
+        self.fanout = fanout
+        self.levels = [[] for _ in range(max_levels)]
+        self._raw = []
+        self._raw_tokens = 0
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._running = False
+        self._thread = None
+        self.summaries_built = 0
+
+    def start(self):
+        self._running = True
+        self._thread = threading.Thread(target=self._worker, name="summary-memory", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._running = False
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def add(self, segments):
+        """`ContextBuffer.on_evict` hook: queue (timestamp, text) segments; never blocks on summarizing."""
+        with self._lock:
+            for _, text in segments:
+                self._raw.append(text)
+                self._raw_tokens += estimate_tokens(text)
+            ready = self._raw_tokens >= self.chunk_tokens
+        if ready:
+            self._wake.set()
+
+    def _condense(self, text):
+        max_words = max(10, int(self.summary_tokens * 0.75))
+        if self.summarize:
+            try:
+                summary = self.summarize(text, max_words)
+                if summary:
+                    return summary
+            except Exception as e:
+                logger.warning(f"Summarizer failed, using extractive fallback: {e}")
+        return extractive_summary(text, self.summary_tokens)
+
+    def _worker(self):
+        while self._running:
+            self._wake.wait()
+            self._wake.clear()
+            try:
+                self.compact()
+            except Exception as e:
+                logger.error(f"Summary memory error: {e}")
+
+    def compact(self):
+        """Summarize whatever is due; runs on the background thread (or directly, e.g. in tests)."""
+        while True:
+            with self._lock:
+                if self._raw_tokens < self.chunk_tokens:
+                    break
+                count = 0
+                chunk_tokens = 0
+                while count < len(self._raw) and chunk_tokens < self.chunk_tokens:
+                    chunk_tokens += estimate_tokens(self._raw[count])
+                    count += 1
+                chunk = " ".join(self._raw[:count])
+            summary = self._condense(chunk)
+            with self._lock:
+                del self._raw[:count]
+                self._raw_tokens -= chunk_tokens
+                self.levels[0].append(summary)
+                self.summaries_built += 1
+
+        top = len(self.levels) - 1
+        for level in range(len(self.levels)):
+            while len(self.levels[level]) > self.fanout:
+                with self._lock:
+                    group = self.levels[level][:self.fanout]
+                merged = self._condense(" ".join(group))
+                with self._lock:
+                    del self.levels[level][:len(group)]
+                    # The top level merges into itself so it stays bounded too
+                    target = min(level + 1, top)
+                    if target == level:
+                        self.levels[level].insert(0, merged)
+                    else:
+                        self.levels[target].append(merged)
+                    self.summaries_built += 1
+
+    def render(self, recent_text: str, budget_tokens: int) -> str:
+        """Prompt context: as much older memory as fits alongside `recent_text` within the budget."""
+        if recent_text and estimate_tokens(recent_text) > budget_tokens:
+            return _truncate_front(recent_text, budget_tokens)
+        remaining = budget_tokens - estimate_tokens(_EARLIER + _RECENT) - 1
+        if recent_text:
+            remaining -= estimate_tokens(recent_text)
+        with self._lock:
+            raw = " ".join(self._raw)
+            # Newest first, so the most recent history wins when space runs out
+            older = [s for level in self.levels for s in reversed(level)]
+
+        picked = []
+        if raw and remaining > 0:
+            tail = _truncate_front(raw, remaining)
+            picked.append(tail)
+            remaining -= estimate_tokens(tail)
+        for summary in older:
+            tokens = estimate_tokens(summary)
+            if tokens > remaining:
+                break
+            picked.append(summary)
+            remaining -= tokens
+
+        if not picked:
+            return recent_text
+        return _EARLIER + "\n".join(reversed(picked)) + _RECENT + recent_text
+
+    def stats(self):
+        with self._lock:
+            return {
+                "raw_tokens": self._raw_tokens,
+                "summaries": [len(level) for level in self.levels],
+                "summary_tokens": sum(estimate_tokens(s) for level in self.levels for s in level),
+                "summaries_built": self.summaries_built,
+            }
@@ -0,0 +1,169 @@
+import re
+import zlib
+import queue
+import logging
+import threading
+import numpy as np
+
+logger = logging.getLogger("VectorIndex")
+
+_TOKEN = re.compile(r"[a-z0-9']+")
+_STOPWORDS = frozenset(
+    "a an and are as at be but by do for from had has have i if in is it its just like "
+    "me my of on or so that the their them then there they this to um uh was we were "
+    "what when which who will with would you your yeah okay".split()
+)
+
+
+class HashingEmbedder:
+    """Dependency-free fallback: hashed unigrams and bigrams, sublinear TF, L2-normalised."""
+
+    def __init__(self, dim=512):
+        self.dim = dim
+
+    def _features(self, text):
+        words = [w for w in _TOKEN.findall(text.lower()) if w not in _STOPWORDS]
+        return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+    def embed(self, texts):
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature in self._features(text):
+                h = zlib.crc32(feature.encode("utf-8"))
+                out[row, h % self.dim] += 1.0 if (h >> 31) & 1 else -1.0
+        out = np.sign(out) * np.log1p(np.abs(out))
+        norms = np.linalg.norm(out, axis=1, keepdims=True)
+        return out / np.maximum(norms, 1e-8)
+
+
+class FastEmbedEmbedder:
+    """Small ONNX sentence-embedding model on CPU via fastembed (optional dependency)."""
+
+    def __init__(self, model_name="BAAI/bge-small-en-v1.5"):
+        from fastembed import TextEmbedding
+        self.model = TextEmbedding(model_name)
+        self.dim = len(next(iter(self.model.embed(["probe"]))))
+
+    def embed(self, texts):
+        vectors = np.asarray(list(self.model.embed(list(texts))), dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-8)
+
+
+def default_embedder():
+    try:
+        return FastEmbedEmbedder()
+    except Exception as e:
+        logger.info(f"fastembed unavailable ({e}); using hashing embedder")
+        return HashingEmbedder()
+
+
+class VectorIndex:
+    """
+    In-memory semantic index over the whole meeting transcript.
+
+    Committed segments are grouped into passages of about `passage_words`
+    words and embedded on a background thread, so `add` never blocks the
+    transcription path. Vectors live in one preallocated float32 matrix
+    (grown by doubling) and `search` is a single matrix-vector product plus
+    `argpartition` for the top k.
+    """
+
+    def __init__(self, embedder=None, passage_words=40, capacity=1024):
+        self.embedder = embedder
+        self.passage_words = passage_words
+        self._vectors = None
+        self._capacity = capacity
+        self._times = np.zeros(capacity, dtype=np.float64)
+        self.texts = []
+        self.size = 0
+
+        self._pending = []
+        self._pending_words = 0
+        self._pending_start = None
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._worker, name="vector-index", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.flush()
+        self._queue.put(None)
+        if self._thread:
+            self._thread.join(timeout=10)
+
+    def add(self, text, timestamp):
+        """Queue a committed segment; returns immediately."""
+        if self._pending_start is None:
+            self._pending_start = timestamp
+        self._pending.append(text)
+        self._pending_words += len(text.split())
+        if self._pending_words >= self.passage_words:
+            self.flush()
+
+    def flush(self):
+        if self._pending:
+            self._queue.put((self._pending_start, " ".join(self._pending)))
+        self._pending = []
+        self._pending_words = 0
+        self._pending_start = None
+
+    def _worker(self):
+        if self.embedder is None:
+            self.embedder = default_embedder()
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            batch = [item]
+            # Embed whatever else has queued up in the same call
+            while not self._queue.empty():
+                extra = self._queue.get()
+                if extra is None:
+                    self._queue.put(None)
+                    break
+                batch.append(extra)
+            try:
+                vectors = self.embedder.embed([text for _, text in batch])
+                self._append(batch, vectors)
+            except Exception as e:
+                logger.error(f"Embedding failed: {e}")
+
+    def _append(self, batch, vectors):
+        with self._lock:
+            if self._vectors is None:
+                self._vectors = np.zeros((self._capacity, vectors.shape[1]), dtype=np.float32)
+            needed = self.size + len(batch)
+            if needed > self._capacity:
+                while self._capacity < needed:
+                    self._capacity *= 2
+                grown = np.zeros((self._capacity, self._vectors.shape[1]), dtype=np.float32)
+                grown[:self.size] = self._vectors[:self.size]
+                self._vectors = grown
+                times = np.zeros(self._capacity, dtype=np.float64)
+                times[:self.size] = self._times[:self.size]
+                self._times = times
+            self._vectors[self.size:needed] = vectors
+            self._times[self.size:needed] = [t for t, _ in batch]
+            self.texts.extend(text for _, text in batch)
+            self.size = needed
+
+    def search(self, query, k=3, before=None, min_score=0.1):
+        """Top-k passages by cosine similarity, optionally only those that started before `before`."""
+        if not query or self.size == 0 or self.embedder is None:
+            return []
+        q = self.embedder.embed([query])[0]
+        with self._lock:
+            n = self.size
+            scores = self._vectors[:n] @ q
+            if before is not None:
+                scores[self._times[:n] >= before] = -np.inf
+            k = min(k, n)
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            return [(float(scores[i]), float(self._times[i]), self.texts[i])
+                    for i in top if scores[i] >= min_score]
@@ -0,0 +1,184 @@
+"""
+Event-driven runtime for the assistant.
+
+One asyncio loop connects the stages; blocking work runs in executors:
+
+    capture (PortAudio thread) --audio-ready event--> ASR stage (executor)
+        --transcripts channel--> on_transcript (context window, index, publishers)
+    hotkey / stdin / replay --triggers channel--> on_trigger (trigger executor)
+
+Nothing polls. The capture callback signals every `notify_seconds` of
+audio, and the ASR stage sleeps until then. When speech is still pending
+it also wakes after `idle_flush` seconds without audio, in case capture
+went quiet. Channels are bounded: a slow consumer makes the ASR stage
+wait, and triggers beyond the one queued are dropped. `stop()` shuts down
+in order: capture stops, the ASR stage transcribes what is left, the
+transcript channel drains, then the trigger stage ends.
+"""
+import time
+import signal
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from utils import metrics
+
+logger = logging.getLogger("Orchestrator")
+
+_STEPS = metrics.counter("asr_steps_total", "Transcriber steps run by the ASR stage")
+_ERRORS = metrics.counter("transcription_worker_errors_total", "Exceptions caught in the transcription loop")
+_TRIGGERS_DROPPED = metrics.counter("triggers_dropped_total", "Triggers dropped because one was already queued or debounced")
+
+
+class Orchestrator:
+    def __init__(self, audio_stream, transcriber, on_transcript, on_trigger, channel_size=64,
+                 notify_seconds=0.25, idle_flush=1.5, debounce=0.5):
+        self.audio_stream = audio_stream
+        self.transcriber = transcriber
+        self.on_transcript = on_transcript
+        self.on_trigger = on_trigger
+        self.channel_size = channel_size
+        self.idle_flush = idle_flush
+        self.debounce = debounce
+        audio_stream.notify_samples = int(audio_stream.target_rate * notify_seconds)
+
+        self.loop = None
+        self._audio = None
+        self._stopping = None
+        self.transcripts = None
+        self.triggers = None
+        self._asr_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="asr")
+        # on_trigger builds the prompt (retrieval, summaries) before handing off; one at a time, off the loop
+        self._trigger_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="trigger")
+        self.steps = 0
+        self.triggered = 0
+
+        metrics.gauge("transcript_channel_depth", "Transcript segments waiting for the context stage",
+                      fn=lambda: self.transcripts.qsize() if self.transcripts else 0)
+
+    # Thread-safe entry points (hotkey callbacks, signal handlers, other threads)
+
+    def trigger(self):
+        loop = self.loop
+        if loop and not loop.is_closed():
+            loop.call_soon_threadsafe(self._offer_trigger)
+
+    def stop(self):
+        loop = self.loop
+        if loop and not loop.is_closed():
+            loop.call_soon_threadsafe(self._stopping.set)
+
+    def _offer_trigger(self):
+        if self.triggers.full():
+            _TRIGGERS_DROPPED.inc()
+            return
+        self.triggers.put_nowait(time.monotonic())
+
+    # Stages
+
+    async def _asr_stage(self):
+        loop = asyncio.get_running_loop()
+        while not self._stopping.is_set():
+            # Only wake without audio if speech is pending and capture may have gone quiet
+            timeout = self.idle_flush if self.transcriber.pending() else None
+            try:
+                await asyncio.wait_for(self._audio.wait(), timeout)
+                self._audio.clear()
+                work = self.transcriber.step
+            except asyncio.TimeoutError:
+                work = self.transcriber.finish
+            await self._run_step(loop, work)
+        await self._run_step(loop, self.transcriber.finish)
+        await self.transcripts.put(None)
+
+    async def _run_step(self, loop, work):
+        try:
+            texts = await loop.run_in_executor(self._asr_pool, work)
+        except Exception:
+            _ERRORS.inc()
+            logger.exception("Error in transcription stage")
+            await asyncio.sleep(1)
+            return
+        self.steps += 1
+        _STEPS.inc()
+        for text in texts:
+            await self.transcripts.put(text)
+
+    async def _transcript_stage(self):
+        while True:
+            text = await self.transcripts.get()
+            if text is None:
+                return
+            try:
+                self.on_transcript(text)
+            except Exception:
+                logger.exception("Error handling transcript")
+
+    async def _trigger_stage(self):
+        last = None
+        while True:
+            pressed = await self.triggers.get()
+            if last is not None and pressed - last < self.debounce:
+                _TRIGGERS_DROPPED.inc()
+                continue
+            last = pressed
+            self.triggered += 1
+            try:
+                await asyncio.get_running_loop().run_in_executor(self._trigger_pool, self.on_trigger)
+            except Exception:
+                logger.exception("Error handling trigger")
+
+    def _install_sigint(self):
+        """Ctrl+C stops in order instead of interrupting a stage; returns how to undo it."""
+        try:
+            self.loop.add_signal_handler(signal.SIGINT, self._stopping.set)
+            return lambda: self.loop.remove_signal_handler(signal.SIGINT)
+        except (NotImplementedError, RuntimeError, ValueError):
+            # Windows event loops, or not on the main thread
+            pass
+        try:
+            previous = signal.signal(signal.SIGINT, lambda signum, frame: self.stop())
+            return lambda: signal.signal(signal.SIGINT, previous)
+        except ValueError:
+            return lambda: None
+
+    async def run(self):
+        """Run until `stop()` (or Ctrl+C when on the main thread), then shut down in order."""
+        self.loop = asyncio.get_running_loop()
+        self._audio = asyncio.Event()
+        self._stopping = asyncio.Event()
+        self.transcripts = asyncio.Queue(maxsize=self.channel_size)
+        self.triggers = asyncio.Queue(maxsize=1)
+        restore_sigint = self._install_sigint()
+
+        loop = self.loop
+        audio = self._audio
+        self.audio_stream.on_audio = lambda: loop.call_soon_threadsafe(audio.set)
+        self.audio_stream.start()
+
+        asr = asyncio.create_task(self._asr_stage(), name="asr")
+        transcripts = asyncio.create_task(self._transcript_stage(), name="transcripts")
+        triggers = asyncio.create_task(self._trigger_stage(), name="triggers")
+        try:
+            await self._stopping.wait()
+        finally:
+            logger.info("Shutting down")
+            self._stopping.set()
+            # Capture first, so the ASR stage's last step sees all the audio there will be
+            await loop.run_in_executor(None, self.audio_stream.stop)
+            self.audio_stream.on_audio = None
+            audio.set()
+            await asr
+            await transcripts
+            triggers.cancel()
+            await asyncio.gather(triggers, return_exceptions=True)
+            self._asr_pool.shutdown(wait=True)
+            self._trigger_pool.shutdown(wait=True)
+            restore_sigint()
+            self.transcriber.log_stats()
+
+    def stats(self):
+        return {
+            "asr_steps": self.steps,
+            "triggers": self.triggered,
+            "transcript_channel_depth": self.transcripts.qsize() if self.transcripts else 0,
+        }
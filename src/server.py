@@ -1,8 +1,11 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response, StreamingResponse
+import asyncio
 import json
-import os
-import glob
+
+from utils.output_index import OutputIndex
+from utils import metrics
 
 app = FastAPI()
 
@@ -13,26 +16,91 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
 
 OUTPUT_DIR = "outputs"
+LONG_POLL_SECONDS = 30
+SSE_HEARTBEAT_SECONDS = 15
+
+index = OutputIndex(OUTPUT_DIR)
+changed = None      # asyncio.Event replaced on every new response
+
+
+@app.on_event("startup")
+async def start_index():
+    global changed
+    loop = asyncio.get_running_loop()
+    changed = asyncio.Event()
+
+    def notify():
+        global changed
+        event, changed = changed, asyncio.Event()
+        event.set()
+
+    # Called on the watcher thread; waiters are woken on the loop
+    index.on_change = lambda: loop.call_soon_threadsafe(notify)
+    index.start()
+
+
+@app.on_event("shutdown")
+def stop_index():
+    index.stop()
+
+
+def latest_response(etag, body, if_none_match=None):
+    if body is None:
+        return Response(json.dumps({"message": "No output files found", "data": ""}), media_type="application/json")
+    if if_none_match == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(body, media_type="application/json", headers={"ETag": etag, "Cache-Control": "no-cache"})
+
 
 @app.get("/latest-response")
-def get_latest_response():
+def get_latest_response(request: Request):
+    etag, body = index.current()
+    return latest_response(etag, body, request.headers.get("if-none-match"))
+
+
+@app.get("/latest-response/wait")
+async def wait_latest_response(request: Request, timeout: float = LONG_POLL_SECONDS):
+    """Long-poll: answers as soon as the latest response differs from the client's If-None-Match."""
+    seen = request.headers.get("if-none-match")
+    etag, body = index.current()
+    if etag is not None and etag != seen:
+        return latest_response(etag, body)
     try:
-        list_of_files = glob.glob(os.path.join(OUTPUT_DIR, "*.json"))
-        
-        if not list_of_files:
-            return {"message": "No output files found", "data": ""}
-
-        latest_file = max(list_of_files, key=os.path.getmtime)
-        
-        with open(latest_file, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        
-        return {"filename": os.path.basename(latest_file), "data": data}
-    except Exception as e:
-        return {"error": str(e)}
+        await asyncio.wait_for(changed.wait(), timeout=min(timeout, LONG_POLL_SECONDS))
+    except asyncio.TimeoutError:
+        pass
+    etag, body = index.current()
+    return latest_response(etag, body, seen)
+
+
+@app.get("/latest-response/stream")
+async def stream_latest_response(request: Request):
+    """Server-sent events: one `response` event per new output file."""
+    async def events():
+        seen = request.headers.get("last-event-id")
+        while not await request.is_disconnected():
+            event = changed
+            etag, body = index.current()
+            if etag is not None and etag != seen:
+                seen = etag
+                yield f"id: {etag}\nevent: response\ndata: {body.decode('utf-8')}\n\n"
+                continue
+            try:
+                await asyncio.wait_for(event.wait(), timeout=SSE_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+
+@app.get("/metrics")
+def metrics_endpoint():
+    return Response(metrics.render(), media_type=metrics.CONTENT_TYPE)
+
 
 if __name__ == "__main__":
     import uvicorn
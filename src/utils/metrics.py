@@ -0,0 +1,238 @@
+"""
+Minimal in-process metrics: counters, gauges and histograms rendered in the
+Prometheus text format.
+
+    from utils import metrics
+    ASR_LATENCY = metrics.histogram("asr_latency_seconds", "Whisper call duration")
+    ASR_LATENCY.observe(0.42)
+    metrics.gauge("context_tokens", "Tokens in the context window", fn=lambda: buffer.token_count)
+
+Recording is a lock plus a few additions, so it is safe on hot paths;
+gauges that only need reading at scrape time take `fn` and cost nothing
+until then. `serve(port)` exposes `/metrics` without a web framework and
+`start_console_summary` logs a short summary periodically.
+"""
+import math
+import time
+import bisect
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger("Metrics")
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+RATIO_BUCKETS = (0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 1.5, 2.0, 5.0)
+
+
+def _labels(labels, extra=None):
+    items = dict(labels)
+    if extra:
+        items.update(extra)
+    if not items:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in sorted(items.items())) + "}"
+
+
+def _number(value):
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name, help, labels, fn=None):
+        self.name, self.help, self.labels, self.fn = name, help, labels, fn
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self._lock:
+            self.value += amount
+
+    def get(self):
+        return self.fn() if self.fn else self.value
+
+    def samples(self):
+        yield self.name, _labels(self.labels), self.get()
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value):
+        self.value = value
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name, help, labels, buckets=LATENCY_BUCKETS):
+        self.name, self.help, self.labels = name, help, labels
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[i] += 1
+            self.sum += value
+            self.count += 1
+
+    def time(self):
+        """Context manager observing the elapsed wall time of its block."""
+        return _Timer(self)
+
+    def quantile(self, q):
+        """Estimate from the buckets (upper bound of the bucket holding the q-th observation)."""
+        with self._lock:
+            counts, total = list(self.counts), self.count
+        if not total:
+            return 0.0
+        rank = q * total
+        seen = 0
+        for bound, count in zip(self.buckets + (math.inf,), counts):
+            seen += count
+            if seen >= rank:
+                return bound if bound != math.inf else self.buckets[-1]
+        return self.buckets[-1]
+
+    def samples(self):
+        with self._lock:
+            counts, total, sum_ = list(self.counts), self.count, self.sum
+        cumulative = 0
+        for bound, count in zip(self.buckets + (math.inf,), counts):
+            cumulative += count
+            yield f"{self.name}_bucket", _labels(self.labels, {"le": _number(bound)}), cumulative
+        yield f"{self.name}_sum", _labels(self.labels), sum_
+        yield f"{self.name}_count", _labels(self.labels), total
+
+
+class _Timer:
+    __slots__ = ("histogram", "started")
+
+    def __init__(self, histogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.histogram.observe(time.perf_counter() - self.started)
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = {}           # (name, labels) -> metric, in registration order
+        self._lock = threading.Lock()
+
+    def _get(self, cls, name, help, labels, **kwargs):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            metric = self._metrics.get(key)
+            if metric is None:
+                metric = self._metrics[key] = cls(name, help, labels, **kwargs)
+            elif kwargs.get("fn"):
+                # Re-registering a scrape-time gauge points it at the new object
+                metric.fn = kwargs["fn"]
+            return metric
+
+    def counter(self, name, help="", fn=None, **labels) -> Counter:
+        return self._get(Counter, name, help, labels, fn=fn)
+
+    def gauge(self, name, help="", fn=None, **labels) -> Gauge:
+        return self._get(Gauge, name, help, labels, fn=fn)
+
+    def histogram(self, name, help="", buckets=LATENCY_BUCKETS, **labels) -> Histogram:
+        return self._get(Histogram, name, help, labels, buckets=buckets)
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        # One block per family: HELP and TYPE once, then every labelled variant's samples
+        families = {}
+        for metric in metrics:
+            families.setdefault(metric.name, []).append(metric)
+        lines = []
+        for name, family in families.items():
+            lines.append(f"# HELP {name} {family[0].help}")
+            lines.append(f"# TYPE {name} {family[0].kind}")
+            for metric in family:
+                try:
+                    for sample, labels, value in metric.samples():
+                        lines.append(f"{sample}{labels} {_number(value)}")
+                except Exception as e:
+                    logger.debug(f"Skipping {name}{_labels(metric.labels)}: {e}")
+        return "\n".join(lines) + "\n"
+
+    def summary(self) -> str:
+        """One line per metric, for the console."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        parts = []
+        for metric in metrics:
+            name = metric.name + _labels(metric.labels)
+            if isinstance(metric, Histogram):
+                if metric.count:
+                    parts.append(f"{name}: n={metric.count} mean={metric.sum / metric.count:.3g} "
+                                 f"p50<={metric.quantile(0.5):g} p95<={metric.quantile(0.95):g}")
+            else:
+                try:
+                    parts.append(f"{name}: {metric.get():g}")
+                except Exception:
+                    pass
+        return "\n".join(parts)
+
+
+REGISTRY = Registry()
+counter = REGISTRY.counter
+gauge = REGISTRY.gauge
+histogram = REGISTRY.histogram
+render = REGISTRY.render
+summary = REGISTRY.summary
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def serve(port, host="127.0.0.1"):
+    """Serve `/metrics` on a background thread, for processes without a web app."""
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    logger.info(f"Metrics on http://{host}:{port}/metrics")
+    return server
+
+
+def start_console_summary(interval=60.0, out=None):
+    """Log `summary()` every `interval` seconds until the returned event is set."""
+    stop = threading.Event()
+
+    def run():
+        while not stop.wait(interval):
+            text = summary()
+            if text:
+                (out or logger.info)("Metrics summary:\n" + text)
+
+    threading.Thread(target=run, name="metrics-summary", daemon=True).start()
+    return stop
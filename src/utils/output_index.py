@@ -0,0 +1,191 @@
+import os
+import json
+import hashlib
+import logging
+import threading
+
+logger = logging.getLogger("OutputIndex")
+
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except ImportError:
+    Observer = None
+    FileSystemEventHandler = object
+
+
+class _Handler(FileSystemEventHandler):
+    def __init__(self, index):
+        self.index = index
+
+    def on_created(self, event):
+        if not event.is_directory:
+            self.index.update(event.src_path)
+
+    def on_modified(self, event):
+        if not event.is_directory:
+            self.index.update(event.src_path)
+
+    def on_moved(self, event):
+        if not event.is_directory:
+            self.index.remove(event.src_path)
+            self.index.update(event.dest_path)
+
+    def on_deleted(self, event):
+        if not event.is_directory:
+            self.index.remove(event.src_path)
+
+
+class OutputIndex:
+    """
+    In-memory view of the newest response in the outputs directory.
+
+    The directory is scanned once; after that it is kept current from
+    filesystem notifications (watchdog, if installed) or, failing that, by
+    polling the directory's mtime, which only changes when files are added,
+    renamed or removed. The latest entry is held already parsed and
+    serialized, with an ETag, so serving it touches neither the disk nor
+    the JSON parser.
+
+    `on_change()` is called from the watcher thread after each new latest
+    entry.
+    """
+
+    def __init__(self, directory, pattern=".json", poll_interval=0.5):
+        self.directory = directory
+        self.pattern = pattern
+        self.poll_interval = poll_interval
+        self.on_change = None
+        self.files = {}              # name -> mtime_ns
+        self.latest = None           # {"filename", "data"}
+        self.body = None             # serialized `latest`
+        self.etag = None
+        self._latest_mtime = -1
+        self._pending = set()        # files that couldn't be parsed yet
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._observer = None
+        self._thread = None
+        self._dir_mtime = None
+
+    def start(self):
+        os.makedirs(self.directory, exist_ok=True)
+        self.scan()
+        self._stopped.clear()
+        if Observer is not None:
+            self._observer = Observer()
+            self._observer.schedule(_Handler(self), self.directory, recursive=False)
+            self._observer.start()
+            logger.info(f"Watching {self.directory} for new responses")
+        else:
+            self._thread = threading.Thread(target=self._poll, name="output-index", daemon=True)
+            self._thread.start()
+            logger.warning(f"watchdog is not installed; polling {self.directory} every {self.poll_interval}s "
+                           f"instead of watching it (pip install watchdog)")
+        return self
+
+    def stop(self):
+        self._stopped.set()
+        if self._observer:
+            self._observer.stop()
+            self._observer.join(timeout=5)
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def scan(self):
+        """One pass over the directory; newest file first so only the latest is parsed."""
+        self._dir_mtime = os.stat(self.directory).st_mtime_ns
+        found = {}
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if entry.name.endswith(self.pattern) and entry.is_file():
+                    found[entry.name] = entry.stat().st_mtime_ns
+        self.files = found
+        for name in sorted(found, key=found.get, reverse=True):
+            if self._load(name, found[name]):
+                break
+
+    def update(self, path):
+        """A file was created, modified or renamed into place."""
+        name = os.path.basename(path)
+        if not name.endswith(self.pattern):
+            return
+        try:
+            mtime = os.stat(os.path.join(self.directory, name)).st_mtime_ns
+        except FileNotFoundError:
+            self.remove(name)
+            return
+        self.files[name] = mtime
+        if self.latest and name == self.latest["filename"] and mtime == self._latest_mtime:
+            return
+        if mtime >= self._latest_mtime:
+            self._load(name, mtime)
+        else:
+            self._pending.discard(name)
+
+    def remove(self, path):
+        """A file was deleted or renamed away; if it was the latest, the next newest takes over."""
+        name = os.path.basename(path)
+        self.files.pop(name, None)
+        self._pending.discard(name)
+        if not self.latest or self.latest["filename"] != name:
+            return
+        for other in sorted(self.files, key=self.files.get, reverse=True):
+            if self._load(other, self.files[other]):
+                return
+        with self._lock:
+            self.latest = self.body = self.etag = None
+            self._latest_mtime = -1
+        if self.on_change:
+            self.on_change()
+
+    def _load(self, name, mtime):
+        try:
+            with open(os.path.join(self.directory, name), "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            # Usually a file still being written; the next event or poll picks it up
+            logger.debug(f"Skipping {name} for now: {e}")
+            self._pending.add(name)
+            return False
+
+        self._pending.discard(name)
+        latest = {"filename": name, "data": data}
+        body = json.dumps(latest, ensure_ascii=False).encode("utf-8")
+        etag = '"' + hashlib.sha1(body).hexdigest()[:16] + '"'
+        with self._lock:
+            if etag == self.etag:
+                return True
+            self.latest, self.body, self.etag = latest, body, etag
+            self._latest_mtime = mtime
+        if self.on_change:
+            self.on_change()
+        return True
+
+    def _poll(self):
+        while not self._stopped.is_set():
+            try:
+                dir_mtime = os.stat(self.directory).st_mtime_ns
+                if dir_mtime != self._dir_mtime:
+                    self._dir_mtime = dir_mtime
+                    present = set()
+                    with os.scandir(self.directory) as entries:
+                        for entry in entries:
+                            present.add(entry.name)
+                            if entry.name.endswith(self.pattern) and entry.name not in self.files:
+                                self.update(entry.path)
+                    for name in set(self.files) - present:
+                        self.remove(name)
+                for name in list(self._pending):
+                    self.update(name)
+                if self.latest:
+                    # In-place rewrites don't touch the directory mtime
+                    self.update(self.latest["filename"])
+            except Exception as e:
+                logger.error(f"Output index poll failed: {e}")
+            self._stopped.wait(self.poll_interval)
+
+    def current(self):
+        """(etag, body) of the latest entry, read together."""
+        with self._lock:
+            return self.etag, self.body
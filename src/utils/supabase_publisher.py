@@ -0,0 +1,217 @@
+import time
+import random
+import logging
+import threading
+from collections import deque
+
+import httpx
+from utils import metrics
+
+logger = logging.getLogger("SupabasePublisher")
+
+_LATENCY = metrics.histogram("publish_latency_seconds", "Queued to acknowledged", target="supabase")
+_RETRIES = metrics.counter("publish_retries_total", "Failed publish rounds that were retried", target="supabase")
+
+_RETRYABLE = {408, 425, 429, 500, 502, 503, 504}
+
+
+class SupabasePublisher:
+    """
+    Background writer for session rows, talking to Supabase's PostgREST API
+    over one pooled keep-alive connection.
+
+    `update` merges fields into the pending update for that session and
+    returns at once, so a burst of partial responses becomes one PATCH
+    carrying the newest values. Failed requests are retried with
+    exponential backoff and jitter; while the network is down updates keep
+    coalescing, so nothing queues up beyond one pending row per session and
+    the latest state is sent once the service is reachable again.
+
+    `publish_transcript` appends text to a per-session buffer that is
+    inserted into `transcript_table` at most every `transcript_interval`
+    seconds as one row.
+    """
+
+    def __init__(self, url, key, table="sessions", transcript_table="transcripts",
+                 transcript_interval=1.0, timeout=5.0, max_backoff=30.0,
+                 max_transcript_chars=100_000, transport=None):
+        self.table = table
+        self.transcript_table = transcript_table
+        self.transcript_interval = transcript_interval
+        self.max_backoff = max_backoff
+        self.max_transcript_chars = max_transcript_chars
+        self.client = httpx.Client(
+            base_url=url.rstrip("/") + "/rest/v1",
+            headers={
+                "apikey": key,
+                "Authorization": f"Bearer {key}",
+                "Content-Type": "application/json",
+                "Prefer": "return=minimal",
+            },
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=1, max_keepalive_connections=1),
+            transport=transport,
+        )
+
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._pending = {}            # session -> (fields, first queued at)
+        self._transcripts = {}        # session -> deque of text
+        self._transcript_chars = {}
+        self._last_transcript = {}
+        self._running = False
+        self._thread = None
+        self._failures = 0            # consecutive, drives the backoff
+
+        self.sent = 0
+        self.coalesced = 0
+        self.retries = 0
+        self.dropped = 0
+        self._latencies = deque(maxlen=4096)
+
+    def start(self):
+        self._running = True
+        self._thread = threading.Thread(target=self._worker, name="supabase-publisher", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=5.0):
+        """Try to deliver what is pending for up to `timeout` seconds, then close the connection."""
+        deadline = time.monotonic() + timeout
+        while self.pending() and self._failures == 0 and time.monotonic() < deadline:
+            self._wake.set()
+            time.sleep(0.05)
+        self._running = False
+        self._stopped.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout=max(0.1, deadline - time.monotonic()))
+        self.client.close()
+
+    def pending(self):
+        with self._lock:
+            return len(self._pending) + sum(1 for q in self._transcripts.values() if q)
+
+    def update(self, session_id, fields: dict):
+        """Queue a PATCH of the session row; merged with any not-yet-sent update for it."""
+        with self._lock:
+            queued = self._pending.get(session_id)
+            if queued:
+                queued[0].update(fields)
+                self.coalesced += 1
+            else:
+                self._pending[session_id] = (dict(fields), time.perf_counter())
+        self._wake.set()
+
+    def publish_response(self, session_id, response, timestamp):
+        self.update(session_id, {"response": response, "timestamp": timestamp})
+
+    def publish_transcript(self, session_id, text):
+        with self._lock:
+            buffer = self._transcripts.setdefault(session_id, deque())
+            buffer.append(text)
+            chars = self._transcript_chars.get(session_id, 0) + len(text)
+            # Offline for a long time: keep the newest text only
+            while chars > self.max_transcript_chars and len(buffer) > 1:
+                chars -= len(buffer.popleft())
+                self.dropped += 1
+            self._transcript_chars[session_id] = chars
+        self._wake.set()
+
+    def _send(self, method, path, **kwargs):
+        """True on success, False to retry later; non-retryable errors are logged and dropped."""
+        try:
+            response = self.client.request(method, path, **kwargs)
+        except httpx.HTTPError as e:
+            logger.warning(f"Supabase unreachable ({type(e).__name__}); will retry")
+            return False
+        if response.status_code < 300:
+            return True
+        if response.status_code in _RETRYABLE:
+            logger.warning(f"Supabase returned {response.status_code}; will retry")
+            return False
+        logger.error(f"Supabase rejected {method} {path}: {response.status_code} {response.text[:200]}")
+        self.dropped += 1
+        return True
+
+    def _due_transcripts(self, now):
+        due = []
+        with self._lock:
+            for session_id, buffer in self._transcripts.items():
+                if buffer and now - self._last_transcript.get(session_id, 0.0) >= self.transcript_interval:
+                    due.append((session_id, " ".join(buffer)))
+                    buffer.clear()
+                    self._transcript_chars[session_id] = 0
+                    self._last_transcript[session_id] = now
+        return due
+
+    def _next_transcript_in(self, now):
+        with self._lock:
+            waits = [self.transcript_interval - (now - self._last_transcript.get(s, 0.0))
+                     for s, buffer in self._transcripts.items() if buffer]
+        return max(0.0, min(waits)) if waits else None
+
+    def _worker(self):
+        while self._running:
+            now = time.monotonic()
+            wait = self._next_transcript_in(now)
+            if not self._pending:
+                # Idle with nothing due: sleep until publish or stop wakes us
+                self._wake.wait(timeout=wait)
+            self._wake.clear()
+
+            with self._lock:
+                batch, self._pending = self._pending, {}
+            ok = True
+            for session_id, (fields, queued_at) in batch.items():
+                if ok and self._send("PATCH", f"/{self.table}", params={"id": f"eq.{session_id}"}, json=fields):
+                    self.sent += 1
+                    latency = time.perf_counter() - queued_at
+                    self._latencies.append(latency)
+                    _LATENCY.observe(latency)
+                    continue
+                ok = False
+                with self._lock:
+                    # Anything queued meanwhile is newer and wins
+                    newer = self._pending.get(session_id)
+                    merged = {**fields, **newer[0]} if newer else fields
+                    self._pending[session_id] = (merged, queued_at)
+
+            if ok:
+                for session_id, text in self._due_transcripts(time.monotonic()):
+                    row = {"session_id": session_id, "text": text,
+                           "timestamp": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime())}
+                    if ok and self._send("POST", f"/{self.transcript_table}", json=row):
+                        self.sent += 1
+                        continue
+                    ok = False
+                    with self._lock:
+                        self._transcripts[session_id].appendleft(text)
+                        self._transcript_chars[session_id] += len(text)
+
+            if ok:
+                self._failures = 0
+            else:
+                self._failures += 1
+                self.retries += 1
+                _RETRIES.inc()
+                delay = min(self.max_backoff, 0.25 * 2 ** (self._failures - 1)) * (0.5 + random.random() / 2)
+                # New updates only coalesce during the backoff; stop() can cut it short
+                self._stopped.wait(timeout=delay)
+
+    def stats(self):
+        latencies = sorted(self._latencies)
+
+        def pct(p):
+            return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000 if latencies else 0.0
+
+        return {
+            "sent": self.sent,
+            "coalesced": self.coalesced,
+            "retries": self.retries,
+            "dropped": self.dropped,
+            "pending": self.pending(),
+            "latency_p50_ms": pct(0.50),
+            "latency_p99_ms": pct(0.99),
+        }
@@ -10,3 +10,76 @@ def clean_llm_output(text: str) -> str:
     text = re.sub(r'\n{2,}', '\n', text)
 
     return text.strip()
+
+
+
+class StreamingCleaner:
+    """
+    Incremental `clean_llm_output` for streamed text.
+
+    Each regex pass of the batch cleaner becomes a small state machine and
+    characters flow through them in the same order. `feed` returns the text
+    that is safe to show now; whitespace is held back until the next visible
+    character, so the concatenated output equals `clean_llm_output(full_text)`.
+    """
+
+    def __init__(self):
+        self._bullet_line_start = True   # pass 1: ^[\s*\-•]+
+        self._heading_line_start = True  # pass 3: ^#+\s*
+        self._heading = None             # None, "hash" or "space"
+        self._heading_newline = False
+        self._pending = ""               # passes 4/5: collapsed, unstripped whitespace
+        self._emitted = False
+
+    def feed(self, text: str) -> str:
+        out = []
+        for ch in text or "":
+            # Pass 1 (bullets) and pass 2 (asterisks)
+            if self._bullet_line_start:
+                if ch.isspace() or ch in "*-•":
+                    continue
+                self._bullet_line_start = False
+            if ch == "*":
+                continue
+            if ch == "\n":
+                self._bullet_line_start = True
+            self._heading_pass(ch, out)
+        return "".join(out)
+
+    def _heading_pass(self, ch, out):
+        if self._heading == "hash":
+            if ch == "#":
+                return
+            self._heading = "space"
+        if self._heading == "space":
+            if ch.isspace():
+                self._heading_newline = ch == "\n"
+                return
+            self._heading = None
+            if self._heading_newline and ch == "#":
+                self._heading = "hash"
+                return
+        elif self._heading_line_start and ch == "#":
+            self._heading = "hash"
+            self._heading_newline = False
+            return
+        self._heading_line_start = ch == "\n"
+        self._whitespace_pass(ch, out)
+
+    def _whitespace_pass(self, ch, out):
+        if ch == "\n":
+            if not self._pending.endswith("\n"):
+                self._pending += ch
+        elif ch.isspace():
+            self._pending += ch
+        else:
+            if self._emitted:
+                out.append(self._pending)
+            self._pending = ""
+            out.append(ch)
+            self._emitted = True
+
+    def finish(self) -> str:
+        # Whatever is still held back is trailing whitespace, which the batch cleaner strips
+        self._pending = ""
+        return ""
@@ -0,0 +1,36 @@
+"""
+Word error rate of a hypothesis transcript against a reference.
+
+Both sides are lower-cased and reduced to their words (punctuation and
+spacing don't count) before the minimum edit distance is taken.
+"""
+import re
+
+_WORD = re.compile(r"[a-z0-9]+(?:'[a-z0-9]+)*")
+
+
+def normalize(text: str) -> list:
+    return _WORD.findall(text.lower().replace("’", "'"))
+
+
+def edit_distance(reference: list, hypothesis: list) -> int:
+    """Substitutions + deletions + insertions turning `reference` into `hypothesis`."""
+    # Words to ints once, then a two-row Levenshtein over the ids
+    ids = {}
+    ref = [ids.setdefault(w, len(ids)) for w in reference]
+    hyp = [ids.setdefault(w, len(ids)) for w in hypothesis]
+    previous = list(range(len(hyp) + 1))
+    for i, r in enumerate(ref, 1):
+        current = [i]
+        for j, h in enumerate(hyp, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (r != h)))
+        previous = current
+    return previous[-1]
+
+
+def wer(reference: str, hypothesis: str) -> float:
+    ref = normalize(reference)
+    hyp = normalize(hypothesis)
+    if not ref:
+        return 0.0 if not hyp else 1.0
+    return edit_distance(ref, hyp) / len(ref)
@@ -0,0 +1,30 @@
+import numpy as np
+
+from asr.asr_process import ProcessASR
+
+
+class EchoASR:
+    """Reports the first sample and the duration it was given."""
+
+    def transcribe_words(self, audio, prompt=None):
+        return [(0.0, len(audio) / 16000, f"{audio[0]:g}")]
+
+    def transcribe(self, audio):
+        return str(len(audio))
+
+
+def test_round_trip():
+    with ProcessASR(factory=EchoASR, max_seconds=1.0) as asr:
+        audio = np.full(8000, 0.25, dtype=np.float32)
+        assert asr.transcribe_words(audio) == [(0.0, 0.5, "0.25")]
+        assert asr.transcribe(audio) == "8000"
+
+
+def test_longer_window_grows_the_block_instead_of_dropping_the_head():
+    with ProcessASR(factory=EchoASR, max_seconds=1.0) as asr:
+        audio = np.arange(40000, dtype=np.float32)        # 2.5 s
+        assert asr.transcribe_words(audio) == [(0.0, 2.5, "0")]
+        assert asr.max_samples >= 40000
+        assert asr.restarts == 0
+        # And the worker keeps using the new block
+        assert asr.transcribe_words(audio[100:]) == [(0.0, 39900 / 16000, "100")]
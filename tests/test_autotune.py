@@ -0,0 +1,63 @@
+import threading
+
+import pytest
+
+from asr.autotune import BackgroundASR, thread_counts
+
+
+class FakeASR:
+    def __init__(self, name):
+        self.name = name
+        self.stopped = False
+
+    def transcribe(self, audio):
+        return self.name
+
+    def transcribe_words(self, audio, prompt=None):
+        return [(0.0, 1.0, self.name)]
+
+    def stop(self):
+        self.stopped = True
+
+
+def test_serves_the_first_model_until_the_upgrade_is_ready():
+    release = threading.Event()
+    tuned = FakeASR("tuned")
+
+    def upgrade():
+        release.wait(5)
+        return tuned
+
+    asr = BackgroundASR(lambda: FakeASR("default"), upgrade=upgrade).start()
+    assert asr.transcribe(None) == "default"
+    first = asr.asr
+    release.set()
+    for _ in range(100):
+        if asr.upgraded:
+            break
+        threading.Event().wait(0.01)
+    assert asr.transcribe(None) == "tuned"
+    assert first.stopped
+    asr.stop()
+    assert tuned.stopped
+
+
+def test_no_upgrade_keeps_the_first_model():
+    asr = BackgroundASR(lambda: FakeASR("default"), upgrade=lambda: None).start()
+    assert asr.transcribe_words(None) == [(0.0, 1.0, "default")]
+    assert not asr.upgraded
+
+
+def test_failed_load_raises_on_use():
+    def load():
+        raise OSError("no model")
+
+    asr = BackgroundASR(load).start()
+    with pytest.raises(RuntimeError):
+        asr.transcribe(None)
+
+
+def test_thread_counts_largest_first():
+    assert thread_counts(32) == (16, 4)
+    assert thread_counts(8) == (8, 4)
+    assert thread_counts(1) == (1,)
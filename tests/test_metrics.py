@@ -0,0 +1,44 @@
+from audio.jitter import CallbackJitter
+from utils.metrics import Registry
+
+
+def test_families_render_together():
+    registry = Registry()
+    registry.counter("llm_errors_total", "Failed calls", backend="gemini").inc()
+    registry.gauge("context_tokens", "Tokens", fn=lambda: 42)
+    registry.counter("llm_errors_total", "Failed calls", backend="ollama").inc(2)
+
+    lines = registry.render().splitlines()
+    assert lines == [
+        "# HELP llm_errors_total Failed calls",
+        "# TYPE llm_errors_total counter",
+        'llm_errors_total{backend="gemini"} 1',
+        'llm_errors_total{backend="ollama"} 2',
+        "# HELP context_tokens Tokens",
+        "# TYPE context_tokens gauge",
+        "context_tokens 42",
+    ]
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = Registry()
+    latency = registry.histogram("asr_latency_seconds", "Whisper call", buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.7, 5.0):
+        latency.observe(value)
+
+    text = registry.render()
+    assert 'asr_latency_seconds_bucket{le="0.1"} 1' in text
+    assert 'asr_latency_seconds_bucket{le="1.0"} 3' in text
+    assert 'asr_latency_seconds_bucket{le="+Inf"} 4' in text
+    assert "asr_latency_seconds_count 4" in text
+    assert latency.quantile(0.5) == 1.0
+
+
+def test_jitter_count():
+    jitter = CallbackJitter(0.01)
+    for _ in range(4):
+        jitter.tick()
+    assert jitter.count == 3
+    assert jitter.stats()["callbacks"] == 3
+    jitter.reset()
+    assert jitter.count == 0
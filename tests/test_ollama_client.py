@@ -0,0 +1,138 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from llm.gemini_client import configure_cache
+from llm.ollama_client import OllamaBackend
+from llm.router import LLMRouter
+from test_router import FakeBackend
+
+MODEL = "stub:1b"
+TOKENS = ["**Hello", "**", " from", " the", " stub", "."]
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Enough of Ollama's API for OllamaBackend: /api/tags, /api/generate and /api/chat (NDJSON streaming)."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, body=None, content_type="application/json"):
+        data = json.dumps(body).encode() if body is not None else b""
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        self.server.tags += 1
+        self._send(200, {"models": [{"name": MODEL}]})
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        if self.server.down:
+            # Pooled connections die with the server too
+            self.close_connection = True
+            return
+        self.server.requests.append((self.path, body))
+        if self.server.status != 200:
+            return self._send(self.server.status, {"error": "model crashed"})
+        if self.path == "/api/generate":
+            return self._send(200, {"model": MODEL, "done": True})
+        if not body["stream"]:
+            return self._send(200, {"message": {"role": "assistant", "content": "".join(TOKENS)}, "done": True})
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for token in TOKENS + [""]:
+            line = json.dumps({"message": {"role": "assistant", "content": token}, "done": not token}).encode() + b"\n"
+            self.wfile.write(f"{len(line):x}\r\n".encode() + line + b"\r\n")
+            self.wfile.flush()
+        self.wfile.write(b"0\r\n\r\n")
+
+
+@pytest.fixture
+def stub():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.daemon_threads = True
+    server.tags = 0
+    server.status = 200
+    server.down = False
+    server.requests = []
+    server.url = f"http://127.0.0.1:{server.server_address[1]}"
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture(autouse=True)
+def no_cache():
+    configure_cache(enabled=False)
+
+
+@pytest.fixture
+def backend(stub):
+    backend = OllamaBackend(model=MODEL, host=stub.url, timeout=5.0)
+    yield backend
+    backend.close()
+
+
+def test_streamed_tokens_are_assembled_and_cleaned(backend, stub):
+    assert "".join(backend.stream("what's up")) == "Hello from the stub."
+    path, body = stub.requests[-1]
+    assert path == "/api/chat" and body["stream"] and body["model"] == MODEL
+    assert body["keep_alive"] == "30m"
+    assert "what's up" in body["messages"][-1]["content"]
+
+
+def test_complete(backend):
+    assert backend.complete("hi") == "Hello from the stub."
+
+
+def test_warm_loads_the_model(backend, stub):
+    backend.warm().join(5)
+    assert stub.requests == [("/api/generate", {"model": MODEL, "keep_alive": "30m"})]
+
+
+def test_health_check_is_cached(backend, stub):
+    assert backend.available() and backend.available()
+    assert stub.tags == 1
+
+
+def test_missing_model_is_unavailable(stub):
+    backend = OllamaBackend(model="other:7b", host=stub.url)
+    assert not backend.available()
+    backend.close()
+
+
+def test_server_error_falls_back(backend, stub):
+    stub.status = 500
+    router = LLMRouter([backend, FakeBackend("gemini")], budget_seconds=10.0)
+    assert router.complete("hi") == ("gemini", "an answer")
+    assert stub.requests[-1][0] == "/api/chat"
+    # The failed call marks the backend down until the next health check
+    assert not backend.available() and stub.tags == 1
+    provider, chunks = router.stream("hi")
+    assert provider == "gemini" and "".join(chunks) == "an answer"
+
+
+def test_server_down_falls_back(stub):
+    backend = OllamaBackend(model=MODEL, host=stub.url, timeout=2.0)
+    assert backend.available()
+    stub.down = True
+    stub.shutdown()
+    stub.server_close()
+    router = LLMRouter([backend, FakeBackend("gemini")], budget_seconds=10.0)
+    provider, chunks = router.stream("hi")
+    assert provider == "gemini" and "".join(chunks) == "an answer"
+    assert not backend.available()
+    backend.close()
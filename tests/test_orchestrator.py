@@ -0,0 +1,101 @@
+import asyncio
+import threading
+
+from orchestrator import Orchestrator
+
+
+class FakeStream:
+    target_rate = 16000
+
+    def __init__(self):
+        self.notify_samples = None
+        self.on_audio = None
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+
+class FakeTranscriber:
+    def __init__(self, texts):
+        self.texts = list(texts)
+
+    def pending(self):
+        return False
+
+    def step(self):
+        texts, self.texts = self.texts, []
+        return texts
+
+    def finish(self):
+        return self.step()
+
+    def log_stats(self):
+        pass
+
+
+def test_slow_trigger_does_not_stall_transcripts():
+    stream = FakeStream()
+    seen = []
+    release = threading.Event()
+    trigger_started = threading.Event()
+    trigger_done = threading.Event()
+
+    def on_trigger():
+        trigger_started.set()
+        release.wait(5)
+        trigger_done.set()
+
+    orchestrator = Orchestrator(stream, FakeTranscriber(["one", "two"]), seen.append, on_trigger, debounce=0.0)
+
+    async def scenario():
+        task = asyncio.create_task(orchestrator.run())
+        while orchestrator.loop is None or stream.on_audio is None:
+            await asyncio.sleep(0.01)
+        orchestrator.trigger()
+        await asyncio.get_running_loop().run_in_executor(None, trigger_started.wait, 5)
+        stream.on_audio()
+        for _ in range(100):
+            if seen:
+                break
+            await asyncio.sleep(0.01)
+        # Transcripts went through while the trigger was still blocked
+        assert seen == ["one", "two"]
+        assert not trigger_done.is_set()
+        release.set()
+        orchestrator.stop()
+        await task
+
+    asyncio.run(scenario())
+    assert orchestrator.triggered == 1
+
+
+def test_triggers_beyond_the_queued_one_are_dropped():
+    stream = FakeStream()
+    calls = []
+    release = threading.Event()
+
+    def on_trigger():
+        calls.append(1)
+        release.wait(5)
+
+    orchestrator = Orchestrator(stream, FakeTranscriber([]), lambda text: None, on_trigger, debounce=0.0)
+
+    async def scenario():
+        task = asyncio.create_task(orchestrator.run())
+        while orchestrator.loop is None:
+            await asyncio.sleep(0.01)
+        orchestrator.trigger()
+        await asyncio.sleep(0.05)
+        for _ in range(3):
+            orchestrator.trigger()
+        await asyncio.sleep(0.05)
+        release.set()
+        await asyncio.sleep(0.05)
+        orchestrator.stop()
+        await task
+
+    asyncio.run(scenario())
+    assert len(calls) == 2
@@ -0,0 +1,93 @@
+import json
+import os
+import time
+from types import SimpleNamespace
+
+from utils import output_index
+from utils.output_index import OutputIndex
+
+
+def write(directory, name, response, mtime):
+    path = directory / name
+    path.write_text(json.dumps({"response": response}))
+    os.utime(path, ns=(mtime, mtime))
+    return path
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_latest_is_the_newest_file(tmp_path):
+    write(tmp_path, "response_1.json", "old", 1_000_000_000)
+    write(tmp_path, "response_2.json", "new", 2_000_000_000)
+    index = OutputIndex(str(tmp_path))
+    index.scan()
+    assert index.latest == {"filename": "response_2.json", "data": {"response": "new"}}
+
+
+def test_deleting_the_latest_falls_back_and_changes_the_etag(tmp_path):
+    write(tmp_path, "response_1.json", "old", 1_000_000_000)
+    newest = write(tmp_path, "response_2.json", "new", 2_000_000_000)
+    index = OutputIndex(str(tmp_path))
+    index.scan()
+    changes = []
+    index.on_change = lambda: changes.append(index.etag)
+    etag = index.etag
+
+    newest.unlink()
+    index.remove(str(newest))
+    assert index.latest["filename"] == "response_1.json"
+    assert index.etag != etag and changes == [index.etag]
+    assert "response_2.json" not in index.files
+
+    (tmp_path / "response_1.json").unlink()
+    index.remove("response_1.json")
+    assert index.current() == (None, None) and index.latest is None
+
+
+def test_renamed_away_latest_is_dropped(tmp_path):
+    write(tmp_path, "response_1.json", "old", 1_000_000_000)
+    newest = write(tmp_path, "response_2.json", "new", 2_000_000_000)
+    index = OutputIndex(str(tmp_path))
+    index.scan()
+    newest.rename(tmp_path / "response_2.json.bak")
+    index.remove(str(newest))
+    index.update(str(tmp_path / "response_2.json.bak"))       # not a .json: ignored
+    assert index.latest["filename"] == "response_1.json"
+
+
+def test_polling_notices_deletions(tmp_path, monkeypatch):
+    monkeypatch.setattr(output_index, "Observer", None)
+    write(tmp_path, "response_1.json", "old", 1_000_000_000)
+    newest = write(tmp_path, "response_2.json", "new", 2_000_000_000)
+    index = OutputIndex(str(tmp_path), poll_interval=0.01).start()
+    try:
+        assert index.latest["filename"] == "response_2.json"
+        newest.unlink()
+        # The directory mtime has to move for the poller to look
+        os.utime(tmp_path, ns=(3_000_000_000, 3_000_000_000))
+        assert wait_for(lambda: index.latest["filename"] == "response_1.json")
+    finally:
+        index.stop()
+
+
+def test_watchdog_handler_routes_deletes_and_moves(tmp_path):
+    write(tmp_path, "response_1.json", "old", 1_000_000_000)
+    newest = write(tmp_path, "response_2.json", "new", 2_000_000_000)
+    index = OutputIndex(str(tmp_path))
+    index.scan()
+    handler = output_index._Handler(index)
+
+    moved = tmp_path / "response_3.json"
+    newest.rename(moved)
+    handler.on_moved(SimpleNamespace(is_directory=False, src_path=str(newest), dest_path=str(moved)))
+    assert index.latest["filename"] == "response_3.json"
+    assert set(index.files) == {"response_1.json", "response_3.json"}
+
+    moved.unlink()
+    handler.on_deleted(SimpleNamespace(is_directory=False, src_path=str(moved)))
+    assert index.latest["filename"] == "response_1.json"
@@ -0,0 +1,39 @@
+import os
+import wave
+
+from audio import recorder
+from audio.recorder import SegmentRecorder
+
+RATE = 8000
+
+
+def test_segments_split_at_segment_seconds(tmp_path):
+    finished = []
+    rec = SegmentRecorder(str(tmp_path), "meeting", RATE, channels=2, segment_seconds=1.0,
+                          on_segment=lambda path, start, duration: finished.append((start, duration))).start()
+    block = b"\x01\x00" * 2 * 1000
+    for _ in range(25):                       # 25 000 frames: 3 full segments and a partial one
+        rec.write(block)
+    paths = rec.stop()
+
+    assert [os.path.basename(p) for p in paths] == [f"meeting_00{i}.wav" for i in range(4)]
+    assert finished == [(0.0, 1.0), (1.0, 1.0), (2.0, 1.0), (3.0, 0.125)]
+    with wave.open(paths[-1], "rb") as wav:
+        assert wav.getnframes() == 1000
+    assert rec.stats()["dropped_frames"] == 0
+
+
+def test_flac_without_soundfile_keeps_wav(tmp_path, monkeypatch):
+    monkeypatch.setattr(recorder, "soundfile", None)
+    rec = SegmentRecorder(str(tmp_path), "meeting", RATE, segment_seconds=1.0, compress="flac").start()
+    rec.write(b"\x00\x00" * 2 * 100)
+    assert [os.path.basename(p) for p in rec.stop()] == ["meeting_000.wav"]
+
+
+def test_max_queued_reports_the_real_queue_depth(tmp_path):
+    rec = SegmentRecorder(str(tmp_path), "meeting", RATE, segment_seconds=60.0)
+    for _ in range(200):                      # queued before the writer starts: a stalled disk
+        rec.write(b"\x00\x00" * 2 * 10)
+    rec.start()
+    rec.stop()
+    assert rec.stats()["max_queued_blocks"] == 200
@@ -0,0 +1,71 @@
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from audio.resampler import StreamingResampler
+
+
+def pcm(frames, channels, seed=0):
+    rng = np.random.default_rng(seed)
+    return (rng.standard_normal((frames, channels)) * 3000).astype(np.int16)
+
+
+def run(resampler, samples, chunk):
+    return np.concatenate([resampler.process(samples[i:i + chunk].tobytes())
+                           for i in range(0, len(samples), chunk)])
+
+
+@pytest.mark.parametrize("in_rate", [48000, 44100, 22050])
+def test_chunking_does_not_change_the_output(in_rate):
+    samples = pcm(in_rate // 2, 2)
+    whole = StreamingResampler(in_rate, 16000, 2, max_frames=len(samples)).process(samples.tobytes())
+    chunked = run(StreamingResampler(in_rate, 16000, 2), samples, 512)
+    np.testing.assert_allclose(chunked, whole, atol=1e-6)
+    assert abs(len(whole) - len(samples) * 16000 / in_rate) <= 1
+
+
+def test_sine_keeps_its_frequency_and_level():
+    rate, freq = 48000, 440.0
+    t = np.arange(rate) / rate
+    tone = (np.sin(2 * np.pi * freq * t) * 16384).astype(np.int16).reshape(-1, 1)
+    out = run(StreamingResampler(rate, 16000, 1), tone, 480)[200:]   # skip the filter's warm-up
+    spectrum = np.abs(np.fft.rfft(out))
+    assert np.argmax(spectrum) * 16000 / len(out) == pytest.approx(freq, abs=2)
+    assert np.sqrt(np.mean(out ** 2)) == pytest.approx(0.5 / np.sqrt(2), rel=0.05)
+
+
+def test_same_rate_only_downmixes_and_scales():
+    samples = np.array([[32767, -32768], [1000, 3000]], dtype=np.int16)
+    out = StreamingResampler(16000, 16000, 2).process(samples.tobytes())
+    np.testing.assert_allclose(out, [(32767 - 32768) / 65536, 4000 / 65536], rtol=1e-6)
+
+
+def test_writes_into_a_given_buffer():
+    resampler = StreamingResampler(48000, 16000, 2, max_frames=512)
+    out = np.zeros(resampler.output_length(512), dtype=np.float32)
+    view = resampler.process(pcm(512, 2).tobytes(), out=out)
+    assert np.shares_memory(view, out)
+    assert len(view) <= resampler.output_length(512)
+
+
+def test_grows_for_chunks_larger_than_max_frames():
+    samples = pcm(2000, 1)
+    big = StreamingResampler(48000, 16000, 1, max_frames=256).process(samples.tobytes())
+    reference = StreamingResampler(48000, 16000, 1, max_frames=4096).process(samples.tobytes())
+    np.testing.assert_allclose(big, reference, atol=1e-6)
+
+
+@pytest.mark.parametrize("in_rate", [48000, 44100])
+def test_callbacks_into_a_preallocated_output_do_not_allocate(in_rate):
+    resampler = StreamingResampler(in_rate, 16000, 2, max_frames=512)
+    data = pcm(512, 2).tobytes()
+    out = np.empty(resampler.output_length(512), dtype=np.float32)
+    resampler.process(data, out=out)
+    tracemalloc.start()
+    for _ in range(200):
+        resampler.process(data, out=out)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    # A per-chunk gather of the filter windows alone is 512 * 16000 / in_rate * taps * 4 bytes
+    assert peak < 16 * 1024
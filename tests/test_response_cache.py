@@ -0,0 +1,69 @@
+from types import SimpleNamespace
+
+import pytest
+
+from llm import response_cache
+from llm.response_cache import ResponseCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(response_cache, "time", SimpleNamespace(time=lambda: clock.now))
+    return clock
+
+
+def test_hits_ignore_case_punctuation_and_spacing(clock):
+    cache = ResponseCache()
+    cache.put("What's the  plan?", "gemini", "Ship it.")
+    assert cache.get("what s the plan", "gemini") == "Ship it."
+    assert cache.get("What's the plan?", "llama3.2:3b") is None
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = ResponseCache(ttl_seconds=60)
+    cache.put("prompt", "m", "answer")
+    clock.now += 59
+    assert cache.get("prompt", "m") == "answer"
+    clock.now += 1
+    assert cache.get("prompt", "m") is None
+    assert cache.stats()["expirations"] == 1
+    assert cache.stats()["entries"] == 0
+
+
+def test_least_recently_used_is_evicted(clock):
+    cache = ResponseCache(max_entries=2)
+    cache.put("a", "m", "A")
+    cache.put("b", "m", "B")
+    assert cache.get("a", "m") == "A"        # b is now the least recently used
+    cache.put("c", "m", "C")
+    assert cache.get("b", "m") is None
+    assert cache.get("a", "m") == "A"
+    assert cache.get("c", "m") == "C"
+    assert cache.stats()["evictions"] == 1
+
+
+def test_empty_responses_and_disabled_cache_store_nothing(clock):
+    cache = ResponseCache()
+    cache.put("a", "m", "")
+    assert cache.get("a", "m") is None
+    cache.enabled = False
+    cache.put("b", "m", "B")
+    cache.enabled = True
+    assert cache.get("b", "m") is None
+
+
+def test_persists_unexpired_entries(clock, tmp_path):
+    path = str(tmp_path / "cache.json")
+    cache = ResponseCache(ttl_seconds=60, path=path)
+    cache.put("old", "m", "stale")
+    clock.now += 30
+    cache.put("new", "m", "fresh")
+
+    clock.now += 40
+    reloaded = ResponseCache(ttl_seconds=60, path=path)
+    assert reloaded.get("new", "m") == "fresh"
+    assert reloaded.get("old", "m") is None
+    reloaded.clear()
+    assert not (tmp_path / "cache.json").exists()
@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from audio.ring_buffer import RingBuffer
+
+
+def test_reads_in_order_across_the_wrap():
+    ring = RingBuffer(8)
+    ring.write(np.arange(6, dtype=np.float32))
+    assert ring.read(4).tolist() == [0, 1, 2, 3]
+    ring.write(np.arange(6, 11, dtype=np.float32))
+    # Positions 8..10 wrapped to the start of storage but read back as one slice
+    assert ring.read_available().tolist() == [4, 5, 6, 7, 8, 9, 10]
+    assert ring.read_available() is None
+
+
+def test_reserve_commit_is_visible_through_the_mirror():
+    ring = RingBuffer(4)
+    ring.write(np.zeros(3, dtype=np.float32))
+    out = ring.reserve(3)
+    out[:] = [1, 2, 3]
+    ring.commit(3)
+    assert ring.latest(4).tolist() == [0, 1, 2, 3]
+
+
+def test_overflow_skips_overwritten_samples():
+    ring = RingBuffer(4)
+    ring.write(np.arange(10, dtype=np.float32))
+    assert ring.overflows == 6
+    assert ring.available() == 4
+    assert ring.read(4).tolist() == [6, 7, 8, 9]
+
+
+def test_underrun_returns_none():
+    ring = RingBuffer(4)
+    ring.write(np.ones(2, dtype=np.float32))
+    assert ring.read(3) is None
+    assert ring.underruns == 1
+    assert ring.read(2).tolist() == [1, 1]
+
+
+def test_view_outside_the_ring_raises():
+    ring = RingBuffer(4)
+    ring.write(np.arange(6, dtype=np.float32))
+    assert ring.view(2, 6).tolist() == [2, 3, 4, 5]
+    with pytest.raises(IndexError):
+        ring.view(1, 5)
+    with pytest.raises(IndexError):
+        ring.view(4, 7)
+
+
+def test_latest_is_capped_by_what_was_written():
+    ring = RingBuffer(8)
+    ring.write(np.arange(3, dtype=np.float32))
+    assert ring.latest(5).tolist() == [0, 1, 2]
+
+
+def test_oversized_write_after_unread_samples():
+    ring = RingBuffer(4)
+    ring.write(np.arange(2, dtype=np.float32))
+    ring.write(np.arange(10, 16, dtype=np.float32))
+    # The 2 unread samples and the first 2 of the new block were lost
+    assert ring.overflows == 4
+    assert ring.read_available().tolist() == [12, 13, 14, 15]
@@ -0,0 +1,138 @@
+import pytest
+
+from llm.router import LLMRouter
+
+
+class FakeBackend:
+    def __init__(self, name, expected_seconds=1.0, max_prompt_tokens=100_000, up=True, fail=False,
+                 cached_text=None, pieces=("an", " answer")):
+        self.name = name
+        self.model = f"{name}-model"
+        self.expected_seconds = expected_seconds
+        self.max_prompt_tokens = max_prompt_tokens
+        self.up = up
+        self.fail = fail
+        self.cached_text = cached_text
+        self.pieces = pieces
+        self.calls = 0
+
+    def available(self):
+        return self.up
+
+    def warm(self):
+        pass
+
+    def cached(self, context_text):
+        return self.cached_text
+
+    def complete(self, context_text):
+        self.calls += 1
+        if self.fail:
+            raise RuntimeError(f"{self.name} failed")
+        return "".join(self.pieces)
+
+    def stream(self, context_text):
+        self.calls += 1
+        if self.fail:
+            raise RuntimeError(f"{self.name} failed")
+        yield from self.pieces
+
+    def close(self):
+        pass
+
+
+def test_prefers_first_backend_within_budget():
+    local, remote = FakeBackend("local"), FakeBackend("remote")
+    router = LLMRouter([local, remote], budget_seconds=2.0)
+    assert router.complete("hello") == ("local", "an answer")
+    assert remote.calls == 0
+
+
+def test_slow_backend_loses_to_one_within_budget():
+    local, remote = FakeBackend("local", expected_seconds=5.0), FakeBackend("remote", expected_seconds=1.0)
+    router = LLMRouter([local, remote], budget_seconds=2.0)
+    assert router.complete("hello")[0] == "remote"
+
+
+def test_lowest_p95_wins_when_none_fits_budget():
+    local, remote = FakeBackend("local", expected_seconds=9.0), FakeBackend("remote", expected_seconds=6.0)
+    router = LLMRouter([local, remote], budget_seconds=2.0)
+    assert [b.name for b in router.candidates("hello")] == ["remote", "local"]
+
+
+def test_large_prompt_skips_backend_with_small_context():
+    local, remote = FakeBackend("local", max_prompt_tokens=50), FakeBackend("remote")
+    router = LLMRouter([local, remote])
+    assert router.complete("word " * 500)[0] == "remote"
+
+
+def test_unavailable_backend_is_skipped():
+    router = LLMRouter([FakeBackend("local", up=False), FakeBackend("remote")])
+    assert router.complete("hello")[0] == "remote"
+
+
+def test_no_backend_raises():
+    with pytest.raises(RuntimeError):
+        LLMRouter([FakeBackend("local", up=False)]).complete("hello")
+
+
+def test_complete_falls_over_on_failure():
+    local, remote = FakeBackend("local", fail=True), FakeBackend("remote")
+    router = LLMRouter([local, remote])
+    assert router.complete("hello") == ("remote", "an answer")
+
+
+def test_stream_falls_over_before_first_piece():
+    router = LLMRouter([FakeBackend("local", fail=True), FakeBackend("remote")])
+    provider, chunks = router.stream("hello")
+    assert provider == "remote"
+    assert "".join(chunks) == "an answer"
+
+
+def test_repeated_failures_put_backend_in_cooldown():
+    local, remote = FakeBackend("local", fail=True), FakeBackend("remote")
+    router = LLMRouter([local, remote], failures=2, cooldown=60.0)
+    router.complete("one")
+    router.complete("two")
+    router.complete("three")
+    assert local.calls == 2
+
+
+def test_observed_latency_replaces_prior_after_min_samples():
+    local = FakeBackend("local", expected_seconds=1.0)
+    router = LLMRouter([local], min_samples=3)
+    for seconds in (4.0, 5.0, 6.0):
+        router._succeeded(local, seconds)
+    assert router.p95(local) == 6.0
+
+
+def test_cached_answer_skips_the_call():
+    local = FakeBackend("local", cached_text="from cache")
+    router = LLMRouter([local])
+    assert router.complete("hello") == ("local", "from cache")
+    assert local.calls == 0
+    assert router.cache_hits == 1
+
+
+def test_cached_stream_can_be_closed():
+    # A hedged attempt that loses the claim closes its stream, cached or not
+    router = LLMRouter([FakeBackend("local", cached_text="from cache")])
+    provider, chunks = router.stream("hello")
+    assert next(chunks) == "from cache"
+    chunks.close()
+
+
+def test_empty_stream_can_be_closed():
+    router = LLMRouter([FakeBackend("local", pieces=())])
+    provider, chunks = router.stream("hello")
+    assert list(chunks) == []
+    chunks.close()
+
+
+def test_abandoned_stream_is_not_timed():
+    local = FakeBackend("local", pieces=("a", "b", "c"))
+    router = LLMRouter([local])
+    _, chunks = router.stream("hello")
+    next(chunks)
+    chunks.close()
+    assert len(router._latencies["local"]) == 0
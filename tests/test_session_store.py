@@ -0,0 +1,42 @@
+import json
+
+import pytest
+
+from memory.session_store import SessionStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SessionStore(str(tmp_path / "sessions.db")).start()
+    yield store
+    store.stop()
+
+
+def test_search_and_time_range(store):
+    store.add({"ts": "2025-12-01 10:00:00", "context": "we hit the rate limits", "response": "Back off and retry."})
+    store.add({"ts": "2025-12-03 10:00:00", "context": "lunch plans", "response": "Tacos."})
+    store.flush()
+
+    assert [r["response"] for r in store.query(text="rate limits")] == ["Back off and retry."]
+    assert [r["response"] for r in store.query(start="2025-12-02")] == ["Tacos."]
+    assert [r["response"] for r in store.query(end="2025-12-02")] == ["Back off and retry."]
+
+
+def test_unparseable_time_raises(store):
+    with pytest.raises(ValueError):
+        store.query(start="last tuesday")
+
+
+def test_import_skips_rows_written_live(store, tmp_path):
+    outputs = tmp_path / "outputs"
+    outputs.mkdir()
+    record = {"timestamp": "2025-12-01 10:00:00", "context": "c", "response": "r"}
+    (outputs / "response_1.json").write_text(json.dumps(record))
+    (outputs / "response_2.json").write_text(json.dumps({**record, "response": "other"}))
+    # As main.py stores a response it also writes to outputs/
+    store.add({**record, "ts": 1.0, "source": "response_1.json"})
+    store.flush()
+
+    assert store.import_outputs(str(outputs)) == 1
+    assert store.import_outputs(str(outputs)) == 0
+    assert store.count() == 2
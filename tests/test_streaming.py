@@ -0,0 +1,71 @@
+import numpy as np
+
+from asr.streaming import HypothesisBuffer, StreamingTranscriber
+
+RATE = 16000
+WORDS = [f"w{i}" for i in range(40)]         # word i is spoken over [0.5 i, 0.5 i + 0.4)
+
+
+class ScriptedASR:
+    """
+    Each sample holds its own stream time, so a window knows where it
+    starts. Returns the words that fit in the window; the last one is
+    misheard, as Whisper's tail often is.
+    """
+
+    def __init__(self):
+        self.windows = []
+
+    def transcribe_words(self, audio, prompt=None):
+        start = float(audio[0])
+        end = start + len(audio) / RATE
+        self.windows.append(end - start)
+        words = [(0.5 * i - start, 0.5 * i + 0.4 - start, " " + w)
+                 for i, w in enumerate(WORDS) if 0.5 * i >= start - 1e-6 and 0.5 * i + 0.4 <= end]
+        if words:
+            s, e, w = words[-1]
+            words[-1] = (s, e, w + "?")
+        return words
+
+
+def feed(transcriber, seconds, chunk=RATE // 4):
+    texts = []
+    for start in range(0, int(seconds * RATE), chunk):
+        transcriber.insert_audio((np.arange(start, start + chunk) / RATE).astype(np.float32))
+        if transcriber.ready():
+            texts += transcriber.process()
+    return texts
+
+
+def words_of(texts):
+    return " ".join(texts).split()
+
+
+def test_only_words_two_passes_agree_on_are_committed():
+    transcriber = StreamingTranscriber(ScriptedASR(), step_seconds=1.0, max_window_seconds=30.0)
+    committed = words_of(feed(transcriber, 10.0))
+    assert committed and all("?" not in w for w in committed)
+    assert committed == WORDS[:len(committed)]
+    # The stable part of the tail is committed at the end
+    final = words_of(transcriber.finish_segment())
+    assert (committed + final)[:-1] == WORDS[:len(committed) + len(final) - 1]
+
+
+def test_window_is_trimmed_without_losing_or_repeating_words():
+    asr = ScriptedASR()
+    transcriber = StreamingTranscriber(asr, step_seconds=1.0, max_window_seconds=3.0)
+    committed = words_of(feed(transcriber, 16.0))
+    assert max(asr.windows) <= 3.0 + 1.0 + 1e-6
+    assert committed == WORDS[:len(committed)]
+    assert len(committed) >= 25
+
+
+def test_hypothesis_buffer_drops_a_repeated_tail():
+    buffer = HypothesisBuffer()
+    buffer.insert([(0.0, 0.4, " a"), (0.5, 0.9, " b")], 0.0)
+    buffer.flush()
+    buffer.insert([(0.0, 0.4, " a"), (0.5, 0.9, " b"), (1.0, 1.4, " c")], 0.0)
+    assert [w for _, _, w in buffer.flush()] == [" a", " b"]
+    # A later window that re-hears " b" just after the commit point doesn't repeat it
+    buffer.insert([(0.0, 0.35, " b"), (0.5, 0.9, " c"), (1.0, 1.4, " d")], 0.85)
+    assert [w for _, _, w in buffer.new] == [" c", " d"]
@@ -0,0 +1,45 @@
+import random
+
+import pytest
+
+from utils.text_cleaner import StreamingCleaner, clean_llm_output
+
+SAMPLES = [
+    "## Answer\n\n* **First**, do this.\n* Then *that*.\n\n\n- Finally • done  \n",
+    "Plain text with no markdown.",
+    "   \n\n  # Title\n#Second\n\n\nBody   text\n  - item\n",
+    "**Bold** start and a trailing list:\n\n1. one\n2. two\n\n",
+    "# \n# \n## Heading after empty headings\ntext",
+    "Tabs\tand  spaces \t\n\n\n\tindented line",
+    "",
+]
+
+
+def stream(text, sizes):
+    cleaner = StreamingCleaner()
+    out, i = [], 0
+    for size in sizes:
+        out.append(cleaner.feed(text[i:i + size]))
+        i += size
+    out.append(cleaner.feed(text[i:]))
+    return "".join(out)
+
+
+@pytest.mark.parametrize("text", SAMPLES)
+def test_matches_the_batch_cleaner_one_character_at_a_time(text):
+    assert stream(text, [1] * len(text)) == clean_llm_output(text)
+
+
+@pytest.mark.parametrize("text", SAMPLES)
+def test_matches_the_batch_cleaner_for_random_chunking(text):
+    rng = random.Random(0)
+    for _ in range(50):
+        sizes = [rng.randint(1, 8) for _ in range(len(text))]
+        assert stream(text, sizes) == clean_llm_output(text)
+
+
+def test_trailing_whitespace_is_held_back():
+    cleaner = StreamingCleaner()
+    assert cleaner.feed("Hello ") == "Hello"
+    assert cleaner.feed("\n\n") == ""
+    assert cleaner.feed("world") == " \nworld"
@@ -0,0 +1,129 @@
+import threading
+import time
+
+from llm.trigger_executor import Attempt, DeadlineExceeded, LLMRequest, TriggerExecutor
+
+
+def make_executor(call, **kwargs):
+    results, errors = [], []
+    executor = TriggerExecutor(call, results.append, lambda request, error: errors.append(error), **kwargs)
+    return executor, results, errors
+
+
+def test_result_is_handled():
+    executor, results, _ = make_executor(lambda snapshot, attempt: snapshot.upper())
+    request = executor.submit("hello")
+    assert request.done.wait(5)
+    assert results == [request] and request.result == "HELLO"
+    assert request.timing["attempts"] == 1 and "total" in request.timing
+    executor.shutdown()
+
+
+def test_failed_attempt_is_retried():
+    calls = []
+
+    def call(snapshot, attempt):
+        calls.append(attempt.number)
+        if len(calls) == 1:
+            raise ConnectionError("flaky")
+        return "ok"
+
+    executor, results, errors = make_executor(call, backoff=0.01)
+    request = executor.submit("x")
+    assert request.done.wait(5)
+    assert request.result == "ok" and calls == [1, 2] and not errors
+    executor.shutdown()
+
+
+def test_slow_attempt_is_hedged_and_the_first_answer_wins():
+    release = threading.Event()
+    stopped = []
+
+    def call(snapshot, attempt):
+        if attempt.number == 1:
+            release.wait(5)
+            stopped.append(attempt.should_stop())
+            return "slow"
+        attempt.claim()
+        return "fast"
+
+    executor, results, _ = make_executor(call, hedge_after=0.05)
+    request = executor.submit("x")
+    assert request.done.wait(5)
+    assert request.result == "fast" and request.timing["hedged"]
+    release.set()
+    for _ in range(100):
+        if stopped:
+            break
+        time.sleep(0.01)
+    # The losing attempt is told to stop
+    assert stopped == [True]
+    executor.shutdown()
+
+
+def test_newer_submit_supersedes_the_running_request():
+    first_started = threading.Event()
+    release = threading.Event()
+
+    def call(snapshot, attempt):
+        if snapshot == "old":
+            first_started.set()
+            release.wait(5)
+        return snapshot
+
+    executor, results, errors = make_executor(call, hedge_after=10)
+    old = executor.submit("old")
+    assert first_started.wait(5)
+    new = executor.submit("new")
+    assert new.done.wait(5)
+    release.set()
+    assert old.done.wait(5)
+    assert [r.result for r in results] == ["new"]
+    assert old.cancelled.is_set() and not errors
+    executor.shutdown()
+
+
+def test_deadline_is_reported_as_an_error():
+    release = threading.Event()
+    executor, results, errors = make_executor(lambda snapshot, attempt: release.wait(5), deadline=0.1,
+                                              hedge_after=10)
+    request = executor.submit("x")
+    assert request.done.wait(5)
+    release.set()
+    assert not results
+    assert len(errors) == 1 and isinstance(errors[0], DeadlineExceeded)
+    executor.shutdown()
+
+
+def test_superseded_requests_free_their_workers():
+    release = threading.Event()
+    started = {}
+
+    def call(snapshot, attempt):
+        started[snapshot] = time.perf_counter()
+        if snapshot != "last":
+            release.wait(5)           # stale calls that never check should_stop
+        return snapshot
+
+    executor, results, _ = make_executor(call, hedge_after=10)
+    executor.submit("slow")
+    time.sleep(0.05)
+    executor.submit("second")
+    time.sleep(0.05)
+    submitted = time.perf_counter()
+    last = executor.submit("last")
+    assert last.done.wait(2)
+    assert started["last"] - submitted < 0.5
+    assert [r.result for r in results] == ["last"]
+    release.set()
+    executor.shutdown()
+
+
+def test_attempt_from_an_earlier_round_cannot_claim():
+    request = LLMRequest(1, "x", deadline=30)
+    stale = Attempt(request, 1)
+    request.round += 1               # what a retry does
+    fresh = Attempt(request, 2)
+    assert stale.should_stop() and not stale.claim()
+    assert not fresh.should_stop() and fresh.claim()
+    assert request.winner == 2
@@ -0,0 +1,59 @@
+import wave
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+import batch_transcribe
+from audio.wav_reader import WavFile
+
+
+def write_wav(path, seconds, rate=48000, channels=2):
+    rng = np.random.default_rng(0)
+    samples = (rng.standard_normal((int(seconds * rate), channels)) * 3000).astype(np.int16)
+    with wave.open(str(path), "wb") as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(samples.tobytes())
+    return path
+
+
+def test_mono_chunks_join_to_to_mono(tmp_path):
+    wav = WavFile(write_wav(tmp_path / "a.wav", 2.5))
+    whole = wav.to_mono(16000)
+    chunks = [chunk.copy() for _, chunk in wav.mono_chunks(16000, chunk_seconds=1.0, block_frames=4096)]
+    assert [len(c) for c in chunks] == [16000, 16000, len(whole) - 32000]
+    np.testing.assert_allclose(np.concatenate(chunks), whole, atol=1e-6)
+
+
+class FakeModel:
+    """Transcribes each chunk as its length; fails on chunk `fail_at`."""
+
+    def __init__(self, fail_at=None):
+        self.calls = 0
+        self.fail_at = fail_at
+
+    def transcribe(self, audio, **kwargs):
+        if self.calls == self.fail_at:
+            raise KeyboardInterrupt
+        self.calls += 1
+        return [SimpleNamespace(text=f"chunk of {len(audio)}")], None
+
+
+def test_interrupted_file_resumes_after_the_last_finished_chunk(tmp_path, monkeypatch):
+    path = write_wav(tmp_path / "meeting.wav", 3.0, rate=16000, channels=1)
+    out = tmp_path / "out"
+    out.mkdir()
+
+    monkeypatch.setattr(batch_transcribe, "_asr", SimpleNamespace(model=FakeModel(fail_at=2)))
+    with pytest.raises(KeyboardInterrupt):
+        batch_transcribe._transcribe_file(str(path), str(out), 1, 1.0)
+    assert not (out / "meeting.txt").exists()
+
+    resumed = FakeModel()
+    monkeypatch.setattr(batch_transcribe, "_asr", SimpleNamespace(model=resumed))
+    batch_transcribe._transcribe_file(str(path), str(out), 1, 1.0)
+    assert resumed.calls == 1
+    assert (out / "meeting.txt").read_text().splitlines() == ["chunk of 16000"] * 3
+    assert sorted(p.name for p in out.iterdir()) == ["meeting.txt"]
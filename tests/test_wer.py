@@ -0,0 +1,27 @@
+import pytest
+
+from utils.wer import edit_distance, normalize, wer
+
+
+def test_normalize_ignores_case_punctuation_and_curly_apostrophes():
+    assert normalize("We’re   DONE, right?") == ["we're", "done", "right"]
+
+
+@pytest.mark.parametrize("reference, hypothesis, distance", [
+    ("a b c", "a b c", 0),
+    ("a b c", "a x c", 1),          # substitution
+    ("a b c", "a c", 1),            # deletion
+    ("a b c", "a b b c", 1),        # insertion
+    ("a b c d", "b c d e", 2),
+    ("", "a b", 2),
+])
+def test_edit_distance(reference, hypothesis, distance):
+    assert edit_distance(reference.split(), hypothesis.split()) == distance
+
+
+def test_wer():
+    assert wer("The quick brown fox.", "the quick brown fox") == 0.0
+    assert wer("the quick brown fox", "the quack brown") == 0.5
+    assert wer("", "") == 0.0
+    assert wer("", "noise") == 1.0
+    assert wer("one", "one two three") == 2.0